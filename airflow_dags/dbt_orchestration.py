@@ -0,0 +1,138 @@
+"""Model-level dbt orchestration helpers for the Airflow DAG.
+
+The DAG creates one task per dbt model, wired with the dependencies recorded in
+``target/manifest.json``. Before the models run, ``select_models`` works out which of
+them need rebuilding: models whose SQL or config changed since the last successful run
+(``state:modified+``), plus everything downstream of a raw source whose extracted files
+changed. After a successful run ``save_state`` stores the manifest and the source
+fingerprints that the next run compares against.
+"""
+
+from pathlib import Path
+import hashlib
+import json
+import shutil
+import subprocess
+
+from file_utils import write_atomic
+
+
+HASH_BLOCK_SIZE = 1 << 20
+STATE_MANIFEST = "manifest.json"
+STATE_SOURCES = "source_fingerprints.json"
+
+
+def load_manifest(path):
+    """Parsed dbt manifest, or None if the project has not been parsed yet"""
+    try:
+        return json.loads(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def model_dependencies(manifest):
+    """Model name -> names of the models it refs, for the root project's models"""
+    project_name = manifest['metadata'].get('project_name')
+    models = {
+        unique_id: node for unique_id, node in manifest['nodes'].items()
+        if node['resource_type'] == 'model' and (project_name is None or node['package_name'] == project_name)
+    }
+    return {
+        node['name']: sorted(models[parent]['name'] for parent in node['depends_on']['nodes'] if parent in models)
+        for node in models.values()
+    }
+
+
+def model_sources(manifest):
+    """Raw source table names a project reads from"""
+    return sorted({source['name'] for source in manifest['sources'].values() if source['source_name'] == 'raw'})
+
+
+# --- Source fingerprints ---
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_fingerprints(raw_dir, tables, previous=None):
+    """Per-table content fingerprint of ``<raw_dir>/<table>/``
+
+    Files are hashed only when their size or mtime differ from ``previous``, so a
+    re-extracted but identical partition neither costs a full read nor triggers a rebuild.
+    Tables without an extract directory are left out and treated as changed.
+    """
+    previous = previous or {}
+    fingerprints = {}
+    for table in tables:
+        table_dir = Path(raw_dir) / table
+        if not table_dir.is_dir():
+            continue
+        recorded = previous.get(table, {}).get('files', {})
+        files = {}
+        for path in sorted(p for p in table_dir.rglob("*.parquet") if p.is_file()):
+            relative = path.relative_to(table_dir).as_posix()
+            stat = path.stat()
+            entry = recorded.get(relative)
+            if entry is None or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+                entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': _file_sha256(path)}
+            files[relative] = entry
+        digest = hashlib.sha256(json.dumps({name: entry['sha256'] for name, entry in files.items()},
+                                           sort_keys=True).encode()).hexdigest()
+        fingerprints[table] = {'digest': digest, 'files': files}
+    return fingerprints
+
+
+def changed_sources(current, previous, tables):
+    """Source tables whose fingerprint differs from the saved state (or cannot be taken)"""
+    return [
+        table for table in tables
+        if table not in current or previous.get(table, {}).get('digest') != current[table]['digest']
+    ]
+
+
+# --- Selection and state ---
+def _dbt(project_dir, *args):
+    result = subprocess.run(['dbt', *args], cwd=project_dir, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"dbt {' '.join(args)} failed:\n{result.stdout}\n{result.stderr}")
+    return result.stdout
+
+
+def select_models(project_dir, state_dir, raw_dir, target_path="target/airflow/selection"):
+    """Names of the models to rebuild, or None to rebuild everything (no saved state yet)"""
+    state_dir = Path(state_dir)
+    _dbt(project_dir, 'parse', '--target-path', target_path)
+    if not (state_dir / STATE_MANIFEST).exists():
+        return None
+
+    manifest = load_manifest(Path(project_dir) / target_path / STATE_MANIFEST)
+    tables = model_sources(manifest)
+    previous = load_manifest(state_dir / STATE_SOURCES) or {}
+    changed = changed_sources(source_fingerprints(raw_dir, tables, previous), previous, tables)
+
+    selectors = ['state:modified+'] + [f'source:raw.{table}+' for table in changed]
+    output = _dbt(project_dir, 'ls', '--resource-type', 'model', '--select', *selectors,
+                  '--state', str(state_dir), '--target-path', target_path,
+                  '--output', 'name', '--quiet')
+    return sorted({line.strip() for line in output.splitlines() if line.strip()})
+
+
+def run_model(project_dir, model):
+    """Build a single model with its own target path so parallel tasks do not collide"""
+    return _dbt(project_dir, 'run', '--select', model, '--target-path', f"target/airflow/{model}")
+
+
+def save_state(project_dir, state_dir, raw_dir, target_path="target/airflow/selection"):
+    """Record the manifest and source fingerprints the next run's selection compares against"""
+    state_dir = Path(state_dir)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = Path(project_dir) / target_path / STATE_MANIFEST
+    tables = model_sources(load_manifest(manifest_path))
+    previous = load_manifest(state_dir / STATE_SOURCES) or {}
+    fingerprints = source_fingerprints(raw_dir, tables, previous)
+
+    write_atomic(state_dir / STATE_SOURCES, lambda tmp_path: tmp_path.write_text(json.dumps(fingerprints, indent=2)))
+    write_atomic(state_dir / STATE_MANIFEST, lambda tmp_path: shutil.copyfile(manifest_path, tmp_path))
@@ -0,0 +1,121 @@
+"""Partitioned extraction of the raw monetization sources for the Airflow DAG.
+
+Each mapped task extracts one (source, hub) slice for one logical date and writes it to
+``<raw_dir>/<table>/dt=<date>/hub_partition=<hub>/part-0.parquet``. The staging models
+read that tree as a hive-partitioned source, so incremental runs only scan new ``dt``
+partitions. Snapshot sources without a date column (pricing plans) keep one current file
+per hub instead of a partition per day.
+"""
+
+from pathlib import Path
+import re
+
+from file_utils import write_atomic
+
+try:
+    import duckdb
+except ImportError:  # Only needed on the workers that run the extract tasks
+    duckdb = None
+
+
+# Source table -> date column defining its ``dt`` partition and how a row maps to a hub
+SOURCES = {
+    'customers': {'date_column': 'updated_at', 'hub_column': None},
+    'subscriptions': {'date_column': 'updated_at', 'hub_column': 'product_hub'},
+    # Usage events carry no hub of their own; it comes from the subscription they belong to
+    'usage_events': {'date_column': 'event_date', 'hub_lookup': ('subscriptions', 'subscription_id', 'product_hub')},
+    'support_interactions': {'date_column': 'interaction_date', 'hub_column': None},
+    'pricing_plans': {'date_column': None, 'hub_column': 'hub'},
+}
+
+HUBS = ['CMS Hub', 'Marketing Hub', 'Ops Hub', 'Sales Hub', 'Service Hub']
+ALL_HUBS = 'all'  # Single partition for sources that are not scoped to a hub
+UNKNOWN_HUB = 'unknown'  # Rows whose hub is missing or not in HUBS, so nothing is dropped
+SOURCE_EXTENSIONS = ['.parquet', '.csv']
+
+
+def hub_slug(hub):
+    """Path-safe partition value for a hub name"""
+    return re.sub(r'[^a-z0-9]+', '_', hub.lower()).strip('_')
+
+
+def is_hub_scoped(table):
+    spec = SOURCES[table]
+    return bool(spec.get('hub_column') or spec.get('hub_lookup'))
+
+
+def hub_partitions(table, hubs=HUBS):
+    """Hub values a source's extract task is mapped over"""
+    return list(hubs) + [UNKNOWN_HUB] if is_hub_scoped(table) else [ALL_HUBS]
+
+
+def partition_path(raw_dir, table, hub, ds=None):
+    """Directory of one extracted partition"""
+    path = Path(raw_dir) / table
+    if SOURCES[table]['date_column'] is not None:
+        path = path / f"dt={ds}"
+    return path / f"hub_partition={hub_slug(hub)}"
+
+
+def source_reader(source_dir, table):
+    """DuckDB table function reading a landed source export"""
+    for extension in SOURCE_EXTENSIONS:
+        file_path = Path(source_dir) / f"{table}{extension}"
+        if file_path.exists():
+            if extension == '.parquet':
+                return f"read_parquet('{file_path.as_posix()}')"
+            return f"read_csv_auto('{file_path.as_posix()}', header = true)"
+    raise FileNotFoundError(f"No export for source '{table}' in {source_dir}")
+
+
+def extraction_query(table, hub, ds, source_dir, hubs=HUBS):
+    """SELECT statement and parameters for one (source, hub, date) slice"""
+    spec = SOURCES[table]
+    joins, conditions, params = "", [], []
+
+    if spec['date_column'] is not None:
+        conditions.append(f"CAST(src.{spec['date_column']} AS DATE) = CAST(? AS DATE)")
+        params.append(ds)
+
+    if spec.get('hub_lookup'):
+        lookup_table, key, column = spec['hub_lookup']
+        joins = (f"LEFT JOIN (SELECT {key}, ANY_VALUE({column}) AS _hub "
+                 f"FROM {source_reader(source_dir, lookup_table)} GROUP BY {key}) lookup USING ({key})")
+        hub_expr = "lookup._hub"
+    else:
+        hub_expr = f"src.{spec['hub_column']}" if spec.get('hub_column') else None
+
+    if hub == UNKNOWN_HUB:
+        placeholders = ", ".join("?" for _ in hubs)
+        conditions.append(f"({hub_expr} IS NULL OR LOWER(TRIM({hub_expr})) NOT IN ({placeholders}))")
+        params.extend(h.lower() for h in hubs)
+    elif hub != ALL_HUBS:
+        conditions.append(f"LOWER(TRIM({hub_expr})) = ?")
+        params.append(hub.lower())
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return f"SELECT src.* FROM {source_reader(source_dir, table)} src {joins} {where}", params
+
+
+def extract_partition(table, hub, ds, source_dir, raw_dir, hubs=HUBS):
+    """Extract one slice to Parquet and return its row count
+
+    The file is written next to its destination and renamed into place, so a retried
+    task replaces its partition rather than appending a duplicate.
+    """
+    if duckdb is None:
+        raise ImportError("duckdb is required for source extraction")
+
+    sql, params = extraction_query(table, hub, ds, source_dir, hubs)
+    out_dir = partition_path(raw_dir, table, hub, ds)
+
+    con = duckdb.connect()
+    try:
+        relation = con.execute(sql, params).fetch_arrow_table()
+        con.register('extracted', relation)
+        write_atomic(out_dir / "part-0.parquet", lambda tmp_path: con.execute(
+            f"COPY extracted TO '{tmp_path.as_posix()}' (FORMAT PARQUET, COMPRESSION ZSTD)"))
+    finally:
+        con.close()
+    print(f"Extracted {relation.num_rows} {table} rows for hub={hub} dt={ds} to {out_dir}")
+    return relation.num_rows
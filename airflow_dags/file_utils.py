@@ -0,0 +1,22 @@
+"""File helpers shared by the DAG's task modules.
+
+The DAG folder is deployed on its own, without ``dashboard/``, so it keeps this copy of
+``duckdb_engine.write_atomic`` rather than importing it.
+"""
+
+from pathlib import Path
+import os
+
+
+def write_atomic(path, write):
+    """Run ``write(tmp_path)`` next to ``path`` and rename into place, so readers never see a partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
@@ -1,7 +1,14 @@
 from airflow import DAG
+from airflow.exceptions import AirflowSkipException
 from airflow.operators.bash import BashOperator
+from airflow.operators.python import PythonOperator
 from airflow.utils.dates import days_ago
+from airflow.utils.task_group import TaskGroup
 from datetime import timedelta
+import os
+
+from dbt_orchestration import load_manifest, model_dependencies, run_model, save_state, select_models
+from extract_sources import SOURCES, HUBS, extract_partition, hub_partitions
 
 default_args = {
     'owner': 'hubspot_analytics',
@@ -11,6 +18,35 @@ default_args = {
     'retry_delay': timedelta(minutes=2),
 }
 
+# Extraction settings; override per deployment through the scheduler environment
+SOURCE_DIR = os.environ.get('MONETIZATION_SOURCE_DIR', '/path/to/source_exports')
+RAW_DATA_DIR = os.environ.get('MONETIZATION_RAW_DIR', '/path/to/hub-monetization-insights/data/raw')
+EXTRACT_HUBS = [hub.strip() for hub in os.environ.get('MONETIZATION_HUBS', ','.join(HUBS)).split(',') if hub.strip()]
+# Airflow pool shared by every extract slice; its slot count caps the slices hitting the source systems
+# (create it once per deployment: airflow pools set monetization_extract 8 "Source extracts")
+EXTRACT_POOL = os.environ.get('MONETIZATION_EXTRACT_POOL', 'monetization_extract')
+
+# dbt settings; the manifest comes from `dbt parse` at deploy time and defines one task per model
+DBT_PROJECT_DIR = os.environ.get('MONETIZATION_DBT_DIR', '/path/to/dbt_models')
+DBT_STATE_DIR = os.environ.get('MONETIZATION_DBT_STATE_DIR', os.path.join(DBT_PROJECT_DIR, 'state'))
+DBT_MANIFEST = load_manifest(os.path.join(DBT_PROJECT_DIR, 'target', 'manifest.json'))
+
+
+def select_dbt_models():
+    """Models to rebuild this run; None (everything) until a successful run has saved state"""
+    return select_models(DBT_PROJECT_DIR, DBT_STATE_DIR, RAW_DATA_DIR)
+
+
+def run_dbt_model(model, ti):
+    selected = ti.xcom_pull(task_ids='run_dbt.select_models')
+    if selected is not None and model not in selected:
+        raise AirflowSkipException(f"{model} and its upstream models and sources are unchanged")
+    print(run_model(DBT_PROJECT_DIR, model))
+
+
+def save_dbt_state():
+    save_state(DBT_PROJECT_DIR, DBT_STATE_DIR, RAW_DATA_DIR)
+
 with DAG(
     'monetization_pipeline',
     default_args=default_args,
@@ -21,19 +57,110 @@ with DAG(
     tags=['monetization', 'pricing', 'ltv'],
 ) as dag:
 
-    extract_data = BashOperator(
-        task_id='extract_data',
-        bash_command='echo "Simulating data pull from source systems..."'
+    with TaskGroup('extract_data') as extract_data:
+        # One task per source, mapped over hubs; each writes <table>/dt=<ds>/hub_partition=<hub>/.
+        # ``ds`` is filled in from the task context because extract_partition takes it by name.
+        for table in SOURCES:
+            PythonOperator.partial(
+                task_id=f'extract_{table}',
+                python_callable=extract_partition,
+                pool=EXTRACT_POOL,
+            ).expand(op_kwargs=[
+                {'table': table, 'hub': hub, 'source_dir': SOURCE_DIR,
+                 'raw_dir': RAW_DATA_DIR, 'hubs': EXTRACT_HUBS}
+                for hub in hub_partitions(table, EXTRACT_HUBS)
+            ])
+
+    if DBT_MANIFEST is None:
+        # Project not parsed on this scheduler yet: fall back to a single full build
+        run_dbt = BashOperator(
+            task_id='run_dbt',
+            bash_command=f'cd {DBT_PROJECT_DIR} && dbt run'
+        )
+    else:
+        with TaskGroup('run_dbt') as run_dbt:
+            select_models_task = PythonOperator(
+                task_id='select_models',
+                python_callable=select_dbt_models,
+            )
+            dependencies = model_dependencies(DBT_MANIFEST)
+            # Skipped models must not skip their dependents, so only failures propagate
+            model_tasks = {
+                model: PythonOperator(
+                    task_id=model,
+                    python_callable=run_dbt_model,
+                    op_kwargs={'model': model},
+                    trigger_rule='none_failed',
+                )
+                for model in dependencies
+            }
+            for model, parents in dependencies.items():
+                select_models_task >> model_tasks[model]
+                for parent in parents:
+                    model_tasks[parent] >> model_tasks[model]
+            save_state_task = PythonOperator(
+                task_id='save_state',
+                python_callable=save_dbt_state,
+                trigger_rule='none_failed',
+            )
+            list(model_tasks.values()) >> save_state_task
+
+    # Runs after every dbt invocation, including failed ones, so slow failures are recorded too
+    record_dbt_performance = BashOperator(
+        task_id='record_dbt_performance',
+        bash_command=(
+            f'cd /path/to/hub-monetization-insights && python dashboard/pipeline_perf.py record '
+            f'--project-dir {DBT_PROJECT_DIR} --db data/pipeline_perf.duckdb '
+            '--run-id "{{ run_id }}" --fail-on-regression'
+        ),
+        trigger_rule='all_done',
+    )
+
+    # Scores churn risk straight from the new raw partitions; only customers with new events are recomputed
+    update_churn_risk = BashOperator(
+        task_id='update_churn_risk',
+        bash_command=(
+            'cd /path/to/hub-monetization-insights && python dashboard/churn_risk.py update '
+            f'--data-dir {os.path.dirname(RAW_DATA_DIR)} --state-dir data/churn_risk --as-of {{{{ ds }}}}'
+        ),
+    )
+
+    # Sketches only the day's usage partition; distinct-count rollups merge the daily sketches
+    build_usage_sketches = BashOperator(
+        task_id='build_usage_sketches',
+        bash_command=(
+            'cd /path/to/hub-monetization-insights && python dashboard/usage_sketches.py build '
+            f'--data-dir {os.path.dirname(RAW_DATA_DIR)} --sketch-dir data/sketches/usage --ds {{{{ ds }}}}'
+        ),
+    )
+
+    # Versions customers by a hash of the tracked columns; updated_at-only touches write nothing
+    snapshot_customers = BashOperator(
+        task_id='snapshot_customers',
+        bash_command=(
+            'cd /path/to/hub-monetization-insights && python dashboard/customer_snapshot.py run '
+            f'--data-dir {os.path.dirname(RAW_DATA_DIR)} --snapshot-dir data/snapshots/customers'
+        ),
     )
 
-    run_dbt = BashOperator(
-        task_id='run_dbt',
-        bash_command='cd /path/to/dbt_models && dbt run'
+    # Profiles only new or changed raw partitions; the dashboard reads the resulting scores
+    profile_data_quality = BashOperator(
+        task_id='profile_data_quality',
+        bash_command=(
+            'cd /path/to/hub-monetization-insights && python dashboard/dq_profiler.py profile '
+            f'--data-dir {os.path.dirname(RAW_DATA_DIR)} --profile-dir data/dq/profiles'
+        ),
     )
 
     refresh_dashboard = BashOperator(
         task_id='refresh_dashboard',
-        bash_command='echo "Simulating Streamlit dashboard refresh..."'
+        # Precompute KPI tables and figures so the first dashboard visitor skips cold loads
+        bash_command='cd /path/to/hub-monetization-insights && python dashboard/serving_bundle.py --out data/serving'
     )
 
     extract_data >> run_dbt >> refresh_dashboard
+    extract_data >> update_churn_risk >> refresh_dashboard
+    extract_data >> build_usage_sketches
+    extract_data >> snapshot_customers
+    extract_data >> profile_data_quality
+    run_dbt >> record_dbt_performance
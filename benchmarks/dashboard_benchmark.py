@@ -0,0 +1,239 @@
+"""Headless benchmark of the dashboard data path at several synthetic scale factors.
+
+Times the same code the Streamlit app runs (mart loading, the ``apply_filters_*``
+index lookups, the Subscription Metrics ``groupby('metric_date')`` and the
+Customer Analytics / Subscription / LTV KPIs) without starting Streamlit, and
+records wall time, peak RSS and Python-level allocations per operation as JSON::
+
+    python benchmarks/dashboard_benchmark.py --scales 1000 100000 1000000 10000000
+    python benchmarks/dashboard_benchmark.py --compare benchmarks/results/baseline.json
+
+Each scale factor runs in its own subprocess so its peak RSS is not inflated by
+earlier, larger runs. The daily facts get a longer history at larger scale factors
+(see ``history_days``), so every per-day mart grows with the customer count.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import json
+import math
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DASHBOARD_DIR = Path(__file__).resolve().parent.parent / "dashboard"
+sys.path.insert(0, str(DASHBOARD_DIR))
+
+from data_mart_manager import DataMartManager, MART_NAMES  # noqa: E402
+from filter_index import FilterIndex  # noqa: E402
+from kpi_calculations import customer_kpis, subscription_kpis, daily_subscription_trend, ltv_kpis  # noqa: E402
+from synthetic_data import SyntheticMartGenerator  # noqa: E402
+
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000, 1_000_000]
+BASE_CUSTOMERS = 1_000
+BASE_DAYS = 90  # History of the daily facts at BASE_CUSTOMERS
+DEFAULT_OUTPUT = Path("benchmarks/results/dashboard_benchmark.json")
+
+# Sidebar filters each streamlit_app helper applies, keyed by helper name
+FILTER_HELPERS = {
+    'apply_filters_to_customers': ('dim_customers', ['customer_segment', 'country']),
+    'apply_filters_to_metrics': ('fact_subscription_metrics', ['hub', 'tier']),
+    'apply_filters_to_ltv': ('fact_customer_ltv', ['ltv_segment']),
+    'apply_filters_to_pricing': ('fact_pricing_optimization', ['hub', 'tier']),
+}
+
+# Operations faster than this are reported but never flagged as regressions (timer noise)
+NOISE_FLOOR_S = 0.001
+
+
+def _peak_rss_mb():
+    """Process high-water resident set size (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(operation, func, repeat=3):
+    """Time ``func`` ``repeat`` times, then run it once more under tracemalloc
+
+    tracemalloc sees allocations made through Python and NumPy; Arrow buffers are
+    only visible in the RSS figures.
+    """
+    timings = []
+    rss_before = _peak_rss_mb()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    rss_after = _peak_rss_mb()
+
+    tracemalloc.start()
+    func()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, {
+        'operation': operation,
+        'wall_s_min': min(timings),
+        'wall_s_median': statistics.median(timings),
+        'peak_rss_mb': rss_after,
+        'rss_growth_mb': rss_after - rss_before,
+        'alloc_peak_mb': alloc_peak / 1024 ** 2,
+    }
+
+
+def _most_common(series):
+    """A realistic, non-empty sidebar selection for a column"""
+    counts = series.value_counts()
+    return counts.index[0] if len(counts) else None
+
+
+def history_days(n_customers):
+    """Days of daily facts for a scale factor: ``BASE_DAYS`` at ``BASE_CUSTOMERS``, growing with the square root
+
+    The facts hold one row per hub/tier and day, so a fixed history would keep them the same
+    size at every scale; square-root growth gives 10M customers about 25 years of history.
+    """
+    return max(BASE_DAYS, round(BASE_DAYS * math.sqrt(n_customers / BASE_CUSTOMERS)))
+
+
+def run_scale(n_customers, repeat=3, work_dir=None):
+    """Benchmark every dashboard operation against ``n_customers`` synthetic customers"""
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="dashboard_benchmark_"))
+    marts_dir = work_dir / "marts"
+    cache_dir = work_dir / "cache"
+    results = []
+
+    start = time.perf_counter()
+    n_days = history_days(n_customers)
+    SyntheticMartGenerator(n_customers=n_customers, n_days=n_days).write_parquet(marts_dir)
+    setup_s = time.perf_counter() - start
+
+    def load_cold():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return DataMartManager(data_path=marts_dir, cache_dir=cache_dir).load_marts(MART_NAMES)
+
+    def load_warm():
+        return DataMartManager(data_path=marts_dir, cache_dir=cache_dir).load_marts(MART_NAMES)
+
+    _, stats = measure('load_data_marts[cold]', load_cold, repeat)
+    results.append(stats)
+    marts, stats = measure('load_data_marts[warm]', load_warm, repeat)
+    results.append(stats)
+
+    for helper, (mart_name, columns) in FILTER_HELPERS.items():
+        df = marts[mart_name]
+        index, stats = measure(f'filter_index[{mart_name}]', lambda: FilterIndex(df), repeat)
+        results.append(stats)
+        filters = {column: _most_common(df[column]) for column in columns if column in df.columns}
+        _, stats = measure(helper, lambda: index.apply(df, **filters), repeat)
+        results.append(stats)
+
+    metrics = marts['fact_subscription_metrics']
+    for operation, func in [
+        ('daily_subscription_trend', lambda: daily_subscription_trend(metrics)),
+        ('customer_kpis', lambda: customer_kpis(marts['dim_customers'])),
+        ('subscription_kpis', lambda: subscription_kpis(metrics)),
+        ('ltv_kpis', lambda: ltv_kpis(marts['fact_customer_ltv'])),
+    ]:
+        _, stats = measure(operation, func, repeat)
+        results.append(stats)
+
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        'n_customers': n_customers,
+        'n_days': n_days,
+        'setup_s': setup_s,
+        'rows': {mart_name: len(df) for mart_name, df in marts.items()},
+        'peak_rss_mb': _peak_rss_mb(),
+        'operations': results,
+    }
+
+
+def run_benchmarks(scales, repeat=3):
+    """Run each scale factor in a fresh interpreter and collect the results"""
+    runs = []
+    for n_customers in scales:
+        with tempfile.TemporaryDirectory(prefix="dashboard_benchmark_") as tmp:
+            result_file = Path(tmp) / "result.json"
+            subprocess.run(
+                [sys.executable, __file__, "--worker", str(n_customers),
+                 "--repeat", str(repeat), "--worker-out", str(result_file)],
+                check=True,
+            )
+            run = json.loads(result_file.read_text())
+        print(f"{n_customers:>12,} customers, {run['n_days']:,} days: peak RSS {run['peak_rss_mb']:,.0f} MB")
+        runs.append(run)
+
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'runs': runs,
+    }
+
+
+def compare(current, baseline, max_regression=0.2):
+    """Operations whose median wall time grew by more than ``max_regression`` versus the baseline"""
+    baseline_times = {
+        (run['n_customers'], op['operation']): op['wall_s_median']
+        for run in baseline['runs'] for op in run['operations']
+    }
+    regressions = []
+    for run in current['runs']:
+        for op in run['operations']:
+            before = baseline_times.get((run['n_customers'], op['operation']))
+            if before is None or op['wall_s_median'] < NOISE_FLOOR_S:
+                continue
+            ratio = op['wall_s_median'] / max(before, NOISE_FLOOR_S)
+            if ratio > 1 + max_regression:
+                regressions.append({
+                    'n_customers': run['n_customers'],
+                    'operation': op['operation'],
+                    'baseline_s': before,
+                    'current_s': op['wall_s_median'],
+                    'ratio': ratio,
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard data path at several scale factors")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES, help="Synthetic customer counts (1k-10M)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per operation")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT, help="JSON results file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON; exit non-zero on regressions")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Allowed median slowdown (0.2 = 20%%)")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-out", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        args.worker_out.write_text(json.dumps(run_scale(args.worker, repeat=args.repeat)))
+        return
+
+    results = run_benchmarks(args.scales, repeat=args.repeat)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2))
+    print(f"Wrote {args.out}")
+
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression['operation']} @ {regression['n_customers']:,}: "
+                  f"{regression['baseline_s']:.4f}s -> {regression['current_s']:.4f}s ({regression['ratio']:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions versus {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
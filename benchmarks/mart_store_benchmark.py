@@ -0,0 +1,139 @@
+"""Benchmark of resident memory per concurrent dashboard session, per-session copies vs the shared store.
+
+``cache_data`` mode reproduces ``@st.cache_data``: the marts are kept pickled and every
+session unpickles its own copy. ``store`` mode serves every session from one
+``mart_store.MartStore``. Each session holds all marts at once, as concurrent reruns do,
+and filters ``dim_customers`` and computes the Customer Analytics KPIs on its copy::
+
+    python benchmarks/mart_store_benchmark.py --customers 100000 1000000 --sessions 1 10 100
+
+Each (mode, customers, sessions) combination runs in its own subprocess so RSS figures
+are not inflated by earlier runs.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import gc
+import json
+import pickle
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+DASHBOARD_DIR = Path(__file__).resolve().parent.parent / "dashboard"
+sys.path.insert(0, str(DASHBOARD_DIR))
+
+from data_mart_manager import MART_NAMES  # noqa: E402
+from filter_index import FilterIndex  # noqa: E402
+from kpi_calculations import customer_kpis  # noqa: E402
+from mart_schema import apply_schema  # noqa: E402
+from mart_store import MartStore, enable_copy_on_write  # noqa: E402
+from synthetic_data import SyntheticMartGenerator  # noqa: E402
+
+
+DEFAULT_CUSTOMERS = [100_000]
+DEFAULT_SESSIONS = [1, 10, 100]
+DEFAULT_OUTPUT = Path("benchmarks/results/mart_store_benchmark.json")
+MODES = ['cache_data', 'store']
+
+
+def _rss_mb():
+    """Current resident set size; /proc is Linux-only, so other platforms report the peak"""
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * 4096 / 1024 ** 2
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == 'darwin' else peak / 1024
+
+
+def run_sessions(mode, n_customers, sessions):
+    """RSS before and after ``sessions`` concurrent sessions each hold every mart"""
+    marts = {name: apply_schema(name, df)
+             for name, df in SyntheticMartGenerator(n_customers=n_customers).generate().items()}
+    if mode == 'cache_data':
+        pickled = {name: pickle.dumps(df) for name, df in marts.items()}
+        open_session = lambda: {name: pickle.loads(pickled[name]) for name in MART_NAMES}  # noqa: E731
+    else:
+        enable_copy_on_write()  # As the dashboard does at startup
+        store = MartStore(marts.__getitem__)
+        for name in MART_NAMES:
+            store.get(name, "v1")
+        open_session = lambda: {name: store.get(name, "v1") for name in MART_NAMES}  # noqa: E731
+    del marts
+    gc.collect()
+
+    index = FilterIndex(open_session()['dim_customers'])
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    held = []
+    for _ in range(sessions):
+        session = open_session()
+        customers = index.apply(session['dim_customers'], customer_segment='CHAMPION')
+        customer_kpis(customers)
+        held.append(session)
+    elapsed = time.perf_counter() - start
+    rss_after = _rss_mb()
+    return {
+        'mode': mode,
+        'n_customers': n_customers,
+        'sessions': sessions,
+        'open_s': elapsed,
+        'rss_before_mb': rss_before,
+        'rss_after_mb': rss_after,
+        'rss_per_session_mb': (rss_after - rss_before) / sessions,
+    }
+
+
+def run_benchmarks(customers, sessions):
+    """Run every combination in a fresh interpreter and collect the results"""
+    runs = []
+    for n_customers in customers:
+        for n_sessions in sessions:
+            for mode in MODES:
+                with tempfile.TemporaryDirectory(prefix="mart_store_benchmark_") as tmp:
+                    result_file = Path(tmp) / "result.json"
+                    subprocess.run(
+                        [sys.executable, __file__, "--worker", mode, str(n_customers), str(n_sessions),
+                         "--worker-out", str(result_file)],
+                        check=True,
+                    )
+                    run = json.loads(result_file.read_text())
+                print(f"{n_customers:>12,} customers, {n_sessions:>4} sessions, {mode:>10}: "
+                      f"+{run['rss_after_mb'] - run['rss_before_mb']:8,.1f} MB RSS "
+                      f"({run['rss_per_session_mb']:7.2f} MB/session)")
+                runs.append(run)
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'runs': runs,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory per concurrent session with and without the mart store")
+    parser.add_argument("--customers", type=int, nargs="+", default=DEFAULT_CUSTOMERS, help="Synthetic customer counts")
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS, help="Concurrent session counts")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT, help="JSON results file")
+    parser.add_argument("--worker", nargs=3, help=argparse.SUPPRESS)
+    parser.add_argument("--worker-out", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, n_customers, sessions = args.worker
+        args.worker_out.write_text(json.dumps(run_sessions(mode, int(n_customers), int(sessions))))
+        return
+
+    results = run_benchmarks(args.customers, args.sessions)
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2))
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
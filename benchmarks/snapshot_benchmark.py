@@ -0,0 +1,142 @@
+"""Benchmark of the hash-based customer snapshot on multi-million-row customer tables.
+
+Generates a full customer extract with DuckDB, then a run of daily extracts in which a
+share of customers are touched (``updated_at`` moves) and a smaller share really change,
+and times ``customer_snapshot.run_snapshot`` on each day, incrementally and as a full
+scan. Version counts are compared with what the ``timestamp`` strategy would have
+written::
+
+    python benchmarks/snapshot_benchmark.py --rows 1000000 5000000
+    python benchmarks/snapshot_benchmark.py --rows 2000000 --touch-rate 0.3 --change-rate 0.01
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+import argparse
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import duckdb
+
+DASHBOARD_DIR = Path(__file__).resolve().parent.parent / "dashboard"
+sys.path.insert(0, str(DASHBOARD_DIR))
+
+from customer_snapshot import TRACKED_COLUMNS, load_snapshot, run_snapshot  # noqa: E402
+
+
+DEFAULT_ROWS = [100_000, 1_000_000]
+DEFAULT_OUTPUT = Path("benchmarks/results/snapshot_benchmark.json")
+START_DATE = "2024-01-01"
+
+# Deterministic per-row draws in [0, 1) from a row number and a salt
+DRAW_SQL = "(hash(i, '{salt}') % 1000000) / 1000000.0"
+
+CUSTOMERS_SQL = f"""
+    SELECT 'C' || lpad(CAST(i AS VARCHAR), 9, '0') AS customer_id,
+           'Company ' || CAST(hash(i, 'name') % 50000 AS VARCHAR) AS company_name,
+           ['Technology', 'Retail', 'Finance', 'Healthcare'][1 + CAST(hash(i, 'industry') % 4 AS BIGINT)] AS industry,
+           ['small', 'medium', 'large'][1 + CAST(hash(i, 'size') % 3 AS BIGINT)] AS company_size,
+           ['United States', 'Germany', 'Japan', 'Brazil'][1 + CAST(hash(i, 'country') % 4 AS BIGINT)] AS country,
+           CASE WHEN hash(i, 'state') % 5 = 0 THEN NULL ELSE 'S' || CAST(hash(i, 'state') % 50 AS VARCHAR) END AS state,
+           'user' || CAST(i AS VARCHAR) || '@example.com' AS email,
+           DATE '{START_DATE}' AS signup_date,
+           TIMESTAMP '{START_DATE}' + to_seconds(CAST(hash(i, 'ts') % 86400 AS BIGINT)) AS updated_at
+    FROM range({{rows}}) t(i)
+"""
+
+
+def write_day(con, data_dir, rows, day, touch_rate, change_rate):
+    """Write the extract for ``day``: every customer on day 0, touched customers afterwards
+
+    Changed customers are a subset of the touched ones. Their email carries the number of
+    changes so far, so a later touch-only day re-emits the same email rather than reverting it.
+    """
+    ds = date.fromisoformat(START_DATE) + timedelta(days=day)
+    if day == 0:
+        query = CUSTOMERS_SQL.format(rows=rows)
+    else:
+        changes = ' + '.join(f"CAST({DRAW_SQL.format(salt=f'day{d}')} < {change_rate} AS INTEGER)"
+                             for d in range(1, day + 1))
+        query = f"""
+            SELECT * EXCLUDE (i, changes) REPLACE (
+                CASE WHEN changes > 0 THEN 'user' || CAST(i AS VARCHAR) || '.v' || CAST(changes AS VARCHAR)
+                     || '@example.com' ELSE email END AS email,
+                TIMESTAMP '{ds}' + to_seconds(CAST(hash(i, 'ts{day}') % 86400 AS BIGINT)) AS updated_at)
+            FROM ({CUSTOMERS_SQL.format(rows=rows).replace("SELECT ", f"SELECT i, {changes} AS changes, ", 1)})
+            WHERE {DRAW_SQL.format(salt=f'day{day}')} < {touch_rate + change_rate}
+        """
+    path = Path(data_dir) / "raw" / "customers" / f"dt={ds}" / "part-0.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con.execute(f"COPY ({query}) TO '{path.as_posix()}' (FORMAT PARQUET)")
+    return ds
+
+
+def run_rows(rows, days=7, touch_rate=0.2, change_rate=0.01, work_dir=None):
+    """Snapshot ``days`` daily extracts of a ``rows``-customer table; returns per-day timings"""
+    work_dir = Path(work_dir or tempfile.mkdtemp(prefix="snapshot_benchmark_"))
+    con = duckdb.connect()
+    result = {'rows': rows, 'days': days, 'touch_rate': touch_rate, 'change_rate': change_rate, 'runs': []}
+    timestamp_versions = check_versions = 0
+    try:
+        for day in range(days):
+            start = time.perf_counter()
+            ds = write_day(con, work_dir / "data", rows, day, touch_rate, change_rate)
+            generate_s = time.perf_counter() - start
+
+            # Full scan on a copy first, so both modes start from the same snapshot
+            full_dir = work_dir / "full"
+            shutil.rmtree(full_dir, ignore_errors=True)
+            if (work_dir / "snapshot").exists():
+                shutil.copytree(work_dir / "snapshot", full_dir)
+            start = time.perf_counter()
+            run_snapshot(work_dir / "data", full_dir, run_at=ds, full_scan=True)
+            full_scan_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            stats = run_snapshot(work_dir / "data", work_dir / "snapshot", run_at=ds)
+            incremental_s = time.perf_counter() - start
+
+            timestamp_versions += stats['touched']
+            check_versions += stats['new'] + stats['changed']
+            result['runs'].append({'ds': str(ds), 'generate_s': round(generate_s, 4),
+                                   'incremental_s': round(incremental_s, 4), 'full_scan_s': round(full_scan_s, 4),
+                                   **stats})
+            print(f"{rows:>12,} rows, {ds}: scanned {stats['scanned']:>11,} in {incremental_s:7.2f}s "
+                  f"(full scan {full_scan_s:7.2f}s); {stats['new'] + stats['changed']:>10,} versions written, "
+                  f"{stats['spurious_touches']:>10,} touches skipped")
+        result['timestamp_strategy_versions'] = timestamp_versions
+        result['check_strategy_versions'] = check_versions
+        result['stored_versions'] = len(load_snapshot(work_dir / "snapshot"))
+    finally:
+        con.close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hash-based customer snapshots")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Customer table sizes")
+    parser.add_argument("--days", type=int, default=7, help="Daily extracts to snapshot, including the initial load")
+    parser.add_argument("--touch-rate", type=float, default=0.2, help="Share of customers touched without changes per day")
+    parser.add_argument("--change-rate", type=float, default=0.01, help="Share of customers really changed per day")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT, help="JSON results file")
+    args = parser.parse_args()
+
+    results = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'duckdb': duckdb.__version__,
+        'tracked_columns': TRACKED_COLUMNS,
+        'results': [run_rows(rows, args.days, args.touch_rate, args.change_rate) for rows in args.rows],
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(results, indent=2))
+    print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
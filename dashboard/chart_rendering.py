@@ -0,0 +1,123 @@
+"""Adaptive Plotly figures that keep browser payloads bounded for large marts.
+
+Scatter plots switch from SVG to WebGL (``Scattergl``) and then to a server-side
+binned density heatmap as the point count grows; line charts are reduced with
+Largest-Triangle-Three-Buckets (LTTB), which keeps peaks and troughs so the
+shape of the series is unchanged.
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+WEBGL_THRESHOLD = 5_000  # Above this many points, scatter plots render with WebGL
+DENSITY_THRESHOLD = 200_000  # Above this, individual points are replaced by a binned density
+MAX_PAYLOAD_BYTES = 5 * 1024 ** 2  # Upper bound on the serialized data sent per figure
+BYTES_PER_VALUE = 12  # Rough JSON cost of one numeric value (digits, separator, quoting)
+DENSITY_BINS = 120
+LINE_MAX_POINTS = 2_000
+
+
+def _as_float(values):
+    """Numeric view of a column, with datetimes as int64 nanoseconds"""
+    values = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype('int64').to_numpy(dtype='float64')
+    return pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def lttb_indices(x, y, n_out):
+    """Row positions kept by Largest-Triangle-Three-Buckets downsampling to ``n_out`` points
+
+    ``x`` must be sorted. The first and last points are always kept; every bucket in
+    between keeps the point forming the largest triangle with the previously kept
+    point and the mean of the next bucket.
+    """
+    x, y = _as_float(x), _as_float(y)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (n_out - 2)
+    edges = np.floor(np.arange(n_out) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    anchor = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < n_out - 1 else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+        area = np.abs((x[anchor] - next_x) * (y[start:end] - y[anchor])
+                      - (x[anchor] - x[start:end]) * (next_y - y[anchor]))
+        anchor = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def max_points_for(n_columns, max_payload_bytes=MAX_PAYLOAD_BYTES):
+    """Points that fit the payload budget when each carries ``n_columns`` values"""
+    return max(1, int(max_payload_bytes // (BYTES_PER_VALUE * max(n_columns, 1))))
+
+
+def cap_points(df, max_points, stratify=None, random_state=0):
+    """Deterministic sample of at most ``max_points`` rows, keeping ``stratify`` group shares"""
+    if len(df) <= max_points:
+        return df
+    if stratify is None or stratify not in df.columns:
+        return df.sample(n=max_points, random_state=random_state).sort_index()
+    fraction = max_points / len(df)
+    return (df.groupby(stratify, observed=True, group_keys=False)
+              .sample(frac=fraction, random_state=random_state)
+              .sort_index())
+
+
+def _density_figure(df, x, y, title, bins=DENSITY_BINS):
+    """2D histogram computed on the server; the browser only receives the bin counts"""
+    x_values, y_values = _as_float(df[x]), _as_float(df[y])
+    finite = np.isfinite(x_values) & np.isfinite(y_values)
+    counts, x_edges, y_edges = np.histogram2d(x_values[finite], y_values[finite], bins=bins)
+    z = np.where(counts.T > 0, counts.T, np.nan)  # Empty bins stay transparent
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        colorscale='Viridis',
+        colorbar=dict(title='Customers'),
+        hovertemplate=f"{x}: %{{x:.1f}}<br>{y}: %{{y:,.0f}}<br>customers: %{{z:,}}<extra></extra>",
+    ))
+    fig.update_layout(title=f"{title} (density of {int(finite.sum()):,} points)",
+                      xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def adaptive_scatter(df, x, y, color=None, size=None, title=None,
+                     webgl_threshold=WEBGL_THRESHOLD, density_threshold=DENSITY_THRESHOLD,
+                     max_payload_bytes=MAX_PAYLOAD_BYTES):
+    """``px.scatter`` for small frames, WebGL for medium ones and a binned density for large ones
+
+    WebGL point clouds are additionally capped to the payload budget with a sample
+    that preserves the share of each ``color`` group.
+    """
+    n_rows = len(df)
+    if n_rows > density_threshold:
+        return _density_figure(df, x, y, title)
+
+    columns = [column for column in (x, y, color, size) if column is not None]
+    plot_df = cap_points(df[columns], max_points_for(len(columns), max_payload_bytes), stratify=color)
+    render_mode = 'webgl' if n_rows > webgl_threshold else 'auto'
+    fig = px.scatter(plot_df, x=x, y=y, color=color, size=size, title=title, render_mode=render_mode)
+    if len(plot_df) < n_rows:
+        fig.update_layout(title=f"{title} ({len(plot_df):,} of {n_rows:,} points)")
+    return fig
+
+
+def adaptive_line(df, x, y, title=None, max_points=LINE_MAX_POINTS):
+    """``px.line`` of a series sorted by ``x``, LTTB-downsampled to at most ``max_points``"""
+    df = df.sort_values(x)
+    if len(df) > max_points:
+        df = df.iloc[lttb_indices(df[x], df[y], max_points)]
+    return px.line(df, x=x, y=y, title=title)
@@ -0,0 +1,309 @@
+"""Incremental churn-risk scoring with the ``calculate_churn_risk`` macro's CASE ladder.
+
+A full rebuild aggregates every usage event and support interaction to re-derive each
+customer's activity recency, health score and satisfaction. This stage keeps those inputs
+per customer as mergeable running totals in ``<state_dir>/state.parquet`` and, on each
+run, aggregates only the events dated after the previous run:
+
+* customers with new usage or support events, or whose active-subscription count changed,
+  get their inputs merged and their risk recomputed;
+* every other customer keeps its inputs, and is only rescored when the elapsed days push its
+  recency across one of the ladder's (or the health score's) day thresholds.
+
+Each run writes the risk changes it found to ``<state_dir>/transitions/as_of=<date>.parquet``
+for the Recommendations tab::
+
+    python dashboard/churn_risk.py update --data-dir data --as-of 2024-06-30
+
+Events are merged once, by date; re-delivered or late events for days already processed
+need ``--full-refresh``.
+"""
+
+from pathlib import Path
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from duckdb_engine import source_relation, write_atomic
+
+try:
+    import duckdb
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Local scoring is optional; the dashboard shows a notice without it
+    duckdb = None
+
+
+CHURN_RISK_DIR = Path("data/churn_risk")
+RISK_LEVELS = ['LOW', 'MEDIUM', 'HIGH']
+NO_ACTIVITY_DAYS = 999  # days_since_last_activity for customers without usage (int_customer_metrics)
+# Day counts where the ladder (14, 30, 90) or the health score's recency bonus (7) changes
+DAY_THRESHOLDS = [7, 14, 30, 90]
+WATERMARK_KEY = b'churn_risk_as_of'
+
+STATE_COLUMNS = [
+    'customer_id', 'session_minutes', 'sessions', 'features', 'last_activity_date',
+    'satisfaction_total', 'satisfaction_responses', 'active_subscriptions',
+    'days_since_activity', 'health_score', 'satisfaction_score', 'churn_risk',
+]
+TRANSITION_COLUMNS = [
+    'as_of', 'customer_id', 'previous_risk', 'churn_risk', 'reason',
+    'days_since_activity', 'health_score', 'satisfaction_score',
+]
+
+
+def calculate_churn_risk(days_since_activity, health_score, satisfaction_score):
+    """Vectorized ``calculate_churn_risk`` macro; NaN inputs fail their comparisons like SQL NULLs"""
+    days = np.asarray(days_since_activity, dtype='float64')
+    health = np.asarray(health_score, dtype='float64')
+    satisfaction = np.asarray(satisfaction_score, dtype='float64')
+    with np.errstate(invalid='ignore'):
+        conditions = [
+            days > 90,
+            (days > 30) & (health < 40),
+            health < 30,
+            (days > 14) & (health < 60),
+            satisfaction < 3,
+        ]
+    return np.select(conditions, ['HIGH', 'HIGH', 'HIGH', 'MEDIUM', 'MEDIUM'], default='LOW')
+
+
+def customer_health_score(avg_session_duration, unique_features_used, avg_satisfaction,
+                          active_subscriptions, days_since_activity):
+    """``customer_health_score`` of ``int_customer_metrics`` (0-100) from its inputs"""
+    avg_session_duration = np.nan_to_num(np.asarray(avg_session_duration, dtype='float64'))
+    unique_features_used = np.asarray(unique_features_used, dtype='float64')
+    avg_satisfaction = np.nan_to_num(np.asarray(avg_satisfaction, dtype='float64'))
+    score = (np.where(avg_session_duration > 0, np.minimum(30, avg_session_duration), 0)
+             + np.where(unique_features_used > 0, np.minimum(20, unique_features_used * 2), 0)
+             + np.where(avg_satisfaction > 0, avg_satisfaction * 10, 0)
+             + np.where(np.asarray(active_subscriptions) > 0, 20, 0)
+             + np.where(np.asarray(days_since_activity) <= 7, 20, 0))
+    return np.minimum(100, score)
+
+
+# --- Sources ---
+def new_activity(con, data_dir, after, as_of):
+    """Per-customer usage and support totals for events dated in ``(after, as_of]``
+
+    ``after`` is None for a full refresh. Filters match the staging models.
+    """
+    window = "{column} <= CAST(? AS DATE)" + ("" if after is None else " AND {column} > CAST(? AS DATE)")
+    params = [as_of] if after is None else [as_of, after]
+    usage = con.execute(f"""
+        SELECT customer_id,
+               SUM(session_duration_minutes) AS session_minutes,
+               COUNT(session_duration_minutes) AS sessions,
+               LIST(DISTINCT TRIM(LOWER(feature_used))) FILTER (WHERE feature_used IS NOT NULL) AS features,
+               MAX(CAST(event_date AS DATE)) AS last_activity_date
+        FROM {source_relation(data_dir, 'usage_events')}
+        WHERE event_id IS NOT NULL AND customer_id IS NOT NULL AND event_date IS NOT NULL
+          AND session_duration_minutes >= 0 AND pages_viewed >= 0 AND api_calls >= 0
+          AND {window.format(column='CAST(event_date AS DATE)')}
+        GROUP BY customer_id
+    """, params).df()
+    support = con.execute(f"""
+        SELECT customer_id,
+               SUM(satisfaction_score) AS satisfaction_total,
+               COUNT(satisfaction_score) AS satisfaction_responses
+        FROM {source_relation(data_dir, 'support_interactions')}
+        WHERE interaction_id IS NOT NULL AND customer_id IS NOT NULL AND interaction_date IS NOT NULL
+          AND {window.format(column='CAST(interaction_date AS DATE)')}
+        GROUP BY customer_id
+    """, params).df()
+    return usage, support
+
+
+def active_subscription_counts(con, data_dir):
+    """Active subscriptions per customer from the latest version of each subscription"""
+    return con.execute(f"""
+        SELECT customer_id, COUNT(*) FILTER (WHERE is_active) AS active_subscriptions
+        FROM (
+            SELECT customer_id, is_active::BOOLEAN AS is_active
+            FROM {source_relation(data_dir, 'subscriptions')}
+            WHERE subscription_id IS NOT NULL AND customer_id IS NOT NULL AND subscription_start_date IS NOT NULL
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY subscription_id ORDER BY updated_at::TIMESTAMP DESC) = 1
+        )
+        GROUP BY customer_id
+    """).df()
+
+
+# --- State ---
+def load_state(state_dir=CHURN_RISK_DIR):
+    """Per-customer inputs and risk of the last run, and the date it was computed as of"""
+    path = Path(state_dir) / "state.parquet"
+    if not path.exists():
+        return pd.DataFrame(columns=STATE_COLUMNS).set_index('customer_id'), None
+    table = pq.read_table(path)
+    as_of = (table.schema.metadata or {}).get(WATERMARK_KEY)
+    return table.to_pandas().set_index('customer_id'), as_of.decode() if as_of else None
+
+
+def save_state(state, as_of, state_dir=CHURN_RISK_DIR):
+    table = pa.Table.from_pandas(state.reset_index()[STATE_COLUMNS], preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), WATERMARK_KEY: str(as_of).encode()})
+    write_atomic(Path(state_dir) / "state.parquet", lambda tmp_path: pq.write_table(table, tmp_path))
+
+
+def _merge_features(previous, new):
+    """Union of each customer's previously seen and newly used features"""
+    exploded = pd.concat([previous.explode(), new.explode()]).dropna()
+    merged = exploded.groupby(level=0).unique().map(sorted)
+    return merged.reindex(new.index)
+
+
+def merge_activity(state, usage, support, subscriptions):
+    """Fold new event totals and current subscription counts into the state
+
+    Returns the merged state and a mask of customers whose inputs changed (including new ones).
+    """
+    usage = usage.set_index('customer_id')
+    support = support.set_index('customer_id')
+    subscriptions = subscriptions.set_index('customer_id')['active_subscriptions']
+    customers = state.index.union(usage.index).union(support.index).union(subscriptions.index)
+    merged = state.reindex(customers)
+    changed = pd.Series(~customers.isin(state.index), index=customers)
+
+    if len(usage):
+        ids = usage.index
+        for column in ['session_minutes', 'sessions']:
+            merged.loc[ids, column] = merged.loc[ids, column].fillna(0).to_numpy() + usage[column].to_numpy()
+        merged.loc[ids, 'last_activity_date'] = pd.concat(
+            [pd.to_datetime(merged.loc[ids, 'last_activity_date']), pd.to_datetime(usage['last_activity_date'])],
+            axis=1).max(axis=1).dt.date.to_numpy()
+        merged['features'] = merged['features'].astype(object)
+        merged.loc[ids, 'features'] = _merge_features(merged.loc[ids, 'features'], usage['features']).to_numpy()
+        changed[ids] = True
+    if len(support):
+        ids = support.index
+        for column in ['satisfaction_total', 'satisfaction_responses']:
+            merged.loc[ids, column] = merged.loc[ids, column].fillna(0).to_numpy() + support[column].to_numpy()
+        changed[ids] = True
+
+    active = subscriptions.reindex(customers).fillna(0)
+    changed |= merged['active_subscriptions'].fillna(-1).ne(active)
+    merged['active_subscriptions'] = active
+    return merged, changed
+
+
+def rescore(state, mask):
+    """Recompute health, satisfaction and risk for the masked customers from their inputs"""
+    rows = state.loc[mask]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_session = rows['session_minutes'].astype('float64') / rows['sessions'].astype('float64')
+        # No support responses means no satisfaction signal (NULL), not a dissatisfied customer
+        satisfaction = rows['satisfaction_total'].astype('float64') / rows['satisfaction_responses'].astype('float64')
+    satisfaction = satisfaction.where(rows['satisfaction_responses'].fillna(0) > 0)
+    unique_features = rows['features'].map(lambda features: len(features) if isinstance(features, (list, np.ndarray)) else 0)
+    health = customer_health_score(avg_session, unique_features, satisfaction,
+                                   rows['active_subscriptions'], rows['days_since_activity'])
+    state.loc[mask, 'health_score'] = health
+    state.loc[mask, 'satisfaction_score'] = satisfaction.to_numpy()
+    state.loc[mask, 'churn_risk'] = calculate_churn_risk(rows['days_since_activity'], health, satisfaction)
+    return state
+
+
+def update(data_dir=Path("data"), state_dir=CHURN_RISK_DIR, as_of=None, full_refresh=False):
+    """Advance the churn-risk state to ``as_of`` and write that day's risk transitions
+
+    Returns a summary dict with the transitions, or None when the state is already at or
+    past ``as_of`` (a rerun of a processed day changes nothing).
+    """
+    if duckdb is None:
+        raise ImportError("duckdb and pyarrow are required for churn-risk scoring")
+    as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+    previous, watermark = load_state(state_dir)
+    if watermark is not None and not full_refresh and pd.Timestamp(watermark) >= as_of:
+        return None
+
+    base = previous.iloc[0:0] if full_refresh else previous
+    after = None if full_refresh or watermark is None else watermark
+    con = duckdb.connect()
+    try:
+        usage, support = new_activity(con, data_dir, after, as_of.date())
+        subscriptions = active_subscription_counts(con, data_dir)
+    finally:
+        con.close()
+
+    state, changed = merge_activity(base.copy(), usage, support, subscriptions)
+    last_activity = pd.to_datetime(state['last_activity_date'])
+    days = (as_of - last_activity).dt.days.fillna(NO_ACTIVITY_DAYS).astype('int64')
+    previous_days = state['days_since_activity'].astype('float64')
+    crossed = np.zeros(len(state), dtype=bool)
+    for threshold in DAY_THRESHOLDS:
+        crossed |= ((previous_days <= threshold) & (days > threshold)).to_numpy()
+    state['days_since_activity'] = days
+    mask = changed.to_numpy() | crossed
+    state = rescore(state, mask)
+
+    previous_risk = previous['churn_risk'].reindex(state.index)
+    moved = mask & previous_risk.notna().to_numpy() & (previous_risk != state['churn_risk']).to_numpy()
+    transitions = state.loc[moved, ['churn_risk', 'days_since_activity', 'health_score', 'satisfaction_score']].assign(
+        previous_risk=previous_risk[moved],
+        reason=np.where(changed[moved], 'activity', 'elapsed'),
+        as_of=as_of.date(),
+    ).reset_index()[TRANSITION_COLUMNS]
+
+    table = pa.Table.from_pandas(transitions, preserve_index=False)
+    write_atomic(Path(state_dir) / "transitions" / f"as_of={as_of.date()}.parquet",
+                 lambda tmp_path: pq.write_table(table, tmp_path))
+    save_state(state, as_of.date(), state_dir)
+    return {'as_of': as_of.date(), 'customers': len(state), 'rescored': int(mask.sum()),
+            'transitions': transitions, 'state': state}
+
+
+# --- Dashboard ---
+def transitions_version(state_dir=CHURN_RISK_DIR):
+    """Stat-based token of the transition log, for caching it per run"""
+    paths = sorted((Path(state_dir) / "transitions").glob("*.parquet"))
+    return "|".join(f"{path.name}:{path.stat().st_mtime_ns}" for path in paths)
+
+
+def load_transitions(state_dir=CHURN_RISK_DIR, since=None):
+    """Logged risk transitions, optionally only from runs on or after ``since``"""
+    paths = sorted((Path(state_dir) / "transitions").glob("as_of=*.parquet"))
+    if since is not None:
+        paths = [path for path in paths if path.stem.split('=', 1)[1] >= str(since)]
+    frames = [pd.read_parquet(path) for path in paths]
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=TRANSITION_COLUMNS)
+    transitions = pd.concat(frames, ignore_index=True)
+    transitions['as_of'] = pd.to_datetime(transitions['as_of'])
+    return transitions
+
+
+def transition_matrix(transitions):
+    """Customer counts by previous (rows) and new (columns) risk level"""
+    return pd.crosstab(
+        pd.Categorical(transitions['previous_risk'], RISK_LEVELS),
+        pd.Categorical(transitions['churn_risk'], RISK_LEVELS),
+        rownames=['from'], colnames=['to'], dropna=False,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally score customer churn risk")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    update_parser = subparsers.add_parser("update", help="Advance the state to --as-of and log transitions")
+    update_parser.add_argument("--data-dir", type=Path, default=Path("data"),
+                               help="Directory with raw/<table>/ partitions or <table>.csv/.parquet files")
+    update_parser.add_argument("--state-dir", type=Path, default=CHURN_RISK_DIR)
+    update_parser.add_argument("--as-of", default=None, help="Scoring date (default: today)")
+    update_parser.add_argument("--full-refresh", action="store_true", help="Rebuild the inputs from all events")
+    args = parser.parse_args()
+
+    result = update(args.data_dir, args.state_dir, args.as_of, args.full_refresh)
+    if result is None:
+        print(f"Churn risk in {args.state_dir} is already scored as of {args.as_of or 'today'}")
+        return
+    transitions = result['transitions']
+    print(f"Rescored {result['rescored']:,} of {result['customers']:,} customers as of {result['as_of']}; "
+          f"{len(transitions):,} risk transitions")
+    if len(transitions):
+        print(transition_matrix(transitions).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Figure builders shared by the dashboard tabs and the precomputed serving bundle."""
+
+import plotly.express as px
+
+from chart_rendering import adaptive_scatter, adaptive_line
+from kpi_calculations import daily_subscription_trend
+
+
+CARD_LAYOUT = dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    height=400,
+    font=dict(size=12)
+)
+DARK_LAYOUT = dict(
+    plot_bgcolor='rgba(0,0,0,0)',
+    paper_bgcolor='rgba(0,0,0,0)',
+    font=dict(family="SF Pro Display, -apple-system, BlinkMacSystemFont, sans-serif", color='white')
+)
+
+
+def customer_segment_pie(customers):
+    """Customer segment distribution for a filtered ``dim_customers``"""
+    segment_dist = customers['customer_segment'].value_counts()
+    segment_dist = segment_dist[segment_dist > 0]  # Drop categories filtered out
+    fig_segments = px.pie(
+        values=segment_dist.values,
+        names=segment_dist.index,
+        title="Customer Segment Distribution"
+    )
+    fig_segments.update_layout(**CARD_LAYOUT)
+    return fig_segments
+
+
+def health_vs_mrr_scatter(customers):
+    """Health score vs MRR; WebGL / server-side density above a size threshold keeps the payload bounded"""
+    fig_health = adaptive_scatter(
+        customers,
+        x='customer_health_score',
+        y='current_mrr',
+        color='churn_risk',
+        size='estimated_ltv',
+        title="Customer Health Score vs MRR"
+    )
+    fig_health.update_layout(**CARD_LAYOUT)
+    return fig_health
+
+
+def mrr_trend_line(metrics):
+    """Daily MRR trend across the groups of a filtered ``fact_subscription_metrics``"""
+    daily_metrics = daily_subscription_trend(metrics)
+    fig_mrr = adaptive_line(daily_metrics, x='metric_date', y='total_mrr',
+                            title='MRR Trend Analysis')
+    fig_mrr.update_layout(**DARK_LAYOUT)
+    fig_mrr.update_traces(line_color='rgba(0, 184, 148, 0.9)', line_width=3)
+    return fig_mrr
+
+
+def ltv_distribution_box(ltv):
+    """Predicted LTV by segment, or None when the mart has no ``ltv_segment``"""
+    if 'ltv_segment' not in ltv.columns:
+        return None
+    fig_ltv_dist = px.box(ltv, x='ltv_segment', y='predicted_ltv',
+                          title='LTV Distribution by Segment')
+    fig_ltv_dist.update_layout(**DARK_LAYOUT)
+    return fig_ltv_dist
+
+
+FIGURE_BUILDERS = {
+    'customer_segment_pie': customer_segment_pie,
+    'health_vs_mrr_scatter': health_vs_mrr_scatter,
+    'mrr_trend_line': mrr_trend_line,
+    'ltv_distribution_box': ltv_distribution_box,
+}
@@ -0,0 +1,211 @@
+"""Data mart loading following dbt patterns, shared by the dashboard and offline tooling."""
+
+import streamlit as st
+import pandas as pd
+from collections.abc import Mapping
+from pathlib import Path
+import threading
+
+from duckdb_engine import DuckDBMartRunner, duckdb_available
+from mart_cache import MartCache
+from mart_schema import apply_schema, memory_report
+from synthetic_data import SyntheticMartGenerator
+
+try:
+    import pyarrow as pa
+except ImportError:  # Without pyarrow there is no on-disk cache to write to
+    pa = None
+
+
+MART_NAMES = [
+    'dim_customers', 'dim_products', 'fact_subscription_metrics',
+    'fact_customer_ltv', 'fact_pricing_optimization', 'mart_executive_daily', 'mart_executive_summary'
+]
+
+
+class DataMartManager:
+    """Manages data marts following dbt patterns"""
+    
+    def __init__(self, sql_engine="duckdb", source_data_path=Path("data"), cache_dir=Path(".mart_cache"),
+                 fallback_customers=1000, data_path=None):
+        # Try multiple possible paths for dbt models (an explicit data_path is tried first)
+        possible_paths = [Path(data_path)] if data_path is not None else []
+        possible_paths += [
+            Path("dbt_models/models/marts"),
+            Path("models/marts"),
+            Path("marts"),
+            Path("data/marts"),
+            Path("data")
+        ]
+        
+        self.data_path = None
+        for path in possible_paths:
+            if path.exists():
+                self.data_path = path
+                break
+        
+        if self.data_path is None:
+            self.data_path = Path("data")
+            self.data_path.mkdir(exist_ok=True)
+        
+        self.marts = {}
+        # The dashboard shares one manager across sessions, and its DuckDB connection is not thread-safe
+        self._lock = threading.RLock()
+        
+        # SQL marts are executed locally when DuckDB is installed, otherwise synthetic data is served
+        self.sql_engine = sql_engine if sql_engine == "duckdb" and duckdb_available() else None
+        self.source_data_path = Path(source_data_path)
+        self.sql_errors = {}
+        self.cache_errors = {}
+        self._sql_runner = None
+        
+        # Synthetic marts are generated together so customer ids line up across them
+        self.fallback_customers = fallback_customers
+        self._fallback_marts = None
+        
+        # Columnar on-disk cache so warm restarts memory-map marts instead of re-parsing sources
+        try:
+            self.cache = MartCache(cache_dir) if cache_dir is not None else None
+        except (ImportError, OSError):
+            self.cache = None
+        
+    @property
+    def sql_runner(self):
+        """DuckDB runner for the dbt project containing the mart SQL, created on first use"""
+        if self._sql_runner is None:
+            project_dir = self.data_path
+            while project_dir != project_dir.parent and not (project_dir / "dbt_project.yml").exists():
+                project_dir = project_dir.parent
+            self._sql_runner = DuckDBMartRunner(project_dir=project_dir, data_dir=self.source_data_path)
+        return self._sql_runner
+    
+    def _run_sql_mart(self, mart_name, file_path):
+        """Execute mart SQL in DuckDB, falling back to generated data if it cannot run"""
+        if self.sql_engine is None:
+            return self._generate_fallback_data(mart_name)
+        try:
+            df = self.sql_runner.run_model(file_path.stem)
+        except Exception as e:
+            # Missing raw sources or warehouse-only SQL should not take the dashboard down
+            self.sql_errors[mart_name] = str(e)
+            return self._generate_fallback_data(mart_name)
+        self.sql_errors.pop(mart_name, None)
+        return self._store_mart(mart_name, file_path, self.sql_runner.input_files(file_path.stem), df)
+    
+    def _store_mart(self, mart_name, file_path, source_paths, df):
+        """Register a freshly built mart, persisting it to the on-disk cache when enabled"""
+        if self.cache is not None:
+            try:
+                self.cache.put(mart_name, file_path, source_paths, df)
+                # Serve the memory-mapped copy so cold and warm loads return identical frames
+                df = self.cache.read(mart_name)
+            except (OSError, pa.ArrowException) as e:
+                # A full disk or a column Arrow cannot store only costs the warm restart
+                self.cache_errors[mart_name] = str(e)
+            else:
+                self.cache_errors.pop(mart_name, None)
+        self.marts[mart_name] = df
+        return df
+    
+    def _mart_candidates(self, mart_name):
+        """Files a mart may be loaded from, in priority order"""
+        return [
+            self.data_path / f"{mart_name}.csv",
+            self.data_path / f"{mart_name}.sql",
+            self.data_path / f"{mart_name}.parquet",
+            # Also try without marts prefix if the mart_name includes it
+            self.data_path / f"{mart_name.replace('mart_', '')}.csv",
+            self.data_path / f"{mart_name.replace('mart_', '')}.sql"
+        ]
+    
+    def data_version(self, mart_names):
+        """Cheap token identifying the current on-disk state of the given marts' sources"""
+        available = [str(path) for name in mart_names for path in self._mart_candidates(name) if path.exists()]
+        cache_version = self.cache.data_version(mart_names) if self.cache is not None else ""
+        return f"{cache_version}:{'|'.join(available)}"
+        
+    def load_mart(self, mart_name, required=True):
+        """Load a data mart with error handling and apply its declared schema"""
+        with self._lock:
+            df = apply_schema(mart_name, self._load_mart_source(mart_name, required))
+            self.marts[mart_name] = df
+        return df
+    
+    def load_marts(self, mart_names=MART_NAMES, required=False):
+        """Load several marts at once, keyed by name"""
+        return {mart_name: self.load_mart(mart_name, required=required) for mart_name in mart_names}
+    
+    def memory_report(self):
+        """In-memory footprint of every mart loaded so far"""
+        return memory_report(self.marts)
+    
+    def _load_mart_source(self, mart_name, required=True):
+        """Load a data mart as stored, from cache, source file, SQL or generated fallback"""
+        try:
+            # Try different file extensions and naming conventions
+            possible_files = self._mart_candidates(mart_name)
+            
+            for file_path in possible_files:
+                if file_path.exists():
+                    cached = self.cache.get(mart_name, file_path) if self.cache is not None else None
+                    if cached is not None:
+                        self.marts[mart_name] = cached
+                        return cached
+                    
+                    if file_path.suffix == '.csv':
+                        return self._store_mart(mart_name, file_path, [file_path], pd.read_csv(file_path))
+                    elif file_path.suffix == '.sql':
+                        return self._run_sql_mart(mart_name, file_path)
+                    elif file_path.suffix == '.parquet':
+                        return self._store_mart(mart_name, file_path, [file_path], pd.read_parquet(file_path))
+            
+            # No files found
+            if required:
+                st.error(f"Required data mart '{mart_name}' not found in {self.data_path}")
+                st.stop()
+            else:
+                return self._generate_fallback_data(mart_name)
+                
+        except Exception as e:
+            if required:
+                st.error(f"Error loading {mart_name}: {str(e)}")
+                st.stop()
+            else:
+                return self._generate_fallback_data(mart_name)
+    
+    def _generate_fallback_data(self, mart_name):
+        """Generate fallback data when marts are missing"""
+        if self._fallback_marts is None:
+            self._fallback_marts = SyntheticMartGenerator(n_customers=self.fallback_customers).generate()
+        return self._fallback_marts.get(mart_name, pd.DataFrame())
+
+
+class LazyMartRegistry(Mapping):
+    """Mart name -> DataFrame mapping that loads each mart on first access
+
+    ``loader(mart_name)`` is called at most once per registry, so a rerun only pays
+    for the marts the visible section actually reads.
+    """
+    
+    def __init__(self, loader, mart_names=MART_NAMES):
+        self.loader = loader
+        self.mart_names = list(mart_names)
+        self._loaded = {}
+    
+    def __getitem__(self, mart_name):
+        if mart_name not in self._loaded:
+            if mart_name not in self.mart_names:
+                raise KeyError(mart_name)
+            self._loaded[mart_name] = self.loader(mart_name)
+        return self._loaded[mart_name]
+    
+    def __iter__(self):
+        return iter(self.mart_names)
+    
+    def __len__(self):
+        return len(self.mart_names)
+    
+    @property
+    def loaded(self):
+        """Marts loaded so far, without triggering any further loads"""
+        return dict(self._loaded)
@@ -0,0 +1,293 @@
+"""Single-pass data-quality profiler for the raw extract partitions.
+
+Computes the ``data_quality_metrics`` counters (row and key counts, per-column NULLs and the
+null/range flags of each source table) in one vectorized pass over each Parquet partition
+under ``data/raw/<table>/``. Partitions are profiled in parallel worker processes and each
+result is stored next to its fingerprint (file size and mtime) in
+``<profile_dir>/<table>/<partition>/profile.parquet``, so unchanged partitions are never
+read again. Counters are additive; distinct keys are kept as sorted 64-bit key hashes per
+partition and merged exactly. Each run also writes the per-table scores to
+``<profile_dir>/scores.parquet`` for the dashboard::
+
+    python dashboard/dq_profiler.py profile --data-dir data --workers 4
+
+Business-rule checks run on the marts instead (``business_rules``), one pass per mart.
+Partitions are profiled before staging, so rows the staging models filter out or
+deduplicate still count against the score.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from duckdb_engine import write_atomic
+from hll import hash_values
+
+
+PROFILE_DIR = Path("data/dq/profiles")
+SCORE_COLUMNS = ['table_name', 'total_records', 'unique_keys', 'flagged_records', 'uniqueness_check',
+                 'data_quality_score', 'severity', 'last_checked']
+
+
+def _blank(values):
+    return values.isna() | values.eq('')
+
+
+# Source table -> primary key, whether a key reappears in later extracts (updated rows), the
+# date column future-dated checks depend on, and the data_quality_metrics flags as
+# vectorized functions of a partition's rows and the profiling date
+TABLE_CHECKS = {
+    'customers': {
+        'key': 'customer_id',
+        'versioned': True,
+        'date_column': None,
+        'checks': {
+            'missing_email': lambda df, today: _blank(df['email']),
+            'missing_signup_date': lambda df, today: df['signup_date'].isna(),
+            'missing_country': lambda df, today: _blank(df['country']),
+        },
+    },
+    'subscriptions': {
+        'key': 'subscription_id',
+        'versioned': True,
+        'date_column': None,
+        'checks': {
+            'invalid_revenue': lambda df, today: df['monthly_revenue'] <= 0,
+            'invalid_dates': lambda df, today: (pd.to_datetime(df['subscription_end_date'])
+                                                < pd.to_datetime(df['subscription_start_date'])),
+            'missing_customer_id': lambda df, today: df['customer_id'].isna(),
+        },
+    },
+    'usage_events': {
+        'key': 'event_id',
+        'versioned': False,
+        'date_column': 'event_date',
+        'checks': {
+            'negative_duration': lambda df, today: df['session_duration_minutes'] < 0,
+            'negative_pages': lambda df, today: df['pages_viewed'] < 0,
+            'future_dates': lambda df, today: pd.to_datetime(df['event_date']) > today,
+        },
+    },
+}
+
+
+# --- Partition profiling ---
+def source_partitions(data_dir, table):
+    """Parquet partitions of ``data/raw/<table>/``, or a flat ``data/<table>`` file as one partition"""
+    raw_dir = Path(data_dir) / "raw" / table
+    if raw_dir.is_dir():
+        return sorted(raw_dir.rglob("*.parquet"))
+    for extension in ('.parquet', '.csv'):
+        path = Path(data_dir) / f"{table}{extension}"
+        if path.exists():
+            return [path]
+    return []
+
+
+def _fingerprint(path):
+    stat = Path(path).stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def profile_frame(df, table, today):
+    """All counters of one partition's rows, as a dict; the key hashes are packed to bytes"""
+    spec = TABLE_CHECKS[table]
+    keys = df[spec['key']]
+    present = keys.notna().to_numpy()
+    key_hashes = np.unique(hash_values(keys[present].astype(str).to_numpy()))
+    profile = {
+        'rows': len(df),
+        'null_keys': int((~present).sum()),
+        'duplicate_keys': int(present.sum() - len(key_hashes)),
+        'key_hashes': key_hashes.astype('<u8').tobytes(),
+    }
+    profile.update({f"null_{column}": int(df[column].isna().sum()) for column in df.columns})
+    profile.update({name: int(check(df, today).sum()) for name, check in spec['checks'].items()})
+    latest = pd.to_datetime(df[spec['date_column']]).max() if spec['date_column'] else pd.NaT
+    profile['max_date'] = latest.normalize() if pd.notna(latest) else pd.NaT
+    return profile
+
+
+def _profile_partition(table, source, out_path, today):
+    """Worker: profile one partition and write its result atomically"""
+    source, out_path, today = Path(source), Path(out_path), pd.Timestamp(today)
+    df = pd.read_csv(source) if source.suffix == '.csv' else pd.read_parquet(source)
+    size, mtime_ns = _fingerprint(source)
+    record = {'table_name': table, 'partition': str(source), 'size': size, 'mtime_ns': mtime_ns,
+              'profiled_on': today, 'profiled_at': pd.Timestamp(datetime.now()), **profile_frame(df, table, today)}
+    write_atomic(out_path, lambda tmp_path: pd.DataFrame([record]).to_parquet(tmp_path, index=False))
+    return len(df)
+
+
+def _profile_path(data_dir, profile_dir, table, source):
+    source = Path(source)
+    raw_dir = Path(data_dir) / "raw" / table
+    relative = source.relative_to(raw_dir).with_suffix('') if raw_dir in source.parents else Path(source.stem)
+    return Path(profile_dir) / table / relative / "profile.parquet"
+
+
+def _is_current(profile_path, source, today):
+    """A stored profile is reused while its partition is unchanged and its dates are not yet past"""
+    if not profile_path.exists():
+        return False
+    stored = pd.read_parquet(profile_path, columns=['size', 'mtime_ns', 'profiled_on', 'max_date']).iloc[0]
+    if (int(stored['size']), int(stored['mtime_ns'])) != _fingerprint(source):
+        return False
+    # Future-dated rows stop being future once their date passes, which changes future_dates
+    return (pd.isna(stored['max_date']) or stored['max_date'] <= stored['profiled_on']
+            or today == stored['profiled_on'])
+
+
+def profile(data_dir=Path("data"), profile_dir=PROFILE_DIR, tables=None, workers=1, today=None):
+    """Profile new and changed partitions, drop profiles of removed ones and rewrite the scores
+
+    Returns the number of partitions profiled and reused per table.
+    """
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    profile_dir = Path(profile_dir)
+    jobs, stats = [], {}
+    for table in tables or TABLE_CHECKS:
+        sources = source_partitions(data_dir, table)
+        expected = {_profile_path(data_dir, profile_dir, table, source): source for source in sources}
+        pending = [(table, str(source), str(path), today) for path, source in expected.items()
+                   if not _is_current(path, source, today)]
+        for orphan in set((profile_dir / table).rglob("profile.parquet")) - set(expected):
+            orphan.unlink()
+        jobs.extend(pending)
+        stats[table] = {'partitions': len(sources), 'profiled': len(pending), 'reused': len(sources) - len(pending)}
+
+    if workers <= 1:
+        for job in jobs:
+            _profile_partition(*job)
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(_profile_partition, *zip(*jobs)))
+
+    scores = table_scores(load_profiles(profile_dir))
+    write_atomic(profile_dir / "scores.parquet", lambda tmp_path: scores.to_parquet(tmp_path, index=False))
+    return stats
+
+
+def load_profiles(profile_dir=PROFILE_DIR):
+    """Every stored partition profile, one row per partition"""
+    frames = [pd.read_parquet(path) for path in sorted(Path(profile_dir).rglob("profile.parquet"))]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+# --- Scores ---
+def table_scores(profiles):
+    """data_quality_metrics-style scores per source table from the partition profiles
+
+    Versioned tables (customers, subscriptions) repeat a key in every extract that updates
+    it, so only duplicates within one partition count; usage events must be unique overall.
+    """
+    rows = []
+    for table, spec in TABLE_CHECKS.items():
+        if profiles.empty or table not in set(profiles['table_name']):
+            continue
+        partitions = profiles[profiles['table_name'] == table]
+        hashes = np.frombuffer(b''.join(partitions['key_hashes']), dtype='<u8')
+        unique_keys = len(np.unique(hashes))
+        total = int(partitions['rows'].sum())
+        if spec['versioned']:
+            duplicates = int(partitions['duplicate_keys'].sum())
+        else:
+            duplicates = total - int(partitions['null_keys'].sum()) - unique_keys
+        flagged = int(partitions[list(spec['checks'])].sum().sum())
+        rows.append({
+            'table_name': table,
+            'total_records': total,
+            'unique_keys': unique_keys,
+            'flagged_records': flagged,
+            'uniqueness_check': 'PASS' if duplicates == 0 else 'FAIL',
+            'data_quality_score': 100 - flagged / total * 100 if total else 100.0,
+            'severity': None,
+            'last_checked': partitions['profiled_at'].max(),
+            'partitions': len(partitions),
+            **{name: int(partitions[name].sum()) for name in spec['checks']},
+        })
+    if not rows:
+        return pd.DataFrame(columns=SCORE_COLUMNS)
+    return pd.DataFrame(rows)
+
+
+def load_scores(profile_dir=PROFILE_DIR):
+    """Scores written by the last ``profile`` run"""
+    path = Path(profile_dir) / "scores.parquet"
+    return pd.read_parquet(path) if path.exists() else pd.DataFrame(columns=SCORE_COLUMNS)
+
+
+def scores_version(profile_dir=PROFILE_DIR):
+    """Stat-based token of the scores file, for caching it per profiling run"""
+    path = Path(profile_dir) / "scores.parquet"
+    return path.stat().st_mtime_ns if path.exists() else None
+
+
+# Rule -> (mart, columns it needs, severity); the two fact_subscription_metrics rules share one
+# filtered pass over the mart's last 30 days
+BUSINESS_RULES = {
+    'Customer LTV Validation': ('dim_customers', ['estimated_ltv'], 'Critical'),
+    'MRR Consistency Check': ('fact_subscription_metrics', ['total_mrr', 'net_new_mrr'], 'High'),
+    'Churn Rate Bounds Check': ('fact_subscription_metrics', ['daily_churn_rate_pct'], 'Medium'),
+}
+
+
+def business_rules(dim_customers, fact_subscription_metrics, today=None, days=30):
+    """The data_quality_metrics business-rule checks, one pass over each mart
+
+    Rules whose columns a mart does not have (e.g. a trimmed sample) are left out.
+    """
+    today = pd.Timestamp(today or pd.Timestamp.today()).normalize()
+    recent = fact_subscription_metrics[
+        pd.to_datetime(fact_subscription_metrics['metric_date']) >= today - pd.Timedelta(days=days)]
+    marts = {'dim_customers': dim_customers, 'fact_subscription_metrics': recent}
+    failures = {
+        'Customer LTV Validation': lambda df: df['estimated_ltv'] < 0,
+        'MRR Consistency Check': lambda df: (df['total_mrr'] < 0) | (df['net_new_mrr'] > df['total_mrr'] * 2),
+        'Churn Rate Bounds Check': lambda df: (df['daily_churn_rate_pct'] < 0) | (df['daily_churn_rate_pct'] > 100),
+    }
+    rows = []
+    for name, (mart, columns, severity) in BUSINESS_RULES.items():
+        df = marts[mart]
+        if not set(columns) <= set(df.columns):
+            continue
+        failed, total = int(failures[name](df).sum()), len(df)
+        rows.append({
+            'table_name': name,
+            'total_records': total,
+            'unique_keys': np.nan,
+            'flagged_records': failed,
+            'uniqueness_check': 'PASS' if failed == 0 else 'FAIL',
+            'data_quality_score': 100 - failed / total * 100 if total else 100.0,
+            'severity': severity,
+            'last_checked': pd.Timestamp(datetime.now()),
+        })
+    return pd.DataFrame(rows, columns=SCORE_COLUMNS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile raw extract partitions for data quality")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    profile_parser = subparsers.add_parser("profile", help="Profile new and changed partitions and rewrite the scores")
+    profile_parser.add_argument("--data-dir", type=Path, default=Path("data"),
+                                help="Directory with raw/<table>/ partitions or <table>.csv/.parquet files")
+    profile_parser.add_argument("--profile-dir", type=Path, default=PROFILE_DIR)
+    profile_parser.add_argument("--tables", nargs="+", choices=list(TABLE_CHECKS))
+    profile_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    stats = profile(args.data_dir, args.profile_dir, args.tables, args.workers)
+    for table, counts in stats.items():
+        print(f"{table}: profiled {counts['profiled']:,} of {counts['partitions']:,} partitions "
+              f"({counts['reused']:,} unchanged)")
+    print(load_scores(args.profile_dir)[['table_name', 'total_records', 'unique_keys', 'flagged_records',
+                                         'uniqueness_check', 'data_quality_score']].round(2).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""Run the dbt mart SQL in-process against local files using DuckDB."""
+
+from pathlib import Path
+from types import SimpleNamespace
+import os
+import re
+
+import pandas as pd
+
+try:
+    import duckdb
+    import jinja2
+except ImportError:  # DuckDB execution is optional; callers fall back to synthetic data
+    duckdb = None
+    jinja2 = None
+
+
+# Snowflake-style helpers used throughout the dbt models that DuckDB lacks natively
+DIALECT_MACROS = [
+    """
+    CREATE OR REPLACE MACRO dateadd(part, n, d) AS
+        CASE lower(part)
+            WHEN 'day' THEN CAST(d AS TIMESTAMP) + to_days(CAST(n AS INTEGER))
+            WHEN 'week' THEN CAST(d AS TIMESTAMP) + to_days(CAST(n AS INTEGER) * 7)
+            WHEN 'month' THEN CAST(d AS TIMESTAMP) + to_months(CAST(n AS INTEGER))
+            WHEN 'year' THEN CAST(d AS TIMESTAMP) + to_years(CAST(n AS INTEGER))
+        END
+    """,
+]
+
+SOURCE_EXTENSIONS = ['.parquet', '.csv']
+
+
+def duckdb_available():
+    """Whether the optional DuckDB execution dependencies are installed"""
+    return duckdb is not None and jinja2 is not None
+
+
+def fetch_arrow(relation):
+    """Materialize a DuckDB result as a pyarrow Table across DuckDB versions"""
+    result = relation.arrow()
+    # Newer DuckDB releases return a RecordBatchReader rather than a Table
+    if hasattr(result, 'read_all'):
+        result = result.read_all()
+    return result
+
+
+def source_location(data_dir, table):
+    """``(path, DuckDB table function)`` for a source's ``data/raw/<table>/`` partitions or flat file, or None"""
+    raw_dir = Path(data_dir) / "raw" / table
+    if raw_dir.is_dir() and any(raw_dir.rglob("*.parquet")):
+        # Partitions written before a column was added lack it; union_by_name fills it with NULLs
+        return raw_dir, (f"read_parquet('{(raw_dir / '**' / '*.parquet').as_posix()}', "
+                         f"hive_partitioning = true, union_by_name = true)")
+
+    for extension in SOURCE_EXTENSIONS:
+        file_path = Path(data_dir) / f"{table}{extension}"
+        if file_path.exists():
+            if extension == '.parquet':
+                return file_path, f"read_parquet('{file_path.as_posix()}')"
+            return file_path, f"read_csv_auto('{file_path.as_posix()}', header = true)"
+    return None
+
+
+def source_relation(data_dir, table):
+    """DuckDB table function reading a source, for engines that query raw files outside dbt"""
+    location = source_location(data_dir, table)
+    if location is None:
+        raise FileNotFoundError(f"No local file for source '{table}' in {data_dir}")
+    return location[1]
+
+
+def write_atomic(path, write):
+    """Run ``write(tmp_path)`` next to ``path`` and rename into place, so readers never see a partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+class _DbtUtilsShim:
+    """Subset of dbt_utils macros referenced by the project models"""
+
+    @staticmethod
+    def generate_surrogate_key(field_list):
+        fields = [
+            f"COALESCE(CAST({field} AS VARCHAR), '_dbt_utils_surrogate_key_null_')"
+            for field in field_list
+        ]
+        return f"MD5(CONCAT_WS('-', {', '.join(fields)}))"
+
+    @staticmethod
+    def date_spine(datepart, start_date, end_date):
+        return (
+            f"SELECT CAST(range AS TIMESTAMP) AS date_{datepart} "
+            f"FROM range(CAST({start_date} AS TIMESTAMP), CAST({end_date} AS TIMESTAMP), INTERVAL 1 {datepart})"
+        )
+
+
+class DuckDBMartRunner:
+    """Compiles dbt models with a minimal Jinja context and executes them in DuckDB
+
+    ``ref()`` resolves to other models in the project, built on demand, and
+    ``source()`` resolves to ``<data_dir>/<table>.parquet``, ``<data_dir>/<table>.csv``
+    or a ``<data_dir>/raw/<table>/`` directory of (optionally hive-partitioned) Parquet.
+    """
+
+    def __init__(self, project_dir=Path("dbt_models"), data_dir=Path("data"), database=":memory:"):
+        if not duckdb_available():
+            raise ImportError("duckdb and jinja2 are required for SQL mart execution")
+
+        self.project_dir = Path(project_dir)
+        self.data_dir = Path(data_dir)
+        self.con = duckdb.connect(database)
+        for macro in DIALECT_MACROS:
+            self.con.execute(macro)
+
+        # Deeper paths win so models/marts/x.sql shadows a stray models/x.sql
+        model_files = sorted((self.project_dir / "models").rglob("*.sql"), key=lambda p: len(p.parts))
+        self.models = {path.stem: path for path in model_files}
+
+        self.built = set()
+        self.sources_used = {}
+        # Files (model SQL, macros, source data) each built model was derived from
+        self.model_inputs = {}
+        self._building = []
+        self.env = jinja2.Environment(undefined=jinja2.StrictUndefined)
+        self.macro_files = sorted((self.project_dir / "macros").glob("*.sql"))
+        self._load_macros()
+
+    def _load_macros(self):
+        """Expose project macros (e.g. calculate_churn_risk) to model templates"""
+        self.env.globals.update(self._base_context())
+        for macro_file in self.macro_files:
+            module = self.env.from_string(macro_file.read_text()).module
+            for name in dir(module):
+                if not name.startswith('_'):
+                    self.env.globals[name] = getattr(module, name)
+
+    def _base_context(self):
+        return {
+            'ref': self._ref,
+            'source': self._source,
+            'var': lambda name, default=None: default,
+            'is_incremental': lambda: False,
+            'target': SimpleNamespace(type='duckdb', schema='main', name='local'),
+            'dbt_utils': _DbtUtilsShim(),
+        }
+
+    def _record_inputs(self, paths):
+        """Attribute input files to every model currently being built"""
+        for model_name in self._building:
+            self.model_inputs.setdefault(model_name, set()).update(paths)
+
+    def _ref(self, model_name):
+        self.build_model(model_name)
+        self._record_inputs(self.model_inputs.get(model_name, ()))
+        return f'"{model_name}"'
+
+    def _source(self, source_name, table_name):
+        relation = f'"{source_name}"."{table_name}"'
+        if (source_name, table_name) in self.sources_used:
+            self._record_inputs([self.sources_used[(source_name, table_name)]])
+            return relation
+
+        location = source_location(self.data_dir, table_name)
+        if location is None:
+            raise FileNotFoundError(f"No local file for source('{source_name}', '{table_name}') in {self.data_dir}")
+        path, reader = location
+
+        self.con.execute(f'CREATE SCHEMA IF NOT EXISTS "{source_name}"')
+        self.con.execute(f'CREATE OR REPLACE VIEW {relation} AS SELECT * FROM {reader}')
+        self.sources_used[(source_name, table_name)] = path
+        self._record_inputs([path])
+        return relation
+
+    def compile_model(self, model_name):
+        """Render a model's Jinja into plain SQL, returning (sql, config)"""
+        if model_name not in self.models:
+            raise KeyError(f"Model '{model_name}' not found under {self.project_dir / 'models'}")
+
+        config = {}
+
+        def capture_config(**kwargs):
+            config.update(kwargs)
+            return ""
+
+        template = self.env.from_string(self.models[model_name].read_text())
+        sql = template.render(config=capture_config, this=f'"{model_name}"')
+        # dbt tolerates a trailing semicolon; a CREATE ... AS wrapper does not
+        sql = re.sub(r';\s*$', '', sql.strip())
+        return sql, config
+
+    def build_model(self, model_name):
+        """Create a model (and, recursively, its refs) as a view or table"""
+        if model_name in self.built:
+            return
+        if model_name in self._building:
+            raise RuntimeError(f"Circular ref detected: {' -> '.join(self._building + [model_name])}")
+
+        self._building.append(model_name)
+        try:
+            if model_name in self.models:
+                self._record_inputs([self.models[model_name], *self.macro_files])
+            sql, config = self.compile_model(model_name)
+            kind = 'TABLE' if config.get('materialized', 'view') in ('table', 'incremental') else 'VIEW'
+            # Newline before the body so trailing "-- comments" cannot swallow SQL
+            self.con.execute(f'CREATE OR REPLACE {kind} "{model_name}" AS\n{sql}\n')
+            self.built.add(model_name)
+        finally:
+            self._building.pop()
+
+    def input_files(self, model_name):
+        """Every file a built model depends on, for cache invalidation"""
+        return sorted(self.model_inputs.get(model_name, ()))
+
+    def run_model(self, model_name):
+        """Build a model and return it as an Arrow-backed DataFrame"""
+        self.build_model(model_name)
+        table = fetch_arrow(self.con.execute(f'SELECT * FROM "{model_name}"'))
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
@@ -0,0 +1,70 @@
+"""Precomputed value -> row position indexes for the dashboard's global filters."""
+
+import numpy as np
+import pandas as pd
+
+
+# Sidebar dimensions indexed for each mart (columns missing from a mart are skipped)
+FILTER_COLUMNS = ['hub', 'tier', 'customer_segment', 'country', 'ltv_segment']
+
+
+class FilterIndex:
+    """Maps every value of the filter columns to the sorted row positions holding it
+
+    Built once per data version; answering a filter combination is an
+    intersection of small position arrays followed by a single ``take``, instead
+    of copying the frame and masking it column by column on every rerun.
+    """
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.postings = {}
+        for column in columns:
+            if column in df.columns:
+                self.postings[column] = self._build_postings(df[column])
+
+    @staticmethod
+    def _build_postings(values):
+        codes, uniques = pd.factorize(values)
+        # Stable sort keeps positions ascending within each value, so results preserve row order
+        order = np.argsort(codes, kind='stable')
+        order = order[np.count_nonzero(codes < 0):]  # nulls never match a selected value
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))])
+        return {
+            value: order[offsets[k]:offsets[k + 1]]
+            for k, value in enumerate(uniques.tolist())
+        }
+
+    def positions(self, **filters):
+        """Row positions matching all active filters, or None when nothing is filtered
+
+        A filter is active when its value is not None and the column is indexed.
+        """
+        matches = []
+        for column, value in filters.items():
+            if value is None or column not in self.postings:
+                continue
+            matches.append(self.postings[column].get(value, np.empty(0, dtype=np.intp)))
+
+        if not matches:
+            return None
+        matches.sort(key=len)
+        result = matches[0]
+        for other in matches[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+    def apply(self, df, **filters):
+        """Return ``df`` itself when unfiltered, otherwise ``df.take`` of the matching rows
+
+        The unfiltered result shares data with the source frame, so callers must not
+        mutate it in place.
+        """
+        if len(df) != self.n_rows:
+            raise ValueError("FilterIndex was built for a different version of this frame")
+        rows = self.positions(**filters)
+        if rows is None:
+            return df
+        return df.take(rows)
@@ -0,0 +1,113 @@
+"""Mergeable HyperLogLog sketches for distinct counts, vectorized over many groups at once.
+
+A sketch keeps, for each of ``m = 2 ** precision`` registers, the maximum "rank" (leading
+zeros + 1) of the hashed values routed to it. Sketches of any two partitions merge exactly
+by taking the register-wise maximum, so distinct counts can be rolled up across days and
+re-aggregated to coarser grains without rescanning the values.
+
+Sketches are handled in long format, one row per group and non-empty register
+(``register``, ``rho``), so building, merging and estimating are pandas groupbys over all
+groups together. For storage, ``pack`` turns them into one bytes column per group (sparse,
+4 bytes per register used) and ``unpack`` reverses it.
+
+The relative standard error is ``1.04 / sqrt(m)``: 1.6% at the default precision of 12.
+Counts well below ``m`` use linear counting and are close to exact.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+PRECISION = 12
+
+
+def standard_error(precision=PRECISION):
+    """Relative standard error of a distinct-count estimate"""
+    return 1.04 / np.sqrt(2 ** precision)
+
+
+def hash_values(values):
+    """Deterministic 64-bit hashes, stable across processes and runs
+
+    Values must have the same type in every partition (e.g. dates as day numbers, not
+    a mix of strings and timestamps), or equal values will hash differently.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'OUS':
+        values = values.astype(object)
+    return pd.util.hash_array(values)
+
+
+def _leading_zeros(x):
+    """Leading zero bits of each uint64 (64 for zero)"""
+    x = x.copy()
+    zeros = np.zeros(len(x), dtype='int64')
+    for shift in (32, 16, 8, 4, 2, 1):
+        empty = (x >> np.uint64(64 - shift)) == 0
+        zeros += np.where(empty, shift, 0)
+        x = np.where(empty, x << np.uint64(shift), x)
+    return np.where(x == 0, zeros + 1, zeros)
+
+
+def registers(values, precision=PRECISION):
+    """Register index and rank of each value"""
+    hashed = hash_values(values)
+    register = (hashed >> np.uint64(64 - precision)).astype('int64')
+    rho = np.minimum(_leading_zeros(hashed << np.uint64(precision)) + 1, 64 - precision + 1)
+    return register, rho.astype('uint8')
+
+
+def sketch(df, group_columns, value_column, precision=PRECISION):
+    """Sketch the distinct values of ``value_column`` for each group of ``df``"""
+    values = df[value_column]
+    present = values.notna().to_numpy()  # COUNT(DISTINCT ...) ignores NULLs
+    register, rho = registers(values[present].to_numpy(), precision)
+    long = df.loc[present, group_columns].assign(register=register, rho=rho)
+    return merge(long, group_columns)
+
+
+def merge(sketches, group_columns):
+    """Register-wise maximum per group; merging the same data twice changes nothing"""
+    return sketches.groupby(list(group_columns) + ['register'], sort=False, observed=True, dropna=False)['rho'] \
+        .max().reset_index()
+
+
+def estimate(sketches, group_columns, precision=PRECISION):
+    """Estimated distinct count per group, as a Series indexed by the group columns"""
+    m = 2 ** precision
+    alpha = 0.7213 / (1 + 1.079 / m)
+    grouped = sketches.assign(inverse=np.ldexp(1.0, -sketches['rho'].astype('int64'))) \
+        .groupby(list(group_columns), sort=True, observed=True, dropna=False)
+    used = grouped['register'].count()
+    empty = m - used
+    raw = alpha * m * m / (grouped['inverse'].sum() + empty)
+    # Linear counting is more accurate while most registers are still empty
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / empty.where(empty > 0))
+    return raw.where((raw > 2.5 * m) | (empty == 0), linear).rename('estimate')
+
+
+def pack(sketches, group_columns):
+    """One row per group with its non-empty registers packed into a bytes ``sketch`` column"""
+    ordered = sketches.sort_values(list(group_columns) + ['register'], kind='stable', ignore_index=True)
+    codes = ((ordered['register'].to_numpy().astype('uint32') << np.uint32(8))
+             | ordered['rho'].to_numpy().astype('uint32')).astype('<u4')
+    grouped = ordered.groupby(list(group_columns), sort=False, observed=True, dropna=False)
+    sizes = grouped.size()
+    if sizes.empty:
+        return pd.DataFrame(columns=list(group_columns) + ['sketch'])
+    bounds = np.cumsum(sizes.to_numpy())[:-1]
+    packed = sizes.reset_index()[list(group_columns)]
+    packed['sketch'] = [chunk.tobytes() for chunk in np.split(codes, bounds)]
+    return packed
+
+
+def unpack(df, sketch_column, group_columns):
+    """Long-format registers from a packed bytes column, keeping each row's group columns"""
+    blobs = df[sketch_column].to_numpy()
+    sizes = np.fromiter((len(blob) // 4 for blob in blobs), dtype='int64', count=len(blobs))
+    codes = np.frombuffer(b''.join(blobs), dtype='<u4')
+    long = df[list(group_columns)].iloc[np.repeat(np.arange(len(df)), sizes)].reset_index(drop=True)
+    long['register'] = (codes >> 8).astype('int64')
+    long['rho'] = (codes & 0xFF).astype('uint8')
+    return long
@@ -0,0 +1,45 @@
+"""KPI and aggregate computations behind the dashboard tabs, kept free of Streamlit calls."""
+
+
+def customer_kpis(customers):
+    """Customer Analytics tab KPIs for a filtered ``dim_customers``"""
+    return {
+        'avg_health_score': customers['customer_health_score'].mean(),
+        'avg_ltv': customers['estimated_ltv'].mean(),
+        'high_risk_pct': (customers['churn_risk'] == 'HIGH').mean() * 100,
+        'total_customers': len(customers),
+        'avg_mrr': customers['current_mrr'].mean(),
+        'total_mrr': customers['current_mrr'].sum(),
+        'champion_pct': (customers['customer_segment'] == 'CHAMPION').mean() * 100,
+        'avg_tenure': customers['months_since_first_subscription'].mean(),
+    }
+
+
+def subscription_kpis(metrics):
+    """Subscription Metrics tab KPIs from the latest day of a filtered ``fact_subscription_metrics``"""
+    latest_metrics = metrics[metrics['metric_date'] == metrics['metric_date'].max()]
+    return {
+        'total_mrr': latest_metrics['total_mrr'].sum(),
+        'active_subscriptions': latest_metrics['active_subscriptions'].sum(),
+        'avg_churn_rate_pct': latest_metrics['daily_churn_rate_pct'].mean(),
+        'avg_arpu': latest_metrics['arpu'].mean(),
+    }
+
+
+def daily_subscription_trend(metrics):
+    """Daily MRR, active subscriptions and mean churn rate across the filtered groups"""
+    return metrics.groupby('metric_date').agg({
+        'total_mrr': 'sum',
+        'active_subscriptions': 'sum',
+        'daily_churn_rate_pct': 'mean'
+    }).reset_index()
+
+
+def ltv_kpis(ltv):
+    """LTV Analysis tab KPIs for a filtered ``fact_customer_ltv``"""
+    return {
+        'avg_predicted_ltv': ltv['predicted_ltv'].mean(),
+        'total_historical_revenue': ltv['total_historical_revenue'].sum(),
+        'avg_roi_pct': ltv['customer_roi_pct'].mean(),
+        'avg_payback_months': ltv['payback_period_months'].mean(),
+    }
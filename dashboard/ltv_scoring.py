@@ -0,0 +1,202 @@
+"""Vectorized LTV scoring with the ``fact_customer_ltv.sql`` formula and what-if parameters.
+
+``score_ltv`` recomputes ``predicted_ltv``, ``ltv_segment``, ``customer_roi_pct`` and
+``payback_period_months`` from the per-customer features the mart already carries.
+Parquet inputs are streamed one row group at a time. With ``--workers`` the row groups are
+split across processes that each write their own part file, so memory stays bounded by
+``workers x row group size`` whatever the customer count::
+
+    python dashboard/ltv_scoring.py --source fact_customer_ltv.parquet --out data/ltv_rescored \\
+        --workers 8 --usage-divisor 800 --hub-bonus 0.15 --usage-weight unique_features_used=8
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import argparse
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for streaming Parquet files; in-memory frames score without it
+    pa = None
+
+
+# Constants of fact_customer_ltv.sql; override any of them for what-if scoring
+DEFAULT_PARAMETERS = {
+    # Weights of the usage_value_score components (used when the raw components are present)
+    'usage_weights': {
+        'total_usage_days': 0.3,
+        'avg_session_duration': 0.1,
+        'unique_features_used': 5,
+        'total_pages_viewed': 0.01,
+        'total_api_calls': 0.005,
+    },
+    'usage_divisor': 1000,  # LTV multiplier is 1 + usage_value_score / usage_divisor
+    'satisfaction_scale': 5,  # LTV multiplier is avg_satisfaction / satisfaction_scale
+    'hub_bonus': 0.1,  # LTV multiplier is 1 + total_hubs_subscribed * hub_bonus
+    'min_duration_months': 1,  # GREATEST(1, avg_subscription_duration)
+    'segment_bins': [500, 2000, 5000, 10000],
+}
+LTV_SEGMENT_LABELS = np.array(['VERY_LOW', 'LOW', 'MEDIUM', 'HIGH', 'VERY_HIGH'])
+
+FEATURE_COLUMNS = [
+    'active_subscriptions', 'current_mrr', 'avg_subscription_duration', 'usage_value_score',
+    'avg_satisfaction', 'total_hubs_subscribed', 'net_historical_value', 'estimated_support_cost',
+]
+SCORE_COLUMNS = ['predicted_ltv', 'ltv_segment', 'customer_roi_pct', 'payback_period_months']
+CHUNK_ROWS = 1_000_000
+
+
+def resolve_parameters(**overrides):
+    """Default SQL constants with what-if overrides applied (usage weights merge per component)"""
+    parameters = {**DEFAULT_PARAMETERS, **{k: v for k, v in overrides.items() if v is not None}}
+    parameters['usage_weights'] = {**DEFAULT_PARAMETERS['usage_weights'], **(overrides.get('usage_weights') or {})}
+    return parameters
+
+
+def _column(df, name, default=np.nan):
+    if name not in df.columns:
+        return np.full(len(df), default, dtype='float64')
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def usage_value_score(df, parameters=DEFAULT_PARAMETERS):
+    """Usage score from its components when all are present, else the mart's stored score"""
+    weights = parameters['usage_weights']
+    if not all(name in df.columns for name in weights):
+        if weights != DEFAULT_PARAMETERS['usage_weights']:
+            missing = sorted(name for name in weights if name not in df.columns)
+            raise ValueError(f"Custom usage weights need the usage component columns: missing {missing}")
+        return np.nan_to_num(_column(df, 'usage_value_score', 0.0))
+    score = sum(weight * np.nan_to_num(_column(df, name)) for name, weight in weights.items())
+    # Customers without usage events have a NULL score in the SQL, coalesced to 0
+    return np.where(_column(df, 'total_usage_days', 0.0) > 0, score, 0.0)
+
+
+def score_ltv(df, parameters=DEFAULT_PARAMETERS):
+    """Score one chunk of customer features; returns the four score columns as a DataFrame"""
+    active = _column(df, 'active_subscriptions', 0.0)
+    current_mrr = _column(df, 'current_mrr', 0.0)
+    duration = _column(df, 'avg_subscription_duration')
+    satisfaction = _column(df, 'avg_satisfaction', 5.0)
+    hubs = _column(df, 'total_hubs_subscribed', 0.0)
+    net_value = _column(df, 'net_historical_value')
+    support_cost = _column(df, 'estimated_support_cost', 0.0)
+    usage = usage_value_score(df, parameters)
+
+    # GREATEST(1, NULL) is 1 in DuckDB, so a missing duration falls back to the floor
+    projected = (current_mrr
+                 * np.fmax(parameters['min_duration_months'], duration)
+                 * (1 + usage / parameters['usage_divisor'])
+                 * (np.where(np.isnan(satisfaction), 5.0, satisfaction) / parameters['satisfaction_scale'])
+                 * (1 + hubs * parameters['hub_bonus']))
+    predicted_ltv = np.where(active > 0, projected, net_value)
+
+    # CASE WHEN predicted_ltv >= ... ELSE 'VERY_LOW': NULL falls through to VERY_LOW
+    segment_index = np.searchsorted(np.asarray(parameters['segment_bins'], dtype='float64'), predicted_ltv, side='right')
+    segment_index[np.isnan(predicted_ltv)] = 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = np.where(support_cost > 0, net_value / support_cost * 100, np.nan)
+        payback = np.where(current_mrr > 0, support_cost / current_mrr, np.nan)
+
+    return pd.DataFrame({
+        'predicted_ltv': predicted_ltv,
+        'ltv_segment': LTV_SEGMENT_LABELS[segment_index],
+        'customer_roi_pct': roi,
+        'payback_period_months': payback,
+    }, index=df.index)
+
+
+def iter_scored_chunks(df, parameters=DEFAULT_PARAMETERS, chunk_rows=CHUNK_ROWS, keep_columns=('customer_id',)):
+    """Score an in-memory frame in ``chunk_rows`` slices, yielding key columns plus scores"""
+    keep = [column for column in keep_columns if column in df.columns]
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield pd.concat([chunk[keep], score_ltv(chunk, parameters)], axis=1)
+
+
+# --- Streaming Parquet ---
+def _input_columns(schema_names, keep_columns):
+    wanted = list(keep_columns) + FEATURE_COLUMNS + list(DEFAULT_PARAMETERS['usage_weights'])
+    return [name for name in dict.fromkeys(wanted) if name in schema_names]
+
+
+def _score_row_groups(source, row_groups, out_path, parameters, keep_columns):
+    """Worker: score some row groups of ``source`` into one Parquet part; returns the row count"""
+    parquet_file = pq.ParquetFile(source)
+    columns = _input_columns(parquet_file.schema_arrow.names, keep_columns)
+    keep = [column for column in keep_columns if column in columns]
+    writer = None
+    rows = 0
+    try:
+        for row_group in row_groups:
+            chunk = parquet_file.read_row_group(row_group, columns=columns).to_pandas()
+            scored = pa.Table.from_pandas(pd.concat([chunk[keep], score_ltv(chunk, parameters)], axis=1),
+                                          preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out_path, scored.schema)
+            writer.write_table(scored)
+            rows += scored.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def score_parquet(source, out_dir, parameters=DEFAULT_PARAMETERS, workers=1, row_groups_per_part=4,
+                  keep_columns=('customer_id',)):
+    """Score a Parquet file into ``out_dir/part-*.parquet``; returns the number of rows scored
+
+    Each part covers ``row_groups_per_part`` row groups, so a worker holds at most one row
+    group's features and scores at a time.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to stream Parquet files")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    n_row_groups = pq.ParquetFile(source).num_row_groups
+    parts = [list(range(start, min(start + row_groups_per_part, n_row_groups)))
+             for start in range(0, n_row_groups, row_groups_per_part)]
+    jobs = [(str(source), row_groups, str(out_dir / f"part-{i:05d}.parquet"), parameters, tuple(keep_columns))
+            for i, row_groups in enumerate(parts)]
+
+    if workers <= 1:
+        return sum(_score_row_groups(*job) for job in jobs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return sum(executor.map(_score_row_groups, *zip(*jobs)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rescore customer LTV with the fact_customer_ltv formula")
+    parser.add_argument("--source", type=Path, required=True, help="fact_customer_ltv-shaped Parquet file to rescore")
+    parser.add_argument("--out", type=Path, default=Path("data/ltv_rescored"), help="Output directory of Parquet parts")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--usage-divisor", type=float)
+    parser.add_argument("--satisfaction-scale", type=float)
+    parser.add_argument("--hub-bonus", type=float)
+    parser.add_argument("--usage-weight", action="append", default=[], metavar="COMPONENT=WEIGHT",
+                        help=f"usage_value_score weight override, repeatable; components: "
+                             f"{', '.join(DEFAULT_PARAMETERS['usage_weights'])}")
+    args = parser.parse_args()
+
+    usage_weights = {}
+    for override in args.usage_weight:
+        component, _, weight = override.partition('=')
+        if component not in DEFAULT_PARAMETERS['usage_weights'] or not weight:
+            parser.error(f"--usage-weight expects COMPONENT=WEIGHT with a usage_value_score component, got {override!r}")
+        usage_weights[component] = float(weight)
+
+    parameters = resolve_parameters(usage_divisor=args.usage_divisor,
+                                    satisfaction_scale=args.satisfaction_scale,
+                                    hub_bonus=args.hub_bonus,
+                                    usage_weights=usage_weights)
+    rows = score_parquet(args.source, args.out, parameters, workers=args.workers)
+    print(f"Scored {rows:,} customers into {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Persistent on-disk Arrow IPC cache for loaded data marts."""
+
+from pathlib import Path
+import hashlib
+import json
+
+import pandas as pd
+
+from duckdb_engine import write_atomic
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # Caching is optional; marts are loaded from source every time without it
+    pa = None
+
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def _expand(paths):
+    """Resolve source paths to files, expanding partition directories"""
+    files = []
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.is_file()))
+        else:
+            files.append(path)
+    return files
+
+
+def file_sha256(path):
+    """Content hash of a file, read in blocks so large sources stay out of memory"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MartCache:
+    """Arrow IPC files per mart, invalidated by the mtime and content hash of their sources
+
+    Each mart is stored as ``<cache_dir>/<mart>.arrow`` (uncompressed, so it can be
+    memory-mapped) next to a ``<mart>.json`` manifest listing the source files it was
+    built from with their size, mtime and sha256. Stats are compared first; the hash is
+    only recomputed when they differ, so touching a file without changing it does not
+    trigger a rebuild.
+    """
+
+    def __init__(self, cache_dir=Path(".mart_cache")):
+        if pa is None:
+            raise ImportError("pyarrow is required for the on-disk mart cache")
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _data_file(self, mart_name):
+        return self.cache_dir / f"{mart_name}.arrow"
+
+    def _manifest_file(self, mart_name):
+        return self.cache_dir / f"{mart_name}.json"
+
+    def _read_manifest(self, mart_name):
+        try:
+            return json.loads(self._manifest_file(mart_name).read_text())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _stat_entry(path):
+        stat = Path(path).stat()
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def _validate_sources(self, manifest):
+        """Return (valid, refreshed), updating stats in place for touched-but-identical files"""
+        refreshed = False
+        for path, recorded in manifest['sources'].items():
+            try:
+                current = self._stat_entry(path)
+            except OSError:
+                return False, False
+            if current['size'] == recorded['size'] and current['mtime_ns'] == recorded['mtime_ns']:
+                continue
+            if current['size'] != recorded['size'] or file_sha256(path) != recorded['sha256']:
+                return False, False
+            recorded.update(current)
+            refreshed = True
+        return True, refreshed
+
+    def get(self, mart_name, origin):
+        """Return the cached mart built from ``origin``, or None if missing or stale"""
+        manifest = self._read_manifest(mart_name)
+        data_file = self._data_file(mart_name)
+        if manifest is None or manifest.get('origin') != str(origin) or not data_file.exists():
+            return None
+
+        # Partition directories can gain or lose files without any recorded file changing
+        if {str(path) for path in _expand(manifest.get('inputs', []))} != set(manifest['sources']):
+            return None
+
+        valid, refreshed = self._validate_sources(manifest)
+        if not valid:
+            return None
+        if refreshed:
+            write_atomic(self._manifest_file(mart_name),
+                         lambda tmp: tmp.write_text(json.dumps(manifest, indent=2)))
+        return self.read(mart_name)
+
+    def read(self, mart_name):
+        """Memory-map the cached Arrow file and expose it as an Arrow-backed DataFrame"""
+        source = pa.memory_map(str(self._data_file(mart_name)), 'r')
+        table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    def put(self, mart_name, origin, source_paths, df):
+        """Persist a mart with the fingerprint of every file it was derived from"""
+        # Drop the manifest first so a crash mid-write can never pair new data with old fingerprints
+        self._manifest_file(mart_name).unlink(missing_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        def write_table(tmp_path):
+            with pa.OSFile(str(tmp_path), 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+        write_atomic(self._data_file(mart_name), write_table)
+
+        sources = {}
+        for path in _expand(source_paths):
+            sources[str(path)] = {**self._stat_entry(path), 'sha256': file_sha256(path)}
+        manifest = {
+            'origin': str(origin),
+            'inputs': [str(path) for path in source_paths],
+            'sources': sources,
+        }
+        write_atomic(self._manifest_file(mart_name),
+                     lambda tmp: tmp.write_text(json.dumps(manifest, indent=2)))
+
+    def data_version(self, mart_names):
+        """Cheap stat-based token that changes whenever a cached mart's sources are touched
+
+        Inputs are re-expanded like ``get()`` does, so a partition added to or removed from
+        a source directory changes the token too.
+        """
+        digest = hashlib.sha256()
+        for mart_name in sorted(mart_names):
+            manifest = self._read_manifest(mart_name) or {'sources': {}}
+            digest.update(mart_name.encode())
+            paths = {str(path) for path in _expand(manifest.get('inputs', []))} | set(manifest['sources'])
+            for path in sorted(paths):
+                try:
+                    stat = self._stat_entry(path)
+                except OSError:
+                    stat = {'size': -1, 'mtime_ns': -1}
+                digest.update(f"{path}:{stat['size']}:{stat['mtime_ns']}".encode())
+        return digest.hexdigest()[:16]
@@ -0,0 +1,124 @@
+"""Declared column types for each data mart and a per-mart memory footprint report."""
+
+import numpy as np
+import pandas as pd
+
+
+# Per mart: low-cardinality dimensions stored as categoricals, bounded scores/percentages
+# stored as float32, counts downcast to the narrowest integer type, and dates parsed once.
+# Money columns keep float64 so large SUMs do not lose precision.
+MART_SCHEMAS = {
+    'dim_customers': {
+        'category': ['hub', 'tier', 'industry', 'company_size', 'country', 'state',
+                     'customer_segment', 'churn_risk'],
+        'float32': ['customer_health_score', 'avg_session_duration', 'avg_satisfaction_score'],
+        'integer': ['months_since_first_subscription', 'total_subscriptions', 'active_subscriptions',
+                    'unique_hubs_subscribed', 'days_since_last_activity', 'total_active_days',
+                    'unique_features_used', 'total_support_tickets'],
+        'datetime': ['signup_date'],
+    },
+    'dim_products': {
+        'category': ['hub', 'tier', 'hub_display_name', 'tier_display_name', 'product_category'],
+        'float32': ['retention_rate'],
+        'integer': ['tier_rank', 'total_subscribers', 'active_subscribers'],
+        'datetime': [],
+    },
+    'fact_subscription_metrics': {
+        'category': ['hub', 'tier', 'industry', 'company_size', 'country'],
+        'float32': ['daily_churn_rate_pct', 'mrr_growth_30d_pct', 'subscription_growth_7d_pct',
+                    'revenue_retention_30d_pct'],
+        'integer': ['active_subscriptions', 'new_subscriptions', 'churned_subscriptions', 'active_customers'],
+        'datetime': ['metric_date'],
+    },
+    'fact_customer_ltv': {
+        'category': ['industry', 'company_size', 'country', 'ltv_segment'],
+        'float32': ['customer_roi_pct', 'payback_period_months', 'avg_satisfaction', 'usage_value_score'],
+        'integer': ['total_hubs_subscribed', 'total_subscriptions', 'active_subscriptions',
+                    'customer_age_months', 'total_usage_days', 'unique_features_used',
+                    'total_support_interactions'],
+        'datetime': ['first_subscription_date', 'latest_subscription_date'],
+    },
+    'fact_pricing_optimization': {
+        'category': ['hub', 'tier', 'strategic_recommendation'],
+        'float32': ['revenue_change_pct', 'customer_change_pct', 'optimal_revenue_uplift_pct'],
+        'integer': ['potential_customers', 'revenue_rank'],
+        'datetime': [],
+    },
+    'mart_executive_daily': {
+        'category': ['top_hub_by_revenue'],
+        'float32': [],
+        'integer': ['churn_rate_count', 'champion_customers', 'total_high_risk_customers',
+                    'immediate_pricing_opportunities'],
+        'datetime': ['metric_date'],
+    },
+    'mart_executive_summary': {
+        'category': [],
+        'float32': [],
+        'integer': [],
+        'datetime': [],
+    },
+}
+
+INTEGER_CANDIDATES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _to_float32(series):
+    return pd.Series(series.to_numpy(dtype='float32', na_value=np.nan), index=series.index, name=series.name)
+
+
+def _downcast_integer(series):
+    """Narrowest signed integer type holding the column (nullable when it has gaps)"""
+    values = pd.to_numeric(series, errors='coerce')
+    if values.isna().all():
+        return series
+    low, high = values.min(), values.max()
+    if values.isna().any():
+        for dtype in INTEGER_CANDIDATES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return values.astype(f"Int{info.bits}")
+    for dtype in INTEGER_CANDIDATES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return series
+
+
+def apply_schema(mart_name, df):
+    """Return ``df`` with the mart's declared types applied; undeclared columns are untouched"""
+    schema = MART_SCHEMAS.get(mart_name)
+    if schema is None or df.empty:
+        return df
+
+    converted = {}
+    for column in schema['category']:
+        if column in df.columns:
+            converted[column] = df[column].astype('category')
+    for column in schema['float32']:
+        if column in df.columns:
+            converted[column] = _to_float32(pd.to_numeric(df[column], errors='coerce'))
+    for column in schema['integer']:
+        if column in df.columns:
+            converted[column] = _downcast_integer(df[column])
+    for column in schema['datetime']:
+        if column in df.columns:
+            converted[column] = pd.to_datetime(df[column], errors='coerce')
+
+    return df.assign(**converted) if converted else df
+
+
+def memory_report(marts):
+    """Rows, columns and deep in-memory size of each mart, largest first"""
+    rows = []
+    for mart_name, df in marts.items():
+        usage = df.memory_usage(deep=True, index=True)
+        rows.append({
+            'mart': mart_name,
+            'rows': len(df),
+            'columns': len(df.columns),
+            'memory_mb': usage.sum() / 1024 ** 2,
+            'largest_column': usage.drop('Index').idxmax() if len(df.columns) else None,
+            'bytes_per_row': usage.sum() / len(df) if len(df) else 0.0,
+        })
+    report = pd.DataFrame(rows, columns=['mart', 'rows', 'columns', 'memory_mb', 'largest_column', 'bytes_per_row'])
+    return report.sort_values('memory_mb', ascending=False, ignore_index=True)
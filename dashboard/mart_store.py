@@ -0,0 +1,114 @@
+"""Process-wide, read-only store of data marts backed by memory-mapped Arrow files.
+
+``st.cache_data`` pickles a cached mart and unpickles a fresh deep copy for every caller,
+so each concurrent session held its own copy of every mart and a replica's RSS grew with
+its users. ``MartStore`` loads each mart once per data version, writes it (declared schema
+already applied) to an uncompressed Arrow IPC file and memory-maps it. Callers get a
+shallow DataFrame over the mapped buffers: numeric and datetime columns are read-only
+NumPy views, categoricals keep their codes in the file, and Arrow-backed strings (the
+pandas 3 default) are not copied at all. Sessions share those pages, so memory stays flat
+in the number of sessions. The views rely on pandas copy-on-write (always on from
+pandas 3), so filters, new columns and in-place writes such as ``.loc[...] =`` or
+``fillna(inplace=True)`` copy what they change and never touch the shared buffers. The
+option is process-wide, so the app calls ``enable_copy_on_write`` once at startup.
+
+Files are unlinked as soon as they are mapped (the pages live until the last view is
+dropped), so nothing is left behind when the process exits.
+"""
+
+from itertools import count
+from pathlib import Path
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:  # The store needs pyarrow; the dashboard falls back to per-session caching without it
+    pa = None
+
+
+STATS_COLUMNS = ['mart', 'rows', 'mapped_mb', 'loads', 'hits']
+
+
+def enable_copy_on_write():
+    """Turn on pandas copy-on-write, which sessions' shallow views rely on (pandas < 3 only)"""
+    if int(pd.__version__.split('.')[0]) < 3:
+        pd.set_option('mode.copy_on_write', True)
+
+
+class MartStore:
+    """Marts shared by every session of the process, one memory-mapped copy per data version
+
+    ``loader(mart_name)`` returns the mart as a DataFrame; it runs at most once per mart
+    and data version, even when many sessions ask for the mart at the same time. On
+    pandas < 3, call ``enable_copy_on_write()`` before handing views to sessions.
+    """
+
+    def __init__(self, loader, store_dir=None):
+        if pa is None:
+            raise ImportError("pyarrow is required for the shared mart store")
+        self.loader = loader
+        if store_dir is None:
+            store_dir = tempfile.mkdtemp(prefix="mart_store_")
+            atexit.register(shutil.rmtree, store_dir, ignore_errors=True)
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self._entries = {}  # mart_name -> {'data_version', 'frame', 'mapped_bytes'}
+        self._counters = {}  # mart_name -> {'loads', 'hits'}
+        self._lock = threading.Lock()
+        self._mart_locks = {}
+        self._file_ids = count()
+
+    def _mart_lock(self, mart_name):
+        with self._lock:
+            return self._mart_locks.setdefault(mart_name, threading.Lock())
+
+    def _map(self, mart_name, df):
+        """Write ``df`` to an Arrow file and return (DataFrame over its mapping, file size)"""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        path = self.store_dir / f"{mart_name}.{os.getpid()}.{next(self._file_ids)}.arrow"
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        mapped_bytes = path.stat().st_size
+        source = pa.memory_map(str(path), 'r')
+        # split_blocks keeps one block per column, so NumPy columns stay views of the mapping
+        frame = pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+        try:
+            path.unlink()
+        except OSError:  # Windows cannot unlink a mapped file; it stays in store_dir
+            pass
+        return frame, mapped_bytes
+
+    def get(self, mart_name, data_version):
+        """A new shallow DataFrame over the shared copy of ``mart_name`` for ``data_version``"""
+        entry = self._entries.get(mart_name)
+        counters = self._counters.setdefault(mart_name, {'loads': 0, 'hits': 0})
+        if entry is None or entry['data_version'] != data_version:
+            with self._mart_lock(mart_name):
+                # Another session may have mapped it while this one waited for the lock
+                entry = self._entries.get(mart_name)
+                if entry is None or entry['data_version'] != data_version:
+                    frame, mapped_bytes = self._map(mart_name, self.loader(mart_name))
+                    entry = {'data_version': data_version, 'frame': frame, 'mapped_bytes': mapped_bytes}
+                    self._entries[mart_name] = entry
+                    counters['loads'] += 1
+        counters['hits'] += 1
+        return entry['frame'].copy(deep=False)
+
+    def stats(self):
+        """Rows, mapped size and load/hit counts of every mart in the store"""
+        rows = [{
+            'mart': mart_name,
+            'rows': len(entry['frame']),
+            'mapped_mb': entry['mapped_bytes'] / 1024 ** 2,
+            'loads': self._counters[mart_name]['loads'],
+            'hits': self._counters[mart_name]['hits'],
+        } for mart_name, entry in sorted(self._entries.items())]
+        return pd.DataFrame(rows, columns=STATS_COLUMNS)
@@ -0,0 +1,190 @@
+"""Per-model dbt timing history with rolling-baseline regression flags.
+
+After the dbt tasks of a DAG run finish, ``record`` reads every ``run_results.json``
+they wrote and appends one row per model to a DuckDB history table::
+
+    python dashboard/pipeline_perf.py record --project-dir dbt_models --run-id manual__2024-01-01
+
+A model is flagged as a regression when its execution time exceeds the median of its
+previous successful runs by ``REGRESSION_RATIO`` (and by at least
+``MIN_REGRESSION_SECONDS``, so sub-second models do not flap). The dashboard reads the
+same table for its pipeline performance view.
+"""
+
+from pathlib import Path
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:  # The history is optional; the dashboard shows a notice without it
+    duckdb = None
+
+
+PERF_DB = Path("data/pipeline_perf.duckdb")
+BASELINE_RUNS = 14  # Previous successful runs in the rolling baseline
+MIN_BASELINE_RUNS = 3  # Fewer runs than this give no baseline and never flag
+REGRESSION_RATIO = 1.5
+MIN_REGRESSION_SECONDS = 5.0
+
+HISTORY_COLUMNS = [
+    'invocation_id', 'run_id', 'generated_at', 'unique_id', 'model', 'status',
+    'execution_time', 'rows_affected', 'bytes_processed', 'baseline_seconds', 'is_regression',
+]
+
+CREATE_HISTORY = """
+CREATE TABLE IF NOT EXISTS model_runs (
+    invocation_id VARCHAR,
+    run_id VARCHAR,
+    generated_at TIMESTAMP,
+    unique_id VARCHAR,
+    model VARCHAR,
+    status VARCHAR,
+    execution_time DOUBLE,
+    rows_affected BIGINT,
+    bytes_processed BIGINT,
+    baseline_seconds DOUBLE,
+    is_regression BOOLEAN,
+    PRIMARY KEY (invocation_id, unique_id)
+)
+"""
+
+
+def parse_run_results(path):
+    """One record per model node in a dbt ``run_results.json``"""
+    results = json.loads(Path(path).read_text())
+    metadata = results.get('metadata', {})
+    records = []
+    for result in results.get('results', []):
+        unique_id = result['unique_id']
+        if not unique_id.startswith('model.'):
+            continue
+        # Adapters report different fields: rows_affected is common, bytes only on some warehouses
+        adapter_response = result.get('adapter_response') or {}
+        records.append({
+            'invocation_id': metadata.get('invocation_id'),
+            'generated_at': metadata.get('generated_at'),
+            'unique_id': unique_id,
+            'model': unique_id.split('.')[-1],
+            'status': result.get('status'),
+            'execution_time': result.get('execution_time'),
+            'rows_affected': adapter_response.get('rows_affected'),
+            'bytes_processed': adapter_response.get('bytes_processed', adapter_response.get('bytes_scanned')),
+        })
+    return records
+
+
+def connect(db_path=PERF_DB, read_only=False):
+    if duckdb is None:
+        raise ImportError("duckdb is required for the pipeline performance history")
+    if read_only:
+        return duckdb.connect(str(db_path), read_only=True)
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect(str(db_path))
+    con.execute(CREATE_HISTORY)
+    return con
+
+
+def baseline_seconds(con, unique_id, before, runs=BASELINE_RUNS):
+    """Median execution time of a model's last successful runs before ``before``, or None"""
+    times = con.execute(
+        """
+        SELECT execution_time FROM model_runs
+        WHERE unique_id = ? AND status = 'success' AND generated_at < CAST(? AS TIMESTAMP)
+        ORDER BY generated_at DESC LIMIT ?
+        """,
+        [unique_id, before, runs],
+    ).fetchall()
+    if len(times) < MIN_BASELINE_RUNS:
+        return None
+    return float(pd.Series([t[0] for t in times]).median())
+
+
+def is_regression(execution_time, baseline):
+    if baseline is None or execution_time is None:
+        return False
+    return (execution_time > baseline * REGRESSION_RATIO
+            and execution_time - baseline >= MIN_REGRESSION_SECONDS)
+
+
+def record(run_results_paths, run_id=None, db_path=PERF_DB):
+    """Append the models of each ``run_results.json`` not already recorded; returns the new rows
+
+    Paths can include results from earlier invocations (e.g. a skipped model's stale
+    target directory); rows are keyed by dbt invocation so those are ignored.
+    """
+    con = connect(db_path)
+    try:
+        records = [r for path in run_results_paths for r in parse_run_results(path)]
+        recorded = []
+        for r in sorted(records, key=lambda r: r['generated_at'] or ''):
+            exists = con.execute(
+                "SELECT 1 FROM model_runs WHERE invocation_id = ? AND unique_id = ?",
+                [r['invocation_id'], r['unique_id']],
+            ).fetchone()
+            if exists:
+                continue
+            baseline = baseline_seconds(con, r['unique_id'], r['generated_at'])
+            row = {**r, 'run_id': run_id, 'baseline_seconds': baseline,
+                   'is_regression': r['status'] == 'success' and is_regression(r['execution_time'], baseline)}
+            con.execute(
+                f"INSERT INTO model_runs ({', '.join(HISTORY_COLUMNS)}) VALUES ({', '.join('?' for _ in HISTORY_COLUMNS)})",
+                [row[column] for column in HISTORY_COLUMNS],
+            )
+            recorded.append(row)
+        return pd.DataFrame(recorded, columns=HISTORY_COLUMNS)
+    finally:
+        con.close()
+
+
+def load_history(db_path=PERF_DB):
+    """The full history table, or an empty frame if nothing has been recorded"""
+    if duckdb is None or not Path(db_path).exists():
+        return pd.DataFrame(columns=HISTORY_COLUMNS)
+    con = connect(db_path, read_only=True)
+    try:
+        return con.execute("SELECT * FROM model_runs ORDER BY generated_at").df()
+    finally:
+        con.close()
+
+
+def latest_run_summary(history):
+    """Each model's most recent run next to its baseline, slowest first"""
+    if history.empty:
+        return history
+    latest = history.sort_values('generated_at').groupby('unique_id').tail(1)
+    latest = latest.assign(vs_baseline=latest['execution_time'] / latest['baseline_seconds'])
+    return latest[['model', 'status', 'execution_time', 'baseline_seconds', 'vs_baseline',
+                   'rows_affected', 'bytes_processed', 'is_regression', 'generated_at']].sort_values(
+        'execution_time', ascending=False, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record dbt model timings and flag regressions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="Append run_results.json files to the history")
+    record_parser.add_argument("--project-dir", type=Path, default=Path("dbt_models"),
+                               help="dbt project whose target/**/run_results.json are read")
+    record_parser.add_argument("--run-id", default=None, help="Orchestrator run id stored with each row")
+    record_parser.add_argument("--db", type=Path, default=PERF_DB, help="DuckDB history file")
+    record_parser.add_argument("--fail-on-regression", action="store_true",
+                               help="Exit non-zero when any model is flagged")
+    args = parser.parse_args()
+
+    paths = sorted((args.project_dir / "target").rglob("run_results.json"))
+    recorded = record(paths, run_id=args.run_id, db_path=args.db)
+    print(f"Recorded {len(recorded)} model runs from {len(paths)} run_results.json files to {args.db}")
+
+    regressions = recorded[recorded['is_regression'].astype(bool)]
+    for r in regressions.itertuples():
+        print(f"REGRESSION {r.model}: {r.execution_time:.1f}s vs baseline {r.baseline_seconds:.1f}s "
+              f"({r.execution_time / r.baseline_seconds:.1f}x)")
+    if args.fail_on_regression and len(regressions):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
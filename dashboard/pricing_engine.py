@@ -0,0 +1,172 @@
+"""Vectorized demand-curve fitting and revenue-optimal pricing for every hub/tier at once.
+
+Observations in ``data/pricing_elasticity.csv`` (price vs relative adoption) are fitted
+per product with closed-form least squares on ``ln(adoption)``, computed for all products
+together from ``np.bincount`` sums. A dense price grid is then evaluated for every
+product in one broadcast pass to find the revenue-maximizing price::
+
+    python dashboard/pricing_engine.py --grid-points 400
+"""
+
+from pathlib import Path
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+ELASTICITY_PATH = Path("data/pricing_elasticity.csv")
+PRICING_PLANS_PATH = Path("data/pricing_plans.csv")
+PRODUCT_COLUMNS = ['hub', 'tier']
+
+# ln(adoption) is linear in x(price): price for log-linear demand, ln(price) for log-log
+DEMAND_MODELS = {
+    'loglinear': lambda price: price,  # Exponential demand; revenue has an interior optimum at -1/b
+    'loglog': np.log,  # Constant elasticity; the optimum lies on a grid bound unless elasticity is -1
+}
+GRID_POINTS = 200
+GRID_EXTRAPOLATION = 0.1  # The grid spans the observed (and current) prices widened by this share
+CHUNK_SIZE = 50_000  # Products per grid pass, bounding the grid to CHUNK_SIZE x GRID_POINTS floats
+
+
+def data_version(paths=(ELASTICITY_PATH, PRICING_PLANS_PATH)):
+    """Stat-based token of the pricing inputs, for caching fits per data version"""
+    parts = []
+    for path in paths:
+        path = Path(path)
+        stat = path.stat() if path.exists() else None
+        parts.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}" if stat else f"{path}:missing")
+    return "|".join(parts)
+
+
+def load_observations(path=ELASTICITY_PATH):
+    """Price/adoption observations with positive values only (both are log-transformed)"""
+    df = pd.read_csv(path)
+    return df[(df['price'] > 0) & (df['adoption_rate'] > 0)].reset_index(drop=True)
+
+
+def load_current_prices(path=PRICING_PLANS_PATH):
+    """List price per product, or None if the pricing plans are not available"""
+    if not Path(path).exists():
+        return None
+    plans = pd.read_csv(path)
+    return plans.groupby(PRODUCT_COLUMNS, as_index=False)['price_usd'].mean().rename(
+        columns={'price_usd': 'current_price'})
+
+
+def fit_demand_curves(observations, model='loglinear'):
+    """Least-squares ``ln(adoption) = intercept + slope * x(price)`` for every product at once
+
+    Returns one row per product with the coefficients, R² and observation count.
+    Products with fewer than two distinct prices get NaN coefficients.
+    """
+    transform = DEMAND_MODELS[model]
+    grouped = observations.groupby(PRODUCT_COLUMNS, sort=True)
+    codes = grouped.ngroup().to_numpy()
+    x = transform(observations['price'].to_numpy(dtype='float64'))
+    y = np.log(observations['adoption_rate'].to_numpy(dtype='float64'))
+    n_products = grouped.ngroups
+
+    def group_sum(values):
+        return np.bincount(codes, weights=values, minlength=n_products)
+
+    n = np.bincount(codes, minlength=n_products).astype('float64')
+    sx, sy, sxx, sxy, syy = group_sum(x), group_sum(y), group_sum(x * x), group_sum(x * y), group_sum(y * y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var_x = n * sxx - sx ** 2
+        var_y = n * syy - sy ** 2
+        cov_xy = n * sxy - sx * sy
+        slope = np.where(var_x > 0, cov_xy / var_x, np.nan)
+        intercept = (sy - slope * sx) / n
+        r_squared = np.where(var_y > 0, cov_xy ** 2 / (var_x * var_y), 1.0)
+
+    fits = grouped['price'].agg(min_observed_price='min', max_observed_price='max').reset_index()
+    fits['model'] = model
+    fits['intercept'] = intercept
+    fits['slope'] = slope
+    fits['r_squared'] = r_squared
+    fits['n_obs'] = n.astype('int64')
+    return fits
+
+
+def _predict_adoption(model, intercept, slope, prices):
+    return np.exp(intercept + slope * DEMAND_MODELS[model](prices))
+
+
+def optimize_prices(fits, current_prices=None, grid_points=GRID_POINTS, extrapolation=GRID_EXTRAPOLATION,
+                    chunk_size=CHUNK_SIZE):
+    """Revenue-optimal price per product from a dense grid over its observed price range
+
+    The grid stays close to the observed prices because each curve is only a local fit;
+    ``at_grid_bound`` marks optima on its edge, where revenue would keep rising beyond
+    the data. Revenue is indexed as ``price * adoption``. Without a list price, the
+    midpoint of the observed prices stands in for the current one.
+    """
+    result = fits.copy()
+    if current_prices is not None:
+        result = result.merge(current_prices, on=PRODUCT_COLUMNS, how='left')
+    else:
+        result['current_price'] = np.nan
+    fallback = (result['min_observed_price'] + result['max_observed_price']) / 2
+    result['current_price'] = result['current_price'].fillna(fallback)
+
+    model = result['model'].iloc[0] if len(result) else 'loglinear'
+    intercept = result['intercept'].to_numpy()
+    slope = result['slope'].to_numpy()
+    current = result['current_price'].to_numpy(dtype='float64')
+    low = np.fmin(result['min_observed_price'].to_numpy(dtype='float64'), current) * (1 - extrapolation)
+    high = np.fmax(result['max_observed_price'].to_numpy(dtype='float64'), current) * (1 + extrapolation)
+    steps = np.linspace(0.0, 1.0, grid_points)
+
+    optimal_price = np.empty(len(result))
+    optimal_revenue = np.empty(len(result))
+    optimal_index = np.empty(len(result), dtype=np.int64)
+    for start in range(0, len(result), chunk_size):
+        rows = slice(start, start + chunk_size)
+        grid = low[rows, None] + (high[rows] - low[rows])[:, None] * steps[None, :]
+        revenue = grid * _predict_adoption(model, intercept[rows, None], slope[rows, None], grid)
+        best = np.nanargmax(np.where(np.isfinite(revenue), revenue, -np.inf), axis=1)
+        optimal_index[rows] = best
+        optimal_price[rows] = grid[np.arange(len(best)), best]
+        optimal_revenue[rows] = revenue[np.arange(len(best)), best]
+
+    current_revenue = current * _predict_adoption(model, intercept, slope, current)
+    # d ln(adoption) / d ln(price): slope * price for log-linear demand, the slope itself for log-log
+    result['elasticity_at_current'] = slope * current if model == 'loglinear' else slope
+    result['optimal_price'] = optimal_price
+    result['price_change_pct'] = (optimal_price / current - 1) * 100
+    result['current_revenue_index'] = current_revenue
+    result['optimal_revenue_index'] = optimal_revenue
+    result['revenue_uplift_pct'] = (optimal_revenue / current_revenue - 1) * 100
+    result['at_grid_bound'] = (optimal_index == 0) | (optimal_index == grid_points - 1)
+    valid = np.isfinite(slope)
+    result.loc[~valid, ['optimal_price', 'price_change_pct', 'optimal_revenue_index', 'revenue_uplift_pct']] = np.nan
+    return result
+
+
+def price_optimization(elasticity_path=ELASTICITY_PATH, plans_path=PRICING_PLANS_PATH, model='loglinear',
+                       grid_points=GRID_POINTS):
+    """Fit and optimize every product from the CSV inputs"""
+    fits = fit_demand_curves(load_observations(elasticity_path), model=model)
+    return optimize_prices(fits, load_current_prices(plans_path), grid_points=grid_points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit demand curves and find revenue-optimal prices")
+    parser.add_argument("--elasticity", type=Path, default=ELASTICITY_PATH)
+    parser.add_argument("--plans", type=Path, default=PRICING_PLANS_PATH)
+    parser.add_argument("--model", choices=sorted(DEMAND_MODELS), default='loglinear')
+    parser.add_argument("--grid-points", type=int, default=GRID_POINTS)
+    parser.add_argument("--out", type=Path, default=None, help="Optional CSV output")
+    args = parser.parse_args()
+
+    result = price_optimization(args.elasticity, args.plans, args.model, args.grid_points)
+    columns = PRODUCT_COLUMNS + ['current_price', 'optimal_price', 'elasticity_at_current',
+                                 'revenue_uplift_pct', 'r_squared', 'at_grid_bound']
+    print(result[columns].round(3).to_string(index=False))
+    if args.out:
+        result.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Vectorized Monte Carlo revenue projections for the Financial Projections tab.
+
+Baselines (MRR, active subscriptions, ARPU, churn and its day-to-day volatility) come
+from a filtered ``fact_subscription_metrics``. Every simulated path is a row of one
+``(n_paths, months)`` array. The customer recursion
+``customers[t] = customers[t-1] * (1 - churn[t]) + adds[t]`` is solved in closed form
+with cumulative products and sums, so no Python loop runs over paths or months.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+N_PATHS = 5_000
+MONTHS = 12
+PERCENTILES = [5, 25, 50, 75, 95]
+DAYS_PER_MONTH = 30
+BASELINE_WINDOW_DAYS = 30
+
+# Uncertainty around the slider assumptions (standard deviations)
+GROWTH_VOLATILITY = 0.25  # Relative noise on monthly gross adds
+MIN_CHURN_VOLATILITY = 0.10  # Floor on the relative month-to-month churn noise
+ARPU_VOLATILITY = 0.02  # Relative noise on realized ARPU
+PRICE_CHURN_SENSITIVITY = (0.5, 0.2)  # Mean and sd of churn increase per unit of price increase
+
+
+def projection_baseline(metrics, window_days=BASELINE_WINDOW_DAYS):
+    """Starting point for the projection from the latest ``window_days`` of metrics
+
+    Returns None when the filtered mart has no active subscriptions to project from.
+    """
+    if metrics.empty:
+        return None
+    metric_dates = pd.to_datetime(metrics['metric_date'])
+    recent = metrics[metric_dates > metric_dates.max() - pd.Timedelta(days=window_days)]
+    daily = recent.groupby('metric_date').agg(
+        total_mrr=('total_mrr', 'sum'),
+        active_subscriptions=('active_subscriptions', 'sum'),
+        churned_subscriptions=('churned_subscriptions', 'sum'),
+    ).sort_index()
+    latest = daily.iloc[-1]
+    active = float(latest['active_subscriptions'])
+    if active <= 0:
+        return None
+
+    # Daily churn across all groups, weighted by active subscriptions rather than averaged per group
+    daily_active = daily['active_subscriptions'].where(daily['active_subscriptions'] > 0)
+    daily_churn = (daily['churned_subscriptions'] / daily_active).dropna()
+    daily_rate = float(daily_churn.mean()) if len(daily_churn) else 0.0
+    monthly_churn = 1 - (1 - daily_rate) ** DAYS_PER_MONTH
+    churn_volatility = float(daily_churn.std() / daily_rate) if daily_rate > 0 and len(daily_churn) > 1 else 0.0
+    return {
+        'mrr': float(latest['total_mrr']),
+        'active_subscriptions': active,
+        'arpu': float(latest['total_mrr']) / active,
+        'monthly_churn': monthly_churn,
+        # Averaging daily noise into a month shrinks it by sqrt(days)
+        'churn_volatility': max(float(churn_volatility / np.sqrt(DAYS_PER_MONTH)), MIN_CHURN_VOLATILITY),
+    }
+
+
+def simulate_paths(baseline, price_change_pct=0.0, customer_growth_pct=0.0, churn_adjustment_pct=0.0,
+                   cac_adjustment_pct=0.0, n_paths=N_PATHS, months=MONTHS, seed=0):
+    """Monthly MRR for ``n_paths`` simulated futures, shape ``(n_paths, months)``
+
+    * ``customer_growth_pct``: annual net subscription growth at baseline churn; gross adds
+      are calibrated to reach it and vary month to month.
+    * ``churn_adjustment_pct``: relative change to baseline churn. A price increase adds
+      churn through a per-path sensitivity drawn around ``PRICE_CHURN_SENSITIVITY``.
+    * ``cac_adjustment_pct``: relative change in acquisition cost under a fixed acquisition
+      budget, so gross adds scale by ``1 / (1 + CAC change)``.
+    * ``price_change_pct``: applied to ARPU from the first projected month.
+    """
+    rng = np.random.default_rng(seed)
+    price_change = price_change_pct / 100
+    base_churn = baseline['monthly_churn']
+    active = baseline['active_subscriptions']
+
+    # Gross adds that would deliver the requested net growth at baseline churn
+    monthly_growth = (1 + customer_growth_pct / 100) ** (1 / 12) - 1
+    base_adds = max(active * (monthly_growth + base_churn), 0.0) / (1 + cac_adjustment_pct / 100)
+    adds = base_adds * np.clip(rng.normal(1.0, GROWTH_VOLATILITY, (n_paths, months)), 0, None)
+
+    sensitivity = rng.normal(*PRICE_CHURN_SENSITIVITY, (n_paths, 1))
+    churn_multiplier = (1 + churn_adjustment_pct / 100) * np.clip(1 + sensitivity * price_change, 0, None)
+    churn_noise = rng.lognormal(-baseline['churn_volatility'] ** 2 / 2, baseline['churn_volatility'], (n_paths, months))
+    churn = np.clip(base_churn * churn_multiplier * churn_noise, 0, 0.999)
+
+    # customers[t] = survival[t] * (customers[0] + sum_{k<=t} adds[k] / survival[k])
+    survival = np.cumprod(1 - churn, axis=1)
+    customers = survival * (active + np.cumsum(adds / survival, axis=1))
+
+    arpu = baseline['arpu'] * (1 + price_change) * rng.normal(1.0, ARPU_VOLATILITY, (n_paths, months))
+    return customers * arpu
+
+
+def percentile_bands(paths, percentiles=PERCENTILES):
+    """Per-month percentiles of simulated paths, one ``p<q>`` column per percentile"""
+    bands = np.percentile(paths, percentiles, axis=0)
+    return pd.DataFrame({f"p{q}": band for q, band in zip(percentiles, bands)},
+                        index=pd.RangeIndex(1, paths.shape[1] + 1, name='month'))
+
+
+def project(baseline, n_paths=N_PATHS, months=MONTHS, seed=0, **assumptions):
+    """Percentile bands plus end-of-horizon summary statistics for one set of assumptions"""
+    paths = simulate_paths(baseline, n_paths=n_paths, months=months, seed=seed, **assumptions)
+    final_mrr = paths[:, -1]
+    return {
+        'bands': percentile_bands(paths),
+        'median_mrr': float(np.median(final_mrr)),
+        'p5_mrr': float(np.percentile(final_mrr, 5)),
+        'p95_mrr': float(np.percentile(final_mrr, 95)),
+        'median_arr': float(np.median(final_mrr)) * 12,
+        'prob_growth': float((final_mrr > baseline['mrr']).mean()),
+    }
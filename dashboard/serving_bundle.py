@@ -0,0 +1,206 @@
+"""Versioned serving bundle of precomputed KPI tables and Plotly figures for the dashboard.
+
+The Airflow ``refresh_dashboard`` task builds a bundle after each ``dbt run`` so the
+first visitor does not pay for cold mart loads and figure building::
+
+    python dashboard/serving_bundle.py --out data/serving
+
+Each bundle is written to a staging directory, renamed into place and then made
+current by atomically replacing the ``CURRENT`` pointer file, so readers always see
+either the previous or the new bundle in full. The dashboard uses a bundle only when
+it was built from the same mart data version it sees, and computes live otherwise.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import shutil
+
+import pandas as pd
+import plotly.io as pio
+
+from dashboard_figures import FIGURE_BUILDERS
+from data_mart_manager import DataMartManager, MART_NAMES
+from duckdb_engine import write_atomic
+from filter_index import FilterIndex
+from kpi_calculations import customer_kpis, subscription_kpis, ltv_kpis
+
+
+BUNDLE_ROOT = Path("data/serving")
+CURRENT_POINTER = "CURRENT"
+KEEP_BUNDLES = 3  # Older bundles are kept briefly so in-flight readers never lose their files
+
+# KPI table -> (mart, sidebar filter columns the app applies to it, KPI function)
+KPI_VIEWS = {
+    'customer_kpis': ('dim_customers', ['customer_segment', 'country'], customer_kpis),
+    'subscription_kpis': ('fact_subscription_metrics', ['hub', 'tier'], subscription_kpis),
+    'ltv_kpis': ('fact_customer_ltv', ['ltv_segment'], ltv_kpis),
+}
+# Figure -> KPI view whose mart and filters it shares
+FIGURE_VIEWS = {
+    'customer_segment_pie': 'customer_kpis',
+    'health_vs_mrr_scatter': 'customer_kpis',
+    'mrr_trend_line': 'subscription_kpis',
+    'ltv_distribution_box': 'ltv_kpis',
+}
+# Figures are stored for every filter combination up to this many, otherwise only unfiltered
+MAX_FIGURE_COMBINATIONS = 32
+
+
+def kpi_record(kpi_func, df):
+    """KPIs of a filtered mart plus its row count; empty selections only carry ``rows``"""
+    return {'rows': len(df), **(kpi_func(df) if len(df) else {})}
+
+
+def combination_key(filters):
+    """Stable identifier of a filter combination (None means "All")"""
+    return json.dumps({column: (None if value is None else str(value)) for column, value in sorted(filters.items())})
+
+
+def filter_combinations(df, columns):
+    """Every combination of "All" and the values present in each filter column"""
+    choices = [[None] + sorted(str(value) for value in df[column].dropna().unique()) for column in columns]
+    return [dict(zip(columns, values)) for values in itertools.product(*choices)]
+
+
+def _file_key(key):
+    return hashlib.sha1(key.encode()).hexdigest()[:16]
+
+
+# --- Building ---
+def build_bundle(out_root=BUNDLE_ROOT, manager=None):
+    """Compute and publish a new bundle from the current marts; returns its directory"""
+    out_root = Path(out_root)
+    out_root.mkdir(parents=True, exist_ok=True)
+    manager = manager or DataMartManager()
+    marts = manager.load_marts(MART_NAMES)
+    data_version = manager.data_version(MART_NAMES)
+
+    created_at = datetime.now(timezone.utc)
+    version = f"{created_at:%Y%m%dT%H%M%S}-{hashlib.sha1(data_version.encode()).hexdigest()[:8]}"
+    staging = out_root / f".staging-{version}-{os.getpid()}"
+    (staging / "kpis").mkdir(parents=True)
+    (staging / "figures").mkdir()
+
+    manifest = {
+        'version': version,
+        'created_at': created_at.isoformat(),
+        'data_version': data_version,
+        'rows': {mart_name: len(df) for mart_name, df in marts.items()},
+        'kpis': {},
+        'figures': {},
+    }
+    try:
+        for table, (mart_name, columns, kpi_func) in KPI_VIEWS.items():
+            df = marts[mart_name]
+            columns = [column for column in columns if column in df.columns]
+            index = FilterIndex(df, columns)
+            combinations = filter_combinations(df, columns)
+            figure_names = [name for name, view in FIGURE_VIEWS.items() if view == table]
+            all_figures = len(combinations) <= MAX_FIGURE_COMBINATIONS
+            manifest['kpis'][table] = columns
+            manifest['figures'].update({name: {} for name in figure_names})
+
+            records = []
+            for filters in combinations:
+                # One filtered subset at a time keeps memory bounded by the mart size
+                subset = index.apply(df, **filters)
+                records.append({**filters, **kpi_record(kpi_func, subset)})
+                if not len(subset) or not (all_figures or all(value is None for value in filters.values())):
+                    continue
+                key = combination_key(filters)
+                for figure_name in figure_names:
+                    fig = FIGURE_BUILDERS[figure_name](subset)
+                    if fig is None:
+                        continue
+                    file_name = f"{figure_name}-{_file_key(key)}.json"
+                    (staging / "figures" / file_name).write_text(fig.to_json())
+                    manifest['figures'][figure_name][key] = file_name
+            pd.DataFrame(records).to_parquet(staging / "kpis" / f"{table}.parquet", index=False)
+
+        (staging / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        bundle_dir = out_root / version
+        os.replace(staging, bundle_dir)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    publish(out_root, version)
+    return bundle_dir
+
+
+def publish(out_root, version):
+    """Atomically point ``CURRENT`` at a bundle, then prune old bundles"""
+    out_root = Path(out_root)
+    write_atomic(out_root / CURRENT_POINTER, lambda tmp_path: tmp_path.write_text(version))
+
+    bundles = sorted(p for p in out_root.iterdir() if p.is_dir() and not p.name.startswith('.'))
+    for old in bundles[:-KEEP_BUNDLES]:
+        if old.name != version:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+# --- Reading ---
+def current_bundle_version(root=BUNDLE_ROOT):
+    """Name of the published bundle, or None if nothing has been published"""
+    try:
+        return (Path(root) / CURRENT_POINTER).read_text().strip() or None
+    except OSError:
+        return None
+
+
+class ServingBundle:
+    """Read side of a published bundle: KPI lookups and figures per filter combination"""
+
+    def __init__(self, bundle_dir):
+        self.bundle_dir = Path(bundle_dir)
+        self.manifest = json.loads((self.bundle_dir / "manifest.json").read_text())
+        self.version = self.manifest['version']
+        self.data_version = self.manifest['data_version']
+        self._kpis = {}
+        for table, columns in self.manifest['kpis'].items():
+            records = pd.read_parquet(self.bundle_dir / "kpis" / f"{table}.parquet").to_dict('records')
+            self._kpis[table] = {
+                combination_key({column: (None if pd.isna(record[column]) else record[column]) for column in columns}):
+                {name: value for name, value in record.items() if name not in columns}
+                for record in records
+            }
+
+    @classmethod
+    def load_current(cls, root=BUNDLE_ROOT):
+        """The published bundle, or None if there is none or it cannot be read"""
+        version = current_bundle_version(root)
+        if version is None:
+            return None
+        try:
+            return cls(Path(root) / version)
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def kpis(self, table, **filters):
+        """KPI record for a filter combination, or None if the bundle does not cover it"""
+        return self._kpis.get(table, {}).get(combination_key(filters))
+
+    def figure(self, name, **filters):
+        """A fresh Plotly figure for a filter combination, or None if it was not precomputed"""
+        file_name = self.manifest['figures'].get(name, {}).get(combination_key(filters))
+        if file_name is None:
+            return None
+        return pio.from_json((self.bundle_dir / "figures" / file_name).read_text())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and publish the dashboard serving bundle")
+    parser.add_argument("--out", type=Path, default=BUNDLE_ROOT, help="Bundle root directory")
+    args = parser.parse_args()
+
+    bundle_dir = build_bundle(args.out)
+    print(f"Published serving bundle {bundle_dir.name} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
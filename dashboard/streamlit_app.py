@@ -2,9 +2,9 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from pathlib import Path
-import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+import inspect
+import uuid
 
 # --- iOS Style CSS ---
 st.markdown("""
@@ -104,252 +104,83 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- Data Mart Classes for Better Structure ---
-class DataMartManager:
-    """Manages data marts following dbt patterns"""
-    
-    def __init__(self):
-        # Try multiple possible paths for dbt models
-        possible_paths = [
-            Path("dbt_models/models/marts"),
-            Path("models/marts"),
-            Path("marts"),
-            Path("data/marts"),
-            Path("data")
-        ]
-        
-        self.data_path = None
-        for path in possible_paths:
-            if path.exists():
-                self.data_path = path
-                break
-        
-        if self.data_path is None:
-            self.data_path = Path("data")
-            self.data_path.mkdir(exist_ok=True)
-        
-        self.marts = {}
-        
-    def load_mart(self, mart_name, required=True):
-        """Load a data mart with error handling"""
-        try:
-            # Try different file extensions and naming conventions
-            possible_files = [
-                self.data_path / f"{mart_name}.csv",
-                self.data_path / f"{mart_name}.sql",
-                self.data_path / f"{mart_name}.parquet",
-                # Also try without marts prefix if the mart_name includes it
-                self.data_path / f"{mart_name.replace('mart_', '')}.csv",
-                self.data_path / f"{mart_name.replace('mart_', '')}.sql"
-            ]
-            
-            for file_path in possible_files:
-                if file_path.exists():
-                    if file_path.suffix == '.csv':
-                        self.marts[mart_name] = pd.read_csv(file_path)
-                        return self.marts[mart_name]
-                    elif file_path.suffix == '.sql':
-                        # For SQL files, we'll use generated data (SQL execution not available)
-                        return self._generate_fallback_data(mart_name)
-                    elif file_path.suffix == '.parquet':
-                        self.marts[mart_name] = pd.read_parquet(file_path)
-                        return self.marts[mart_name]
-            
-            # No files found
-            if required:
-                st.error(f"Required data mart '{mart_name}' not found in {self.data_path}")
-                st.stop()
-            else:
-                return self._generate_fallback_data(mart_name)
-                
-        except Exception as e:
-            if required:
-                st.error(f"Error loading {mart_name}: {str(e)}")
-                st.stop()
-            else:
-                return self._generate_fallback_data(mart_name)
-    
-    def _generate_fallback_data(self, mart_name):
-        """Generate fallback data when marts are missing"""
-        if mart_name == "dim_customers":
-            return self._generate_customer_dimension()
-        elif mart_name == "dim_products":
-            return self._generate_product_dimension()
-        elif mart_name == "fact_subscription_metrics":
-            return self._generate_subscription_facts()
-        elif mart_name == "fact_customer_ltv":
-            return self._generate_ltv_facts()
-        elif mart_name == "fact_pricing_optimization":
-            return self._generate_pricing_facts()
-        elif mart_name == "mart_executive_summary":
-            return self._generate_executive_summary()
-        else:
-            return pd.DataFrame()
-    
-    def _generate_customer_dimension(self):
-        """Generate sample customer dimension data"""
-        np.random.seed(42)
-        customers = []
-        segments = ['CHAMPION', 'LOYAL', 'POTENTIAL_LOYAL', 'NEW_CUSTOMER', 'PROMISING', 'AT_RISK', 'HIBERNATING']
-        industries = ['Technology', 'Healthcare', 'Finance', 'Retail', 'Manufacturing', 'Education']
-        company_sizes = ['Small', 'Medium', 'Large', 'Enterprise']
-        countries = ['United States', 'Canada', 'United Kingdom', 'Germany', 'France', 'Australia', 'Japan', 'Brazil', 'India', 'Mexico']
-        states = ['California', 'Texas', 'New York', 'Florida', 'Illinois', 'Pennsylvania', 'Ohio', 'Washington', 'North Carolina', 'Georgia']
-        churn_risks = ['LOW', 'MEDIUM', 'HIGH']
-        
-        for i in range(1000):
-            country = np.random.choice(countries)
-            state = np.random.choice(states) if country == 'United States' else None
-            
-            customers.append({
-                'customer_id': f'CUST_{i:04d}',
-                'industry': np.random.choice(industries),
-                'company_size': np.random.choice(company_sizes),
-                'country': country,
-                'state': state,
-                'customer_segment': np.random.choice(segments),
-                'estimated_ltv': np.random.uniform(500, 15000),
-                'churn_risk': np.random.choice(churn_risks),
-                'customer_health_score': np.random.uniform(10, 100),
-                'current_mrr': np.random.uniform(50, 500),
-                'months_since_first_subscription': np.random.randint(1, 36),
-                'total_subscriptions': np.random.randint(1, 5),
-                'active_subscriptions': np.random.randint(1, 3)
-            })
-        return pd.DataFrame(customers)
-    
-    def _generate_product_dimension(self):
-        """Generate sample product dimension data"""
-        products = []
-        hubs = ['CMS', 'CRM', 'Marketing', 'Analytics', 'Sales']
-        tiers = ['Starter', 'Professional', 'Enterprise']
-        
-        for hub in hubs:
-            for tier in tiers:
-                products.append({
-                    'hub': hub,
-                    'tier': tier,
-                    'product_full_name': f"{hub} - {tier}",
-                    'avg_monthly_revenue': np.random.uniform(29, 299),
-                    'total_subscribers': np.random.randint(50, 500),
-                    'active_subscribers': np.random.randint(40, 450),
-                    'retention_rate': np.random.uniform(0.85, 0.98)
-                })
-        return pd.DataFrame(products)
-    
-    def _generate_subscription_facts(self):
-        """Generate sample subscription metrics facts"""
-        np.random.seed(42)
-        facts = []
-        hubs = ['CMS', 'CRM', 'Marketing', 'Analytics', 'Sales']
-        tiers = ['Starter', 'Professional', 'Enterprise']
-        base_date = datetime.now() - timedelta(days=90)
-        
-        for i in range(90):
-            date = base_date + timedelta(days=i)
-            for hub in hubs:
-                for tier in tiers:
-                    facts.append({
-                        'metric_date': date.strftime('%Y-%m-%d'),
-                        'hub': hub,
-                        'tier': tier,
-                        'active_subscriptions': np.random.randint(50, 300),
-                        'new_subscriptions': np.random.randint(0, 10),
-                        'churned_subscriptions': np.random.randint(0, 5),
-                        'total_mrr': np.random.uniform(5000, 50000),
-                        'new_mrr': np.random.uniform(0, 2000),
-                        'churned_mrr': np.random.uniform(0, 1000),
-                        'daily_churn_rate_pct': np.random.uniform(0.1, 2.0),
-                        'arpu': np.random.uniform(80, 200)
-                    })
-        return pd.DataFrame(facts)
-    
-    def _generate_ltv_facts(self):
-        """Generate sample LTV facts"""
-        np.random.seed(42)
-        facts = []
-        segments = ['VERY_HIGH', 'HIGH', 'MEDIUM', 'LOW', 'VERY_LOW']
-        
-        for i in range(500):
-            facts.append({
-                'customer_id': f'CUST_{i:04d}',
-                'predicted_ltv': np.random.uniform(500, 15000),
-                'total_historical_revenue': np.random.uniform(100, 8000),
-                'current_mrr': np.random.uniform(50, 500),
-                'ltv_segment': np.random.choice(segments),
-                'customer_roi_pct': np.random.uniform(150, 500),
-                'payback_period_months': np.random.uniform(2, 12)
-            })
-        return pd.DataFrame(facts)
-    
-    def _generate_pricing_facts(self):
-        """Generate sample pricing optimization facts"""
-        np.random.seed(42)
-        facts = []
-        hubs = ['CMS', 'CRM', 'Marketing', 'Analytics', 'Sales']
-        tiers = ['Starter', 'Professional', 'Enterprise']
-        recommendations = ['IMPLEMENT_IMMEDIATELY', 'TEST_RECOMMENDED', 'CAREFUL_TESTING', 'MONITOR', 'AVOID']
-        
-        for hub in hubs:
-            for tier in tiers:
-                for i in range(5):  # 5 pricing scenarios per product
-                    base_price = np.random.uniform(50, 300)
-                    price_point = base_price * (0.8 + i * 0.1)  # Price variations
-                    
-                    facts.append({
-                        'hub': hub,
-                        'tier': tier,
-                        'price_point': price_point,
-                        'current_avg_price': base_price,
-                        'potential_monthly_revenue': np.random.uniform(10000, 80000),
-                        'potential_customers': np.random.randint(100, 800),
-                        'revenue_change_pct': np.random.uniform(-20, 40),
-                        'customer_change_pct': np.random.uniform(-30, 20),
-                        'optimal_price': price_point if i == 2 else None,  # Mark middle scenario as optimal
-                        'optimal_revenue_uplift_pct': np.random.uniform(5, 25) if i == 2 else None,
-                        'strategic_recommendation': np.random.choice(recommendations),
-                        'revenue_rank': i + 1
-                    })
-        return pd.DataFrame(facts)
-    
-    def _generate_executive_summary(self):
-        """Generate sample executive summary matching the dbt model schema"""
-        return pd.DataFrame([{
-            'current_month': datetime.now().strftime('%Y-%m-01'),
-            'current_month_avg_mrr': np.random.uniform(150000, 200000),
-            'current_month_avg_customers': np.random.randint(1500, 2000),
-            'current_month_avg_churn_rate': np.random.uniform(1.5, 3.0),
-            'mrr_growth_mom_pct': np.random.uniform(3, 8),
-            'customer_growth_mom_pct': np.random.uniform(2, 6),
-            'top_hub_by_revenue': 'Marketing',
-            'top_hub_revenue': np.random.uniform(80000, 120000),
-            'champion_customers': np.random.randint(100, 200),
-            'champion_mrr': np.random.uniform(50000, 80000),
-            'total_high_risk_customers': np.random.randint(50, 150),
-            'immediate_pricing_opportunities': np.random.randint(3, 8),
-            'total_pricing_upside_pct': np.random.uniform(15, 35),
-            'report_generated_at': datetime.now().isoformat(),
-            'report_type': 'EXECUTIVE_SUMMARY'
-        }])
+from data_mart_manager import DataMartManager, LazyMartRegistry, MART_NAMES
+from filter_index import FilterIndex
+from mart_schema import memory_report
+from mart_store import MartStore, enable_copy_on_write
+from kpi_calculations import customer_kpis, subscription_kpis, ltv_kpis
+from tracing import RerunTracer, record_rerun, summarize
+from dashboard_figures import FIGURE_BUILDERS
+from serving_bundle import BUNDLE_ROOT, ServingBundle, current_bundle_version, kpi_record
+from pipeline_perf import PERF_DB, load_history, latest_run_summary
+import churn_risk
+import dq_profiler
+from executive_rollup import executive_kpis
+import pricing_engine
+from projection_engine import N_PATHS, project, projection_baseline
+
+# --- Rerun Tracing ---
+# Spans for this rerun are logged as JSON lines and kept per session for the timing panel
+tracer = RerunTracer(session_id=st.session_state.setdefault('trace_session_id', uuid.uuid4().hex[:12]))
 
 # --- Initialize Data Marts ---
+# Sessions get shallow views of the shared marts, which copy-on-write keeps from writing through
+enable_copy_on_write()
+
+@st.cache_resource
+def get_mart_manager():
+    """Process-wide mart manager, so its SQL runner, synthetic fallback and SQL errors are shared"""
+    return DataMartManager()
+
+def load_data_mart(mart_name):
+    """Load one data mart using the shared manager"""
+    manager = get_mart_manager()
+    df = manager.load_mart(mart_name, required=False)
+    # The mart store (or st.cache_data) keeps the mart; the long-lived manager holds no second copy
+    manager.marts.pop(mart_name, None)
+    return df
+
+@st.cache_resource
+def get_mart_store():
+    """Process-wide, memory-mapped mart store shared by every session (None without pyarrow)"""
+    try:
+        return MartStore(load_data_mart)
+    except (ImportError, OSError):
+        return None
+
 @st.cache_data
-def load_data_marts():
-    """Load all data marts using the manager"""
-    dm = DataMartManager()
-    
-    marts = {
-        'dim_customers': dm.load_mart('dim_customers', required=False),
-        'dim_products': dm.load_mart('dim_products', required=False),
-        'fact_subscription_metrics': dm.load_mart('fact_subscription_metrics', required=False),
-        'fact_customer_ltv': dm.load_mart('fact_customer_ltv', required=False),
-        'fact_pricing_optimization': dm.load_mart('fact_pricing_optimization', required=False),
-        'mart_executive_summary': dm.load_mart('mart_executive_summary', required=False)
-    }
-    
-    return marts
+def load_cached_mart(mart_name, data_version):
+    """Per-session copies of a mart, used only when the shared store is unavailable"""
+    return load_data_mart(mart_name)
+
+def load_traced_mart(mart_name):
+    """Load a mart on first access within this rerun, tracing the (possibly cached) load"""
+    with tracer.span(f'load_data_mart[{mart_name}]'):
+        if MART_STORE is None:
+            return load_cached_mart(mart_name, DATA_VERSION)
+        # A shallow view: the session can filter and add columns without touching the shared copy
+        return MART_STORE.get(mart_name, DATA_VERSION)
 
-# Load all data marts
-data_marts = load_data_marts()
+# Marts are loaded lazily: each rerun only reads the marts the active section uses
+with tracer.span('data_version'):
+    DATA_VERSION = get_mart_manager().data_version(MART_NAMES)
+MART_STORE = get_mart_store()
+data_marts = LazyMartRegistry(load_traced_mart)
+
+# --- Serving Bundle ---
+@st.cache_resource
+def get_serving_bundle(bundle_version):
+    """Load a published serving bundle once per version (None if it cannot be read)"""
+    try:
+        return ServingBundle(BUNDLE_ROOT / bundle_version)
+    except (OSError, ValueError, KeyError):
+        return None
+
+# Precomputed KPIs and figures are used only when built from the marts this process sees
+bundle_version = current_bundle_version()
+SERVING_BUNDLE = get_serving_bundle(bundle_version) if bundle_version else None
+if SERVING_BUNDLE is not None and SERVING_BUNDLE.data_version != DATA_VERSION:
+    SERVING_BUNDLE = None
 
 # --- Tab Navigation ---
 st.set_page_config(page_title="Hub Monetization Insights", page_icon="💸", layout="wide")
@@ -357,6 +188,10 @@ st.set_page_config(page_title="Hub Monetization Insights", page_icon="💸", lay
 # --- Sidebar Filters ---
 st.sidebar.title("🎛️ Hub Filters")
 
+def selection(value, all_label):
+    """Translate an "All ..." sidebar choice into an inactive filter"""
+    return None if value == all_label else value
+
 # Initialize filter variables
 selected_hub = "All Hubs"
 selected_tier = "All Tiers"
@@ -364,23 +199,31 @@ selected_segment = "All Segments"
 selected_country = "All Countries"
 selected_ltv_segment = "All LTV Segments"
 
+@st.cache_data
+def get_filter_options(mart_name, column, data_version):
+    """Sorted sidebar choices for a column, or None when the mart lacks it (cached so reruns skip the mart)"""
+    df = data_marts[mart_name]
+    if df.empty or column not in df.columns:
+        return None
+    return sorted(df[column].unique())
+
 # Hub selection from products dimension
-if not data_marts['dim_products'].empty and 'hub' in data_marts['dim_products'].columns:
-    unique_hubs = sorted(data_marts['dim_products']['hub'].unique())
+unique_hubs = get_filter_options('dim_products', 'hub', DATA_VERSION)
+if unique_hubs is not None:
     selected_hub = st.sidebar.selectbox("🏢 Choose a Hub", ["All Hubs"] + unique_hubs)
 else:
     st.sidebar.info("Hub filter not available - no product data")
 
 # Tier selection from products dimension
-if not data_marts['dim_products'].empty and 'tier' in data_marts['dim_products'].columns:
-    unique_tiers = sorted(data_marts['dim_products']['tier'].unique())
+unique_tiers = get_filter_options('dim_products', 'tier', DATA_VERSION)
+if unique_tiers is not None:
     selected_tier = st.sidebar.selectbox("🎯 Choose a Tier", ["All Tiers"] + unique_tiers)
 else:
     st.sidebar.info("Tier filter not available - no product data")
 
 # Customer segment filter
-if not data_marts['dim_customers'].empty and 'customer_segment' in data_marts['dim_customers'].columns:
-    unique_segments = sorted(data_marts['dim_customers']['customer_segment'].unique())
+unique_segments = get_filter_options('dim_customers', 'customer_segment', DATA_VERSION)
+if unique_segments is not None:
     selected_segment = st.sidebar.selectbox(
         "👥 Customer Segment",
         ["All Segments"] + unique_segments
@@ -389,8 +232,8 @@ else:
     st.sidebar.info("Customer segment filter not available")
 
 # Country filter
-if not data_marts['dim_customers'].empty and 'country' in data_marts['dim_customers'].columns:
-    unique_countries = sorted(data_marts['dim_customers']['country'].unique())
+unique_countries = get_filter_options('dim_customers', 'country', DATA_VERSION)
+if unique_countries is not None:
     selected_country = st.sidebar.selectbox(
         "🌍 Choose a Country",
         ["All Countries"] + unique_countries
@@ -399,8 +242,8 @@ else:
     st.sidebar.info("Country filter not available")
 
 # LTV Segment filter
-if not data_marts['fact_customer_ltv'].empty and 'ltv_segment' in data_marts['fact_customer_ltv'].columns:
-    unique_ltv_segments = sorted(data_marts['fact_customer_ltv']['ltv_segment'].unique())
+unique_ltv_segments = get_filter_options('fact_customer_ltv', 'ltv_segment', DATA_VERSION)
+if unique_ltv_segments is not None:
     selected_ltv_segment = st.sidebar.selectbox(
         "💰 LTV Segment",
         ["All LTV Segments"] + unique_ltv_segments
@@ -408,70 +251,86 @@ if not data_marts['fact_customer_ltv'].empty and 'ltv_segment' in data_marts['fa
 else:
     st.sidebar.info("LTV segment filter not available")
 
+# Active filters per mart family, shared by the filter helpers and serving bundle lookups
+CUSTOMER_FILTERS = {
+    'customer_segment': selection(selected_segment, "All Segments"),
+    'country': selection(selected_country, "All Countries")
+}
+PRODUCT_FILTERS = {
+    'hub': selection(selected_hub, "All Hubs"),
+    'tier': selection(selected_tier, "All Tiers")
+}
+LTV_FILTERS = {
+    'ltv_segment': selection(selected_ltv_segment, "All LTV Segments")
+}
+
+if SERVING_BUNDLE is not None:
+    st.sidebar.caption(f"⚡ Serving bundle {SERVING_BUNDLE.version}")
+
+# --- Mart Memory Footprint ---
+@st.cache_data
+def get_memory_report(data_version):
+    """Per-mart memory footprint, computed once per data version"""
+    return memory_report({mart_name: data_marts[mart_name] for mart_name in MART_NAMES})
+
 # --- Helper Functions ---
-def apply_filters_to_customers(df):
+@st.cache_resource
+def get_filter_index(mart_name, data_version):
+    """Build the filter index for a mart once per data version"""
+    return FilterIndex(data_marts[mart_name])
+
+def apply_filters_to_customers(df, mart_name='dim_customers'):
     """Apply global filters to customer data"""
     if df.empty:
         return df
-        
-    filtered_df = df.copy()
-    
-    # Apply customer segment filter
-    if selected_segment != "All Segments" and 'customer_segment' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['customer_segment'] == selected_segment]
     
-    # Apply country filter
-    if selected_country != "All Countries" and 'country' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['country'] == selected_country]
-    
-    return filtered_df
+    return get_filter_index(mart_name, DATA_VERSION).apply(df, **CUSTOMER_FILTERS)
 
-def apply_filters_to_metrics(df):
+def apply_filters_to_metrics(df, mart_name='fact_subscription_metrics'):
     """Apply global filters to subscription metrics"""
     if df.empty:
         return df
-        
-    filtered_df = df.copy()
     
-    # Apply hub filter
-    if selected_hub != "All Hubs" and 'hub' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['hub'] == selected_hub]
-    
-    # Apply tier filter  
-    if selected_tier != "All Tiers" and 'tier' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['tier'] == selected_tier]
-    
-    return filtered_df
+    return get_filter_index(mart_name, DATA_VERSION).apply(df, **PRODUCT_FILTERS)
 
-def apply_filters_to_ltv(df):
+def apply_filters_to_ltv(df, mart_name='fact_customer_ltv'):
     """Apply global filters to LTV data"""
     if df.empty:
         return df
-        
-    filtered_df = df.copy()
     
-    # Apply LTV segment filter
-    if selected_ltv_segment != "All LTV Segments" and 'ltv_segment' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['ltv_segment'] == selected_ltv_segment]
-    
-    return filtered_df
+    return get_filter_index(mart_name, DATA_VERSION).apply(df, **LTV_FILTERS)
 
-def apply_filters_to_pricing(df):
+def apply_filters_to_pricing(df, mart_name='fact_pricing_optimization'):
     """Apply global filters to pricing optimization data"""
     if df.empty:
         return df
-        
-    filtered_df = df.copy()
     
-    # Apply hub filter
-    if selected_hub != "All Hubs" and 'hub' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['hub'] == selected_hub]
-    
-    # Apply tier filter
-    if selected_tier != "All Tiers" and 'tier' in filtered_df.columns:
-        filtered_df = filtered_df[filtered_df['tier'] == selected_tier]
-    
-    return filtered_df
+    return get_filter_index(mart_name, DATA_VERSION).apply(df, **PRODUCT_FILTERS)
+
+def bundled_view(kpi_table, figure_names, filters, load_filtered, kpi_func):
+    """KPIs and figures for a tab from the serving bundle, computing live whatever it lacks
+
+    ``load_filtered`` is only called (and the mart only loaded) on a bundle miss.
+    """
+    kpi = SERVING_BUNDLE.kpis(kpi_table, **filters) if SERVING_BUNDLE is not None else None
+    figures = {
+        name: SERVING_BUNDLE.figure(name, **filters) if SERVING_BUNDLE is not None else None
+        for name in figure_names
+    }
+    if kpi is None or (kpi['rows'] and any(fig is None for fig in figures.values())):
+        with tracer.span('live_compute', view=kpi_table):
+            filtered = load_filtered()
+            if kpi is None:
+                kpi = kpi_record(kpi_func, filtered)
+            for name in figure_names:
+                if figures[name] is None and len(filtered):
+                    figures[name] = FIGURE_BUILDERS[name](filtered)
+    return kpi, figures
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart with its serialization time traced separately from figure building"""
+    with tracer.span('plotly_chart'):
+        st.plotly_chart(fig, **kwargs)
 
 def create_ios_metric_card(title, value, subtitle="", color_gradient="135deg, #667eea 0%, #764ba2 100%"):
     """Create iOS-style metric cards"""
@@ -487,20 +346,20 @@ def create_ios_metric_card(title, value, subtitle="", color_gradient="135deg, #6
 st.title("💸 Hub Monetization Insights Dashboard")
 st.markdown("### Data Mart-Driven Analytics")
 
-# Create tabs
-tabs = st.tabs([
-    "📊 Executive Summary", "💵 Customer Analytics", "🔄 Funnel Analysis", 
-    "📈 Subscription Metrics", "💰 LTV Analysis", "🎯 Pricing Strategy", 
-    "📊 Financial Projections", "🧠 Recommendations"
-])
 
-# --- Tab 1: Executive Summary (Using mart_executive_summary) ---
-with tabs[0]:
+# --- Tab 1: Executive Summary (Using mart_executive_daily) ---
+@st.cache_data
+def get_executive_kpis(data_version, today):
+    """mart_executive_summary KPIs from the daily rollup's last two months, once per data version and day"""
+    return executive_kpis(data_marts['mart_executive_daily'], today)
+
+def render_executive_summary():
+    """Render the Executive Summary tab (mart_executive_daily)"""
     st.markdown('<div class="kpi-section">', unsafe_allow_html=True)
     st.subheader("📈 Executive KPI Dashboard")
     
-    if not data_marts['mart_executive_summary'].empty:
-        exec_data = data_marts['mart_executive_summary'].iloc[0]
+    if not data_marts['mart_executive_daily'].empty:
+        exec_data = get_executive_kpis(DATA_VERSION, datetime.now().date()).iloc[0]
         
         # Top-level KPIs
         col1, col2, col3, col4 = st.columns(4)
@@ -577,54 +436,52 @@ with tabs[0]:
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 2: Customer Analytics (Using dim_customers) ---
-with tabs[1]:
+def render_customer_analytics():
+    """Render the Customer Analytics tab (dim_customers)"""
     st.markdown('<div class="kpi-section">', unsafe_allow_html=True)
     st.subheader("👥 Customer Analytics KPIs")
     
-    filtered_customers = apply_filters_to_customers(data_marts['dim_customers'])
+    customer_kpi, customer_figures = bundled_view(
+        'customer_kpis', ['customer_segment_pie', 'health_vs_mrr_scatter'], CUSTOMER_FILTERS,
+        lambda: apply_filters_to_customers(data_marts['dim_customers']), customer_kpis
+    )
     
-    if not filtered_customers.empty:
+    if customer_kpi['rows']:
         # KPIs FIRST - Top Row
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            create_ios_metric_card("AVG HEALTH SCORE", f"{filtered_customers['customer_health_score'].mean():.1f}",
+            create_ios_metric_card("AVG HEALTH SCORE", f"{customer_kpi['avg_health_score']:.1f}",
                                  "Customer health average",
                                  "135deg, #00b894 0%, #00a085 100%")
         with col2:
-            create_ios_metric_card("AVG LTV", f"${filtered_customers['estimated_ltv'].mean():,.0f}",
+            create_ios_metric_card("AVG LTV", f"${customer_kpi['avg_ltv']:,.0f}",
                                  "Lifetime value average",
                                  "135deg, #74b9ff 0%, #0984e3 100%")
         with col3:
-            high_risk_pct = (filtered_customers['churn_risk'] == 'HIGH').mean() * 100
-            create_ios_metric_card("HIGH RISK %", f"{high_risk_pct:.1f}%",
+            create_ios_metric_card("HIGH RISK %", f"{customer_kpi['high_risk_pct']:.1f}%",
                                  "Customers at risk",
                                  "135deg, #fd79a8 0%, #e84393 100%")
         with col4:
-            total_customers = len(filtered_customers)
-            create_ios_metric_card("TOTAL CUSTOMERS", f"{total_customers:,}",
+            create_ios_metric_card("TOTAL CUSTOMERS", f"{customer_kpi['total_customers']:,}",
                                  "In current filter",
                                  "135deg, #fdcb6e 0%, #e17055 100%")
         
         # Second Row of KPIs
         col5, col6, col7, col8 = st.columns(4)
         with col5:
-            avg_mrr = filtered_customers['current_mrr'].mean()
-            create_ios_metric_card("AVG MRR", f"${avg_mrr:.0f}",
+            create_ios_metric_card("AVG MRR", f"${customer_kpi['avg_mrr']:.0f}",
                                  "Monthly recurring revenue",
                                  "135deg, #a29bfe 0%, #6c5ce7 100%")
         with col6:
-            total_mrr = filtered_customers['current_mrr'].sum()
-            create_ios_metric_card("TOTAL MRR", f"${total_mrr:,.0f}",
+            create_ios_metric_card("TOTAL MRR", f"${customer_kpi['total_mrr']:,.0f}",
                                  "Combined monthly revenue",
                                  "135deg, #00cec9 0%, #00b894 100%")
         with col7:
-            champion_pct = (filtered_customers['customer_segment'] == 'CHAMPION').mean() * 100
-            create_ios_metric_card("CHAMPION %", f"{champion_pct:.1f}%",
+            create_ios_metric_card("CHAMPION %", f"{customer_kpi['champion_pct']:.1f}%",
                                  "Top tier customers",
                                  "135deg, #e17055 0%, #d63031 100%")
         with col8:
-            avg_tenure = filtered_customers['months_since_first_subscription'].mean()
-            create_ios_metric_card("AVG TENURE", f"{avg_tenure:.1f}mo",
+            create_ios_metric_card("AVG TENURE", f"{customer_kpi['avg_tenure']:.1f}mo",
                                  "Customer lifetime",
                                  "135deg, #55a3ff 0%, #003d82 100%")
     
@@ -634,48 +491,23 @@ with tabs[1]:
     st.markdown('<div class="ios-card">', unsafe_allow_html=True)
     st.subheader("📊 Customer Analysis Visualizations")
     
-    if not filtered_customers.empty:
+    if customer_kpi['rows']:
         # Side by side visualizations
         col1, col2 = st.columns(2)
         
         with col1:
             # Customer segment distribution
-            segment_dist = filtered_customers['customer_segment'].value_counts()
-            fig_segments = px.pie(
-                values=segment_dist.values, 
-                names=segment_dist.index,
-                title="Customer Segment Distribution"
-            )
-            fig_segments.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                height=400,
-                font=dict(size=12)
-            )
-            st.plotly_chart(fig_segments, use_container_width=True)
+            plotly_chart(customer_figures['customer_segment_pie'], use_container_width=True)
         
         with col2:
             # Health score vs MRR scatter
-            fig_health = px.scatter(
-                filtered_customers,
-                x='customer_health_score',
-                y='current_mrr',
-                color='churn_risk',
-                size='estimated_ltv',
-                title="Customer Health Score vs MRR"
-            )
-            fig_health.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                height=400,
-                font=dict(size=12)
-            )
-            st.plotly_chart(fig_health, use_container_width=True)
+            plotly_chart(customer_figures['health_vs_mrr_scatter'], use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 3: Funnel Analysis ---
-with tabs[2]:
+def render_funnel_analysis():
+    """Render the Funnel Analysis tab (dim_customers, fact_subscription_metrics)"""
     st.markdown('<div class="kpi-section">', unsafe_allow_html=True)
     st.subheader("🔄 Customer Acquisition & Conversion Funnel")
     
@@ -707,18 +539,15 @@ with tabs[2]:
         )
     
     # Apply funnel filters to get relevant data
-    filtered_customers_funnel = data_marts['dim_customers'].copy()
-    filtered_metrics_funnel = data_marts['fact_subscription_metrics'].copy()
-    
-    # Apply funnel-specific filters
-    if funnel_country != "All Countries" and 'country' in filtered_customers_funnel.columns:
-        filtered_customers_funnel = filtered_customers_funnel[filtered_customers_funnel['country'] == funnel_country]
-    
-    if funnel_hub != "All Hubs" and 'hub' in filtered_metrics_funnel.columns:
-        filtered_metrics_funnel = filtered_metrics_funnel[filtered_metrics_funnel['hub'] == funnel_hub]
-    
-    if funnel_tier != "All Tiers" and 'tier' in filtered_metrics_funnel.columns:
-        filtered_metrics_funnel = filtered_metrics_funnel[filtered_metrics_funnel['tier'] == funnel_tier]
+    filtered_customers_funnel = get_filter_index('dim_customers', DATA_VERSION).apply(
+        data_marts['dim_customers'],
+        country=selection(funnel_country, "All Countries")
+    )
+    filtered_metrics_funnel = get_filter_index('fact_subscription_metrics', DATA_VERSION).apply(
+        data_marts['fact_subscription_metrics'],
+        hub=selection(funnel_hub, "All Hubs"),
+        tier=selection(funnel_tier, "All Tiers")
+    )
     
     if not filtered_customers_funnel.empty and not filtered_metrics_funnel.empty:
         # Generate funnel data (simulated customer journey stages)
@@ -861,7 +690,7 @@ with tabs[2]:
             font=dict(size=12)
         )
         
-        st.plotly_chart(fig_funnel, use_container_width=True)
+        plotly_chart(fig_funnel, use_container_width=True)
         
         # Conversion Rate Analysis - Side by Side Cards
         st.subheader("📈 Stage-by-Stage Conversion Analysis")
@@ -901,7 +730,7 @@ with tabs[2]:
                 textposition='outside'
             )
             
-            st.plotly_chart(fig_conversion, use_container_width=True)
+            plotly_chart(fig_conversion, use_container_width=True)
         
         with col2:
             # Funnel insights and recommendations
@@ -939,102 +768,132 @@ with tabs[2]:
         st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 4: Subscription Metrics (Using fact_subscription_metrics) ---
-with tabs[3]:
+def render_subscription_metrics():
+    """Render the Subscription Metrics tab (fact_subscription_metrics)"""
     st.markdown('<div class="kpi-section">', unsafe_allow_html=True)
     st.subheader("📈 Subscription Performance KPIs")
     
-    filtered_metrics = apply_filters_to_metrics(data_marts['fact_subscription_metrics'])
+    # Latest-day KPIs and the MRR trend, precomputed in the serving bundle when available
+    subscription_kpi, subscription_figures = bundled_view(
+        'subscription_kpis', ['mrr_trend_line'], PRODUCT_FILTERS,
+        lambda: apply_filters_to_metrics(data_marts['fact_subscription_metrics']), subscription_kpis
+    )
     
-    if not filtered_metrics.empty:
-        # Convert metric_date to datetime
-        filtered_metrics['metric_date'] = pd.to_datetime(filtered_metrics['metric_date'])
-        
-        # Get latest metrics for KPIs
-        latest_metrics = filtered_metrics[filtered_metrics['metric_date'] == filtered_metrics['metric_date'].max()]
-        
+    if subscription_kpi['rows']:
         # KPIs FIRST - Top Row
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            create_ios_metric_card("TOTAL MRR", f"${latest_metrics['total_mrr'].sum():,.0f}",
+            create_ios_metric_card("TOTAL MRR", f"${subscription_kpi['total_mrr']:,.0f}",
                                  "Current monthly revenue",
                                  "135deg, #00b894 0%, #00a085 100%")
         with col2:
-            create_ios_metric_card("ACTIVE SUBS", f"{latest_metrics['active_subscriptions'].sum():,.0f}",
+            create_ios_metric_card("ACTIVE SUBS", f"{subscription_kpi['active_subscriptions']:,.0f}",
                                  "Current subscribers",
                                  "135deg, #74b9ff 0%, #0984e3 100%")
         with col3:
-            create_ios_metric_card("AVG CHURN", f"{latest_metrics['daily_churn_rate_pct'].mean():.2f}%",
+            create_ios_metric_card("AVG CHURN", f"{subscription_kpi['avg_churn_rate_pct']:.2f}%",
                                  "Daily churn rate",
                                  "135deg, #fd79a8 0%, #e84393 100%")
         with col4:
-            create_ios_metric_card("AVG ARPU", f"${latest_metrics['arpu'].mean():.0f}",
+            create_ios_metric_card("AVG ARPU", f"${subscription_kpi['avg_arpu']:.0f}",
                                  "Revenue per user",
                                  "135deg, #fdcb6e 0%, #e17055 100%")
         
-        # Time series visualizations
-        daily_metrics = filtered_metrics.groupby('metric_date').agg({
-            'total_mrr': 'sum',
-            'active_subscriptions': 'sum',
-            'daily_churn_rate_pct': 'mean'
-        }).reset_index()
-        
         # MRR trend chart
-        fig_mrr = px.line(daily_metrics, x='metric_date', y='total_mrr',
-                         title='MRR Trend Analysis')
-        fig_mrr.update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="SF Pro Display, -apple-system, BlinkMacSystemFont, sans-serif", color='white')
-        )
-        fig_mrr.update_traces(line_color='rgba(0, 184, 148, 0.9)', line_width=3)
-        st.plotly_chart(fig_mrr, use_container_width=True)
+        plotly_chart(subscription_figures['mrr_trend_line'], use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 5: LTV Analysis (Using fact_customer_ltv) ---
-with tabs[4]:
+def render_ltv_analysis():
+    """Render the LTV Analysis tab (fact_customer_ltv)"""
     st.markdown('<div class="kpi-section">', unsafe_allow_html=True)
     st.subheader("💰 Customer Lifetime Value KPIs")
     
-    ltv_data = apply_filters_to_ltv(data_marts['fact_customer_ltv'])
+    ltv_kpi, ltv_figures = bundled_view(
+        'ltv_kpis', ['ltv_distribution_box'], LTV_FILTERS,
+        lambda: apply_filters_to_ltv(data_marts['fact_customer_ltv']), ltv_kpis
+    )
     
-    if not ltv_data.empty:
+    if ltv_kpi['rows']:
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            create_ios_metric_card("AVG LTV", f"${ltv_data['predicted_ltv'].mean():,.0f}",
+            create_ios_metric_card("AVG LTV", f"${ltv_kpi['avg_predicted_ltv']:,.0f}",
                                  "Predicted lifetime value",
                                  "135deg, #00b894 0%, #00a085 100%")
         with col2:
-            create_ios_metric_card("TOTAL REVENUE", f"${ltv_data['total_historical_revenue'].sum():,.0f}",
+            create_ios_metric_card("TOTAL REVENUE", f"${ltv_kpi['total_historical_revenue']:,.0f}",
                                  "Historical customer revenue",
                                  "135deg, #74b9ff 0%, #0984e3 100%")
         with col3:
-            create_ios_metric_card("AVG ROI", f"{ltv_data['customer_roi_pct'].mean():.0f}%",
+            create_ios_metric_card("AVG ROI", f"{ltv_kpi['avg_roi_pct']:.0f}%",
                                  "Return on investment",
                                  "135deg, #fdcb6e 0%, #e17055 100%")
         with col4:
-            create_ios_metric_card("AVG PAYBACK", f"{ltv_data['payback_period_months'].mean():.1f}mo",
+            create_ios_metric_card("AVG PAYBACK", f"{ltv_kpi['avg_payback_months']:.1f}mo",
                                  "Customer payback period",
                                  "135deg, #a29bfe 0%, #6c5ce7 100%")
         
         # LTV distribution visualization
-        if 'ltv_segment' in ltv_data.columns:
-            fig_ltv_dist = px.box(ltv_data, x='ltv_segment', y='predicted_ltv',
-                                 title='LTV Distribution by Segment')
-            fig_ltv_dist.update_layout(
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(family="SF Pro Display, -apple-system, BlinkMacSystemFont, sans-serif", color='white')
-            )
-            st.plotly_chart(fig_ltv_dist, use_container_width=True)
+        if ltv_figures['ltv_distribution_box'] is not None:
+            plotly_chart(ltv_figures['ltv_distribution_box'], use_container_width=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 6: Pricing Strategy ---
-with tabs[5]:
+@st.cache_data
+def get_price_optimization(pricing_version):
+    """Demand curves and revenue-optimal prices for every product, fitted once per input version"""
+    if not pricing_engine.ELASTICITY_PATH.exists():
+        return None
+    return pricing_engine.price_optimization()
+
+def render_price_matrix():
+    """All-products matrix of revenue-optimal prices and uplift from the fitted demand curves"""
+    optimization = get_price_optimization(pricing_engine.data_version())
+    if optimization is None or optimization.empty:
+        st.info("🎯 No price elasticity observations found for the all-products matrix.")
+        return
+
+    st.markdown("#### 🧮 Revenue-Optimal Prices Across All Products")
+    uplift = optimization.pivot(index='hub', columns='tier', values='revenue_uplift_pct')
+    optimal = optimization.pivot(index='hub', columns='tier', values='optimal_price')
+    fig_matrix = go.Figure(go.Heatmap(
+        z=uplift.values,
+        x=uplift.columns,
+        y=uplift.index,
+        text=[[f"${price:,.0f}" for price in row] for row in optimal.values],
+        texttemplate="%{text}<br>%{z:+.0f}%",
+        colorscale='RdYlGn',
+        zmid=0,
+        colorbar=dict(title='Uplift %'),
+        hovertemplate="%{y} - %{x}<br>Optimal price: %{text}<br>Revenue uplift: %{z:+.1f}%<extra></extra>",
+    ))
+    fig_matrix.update_layout(
+        title='Optimal Price and Revenue Uplift by Hub and Tier',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=400,
+        font=dict(size=12)
+    )
+    plotly_chart(fig_matrix, use_container_width=True)
+
+    st.dataframe(
+        optimization[['hub', 'tier', 'current_price', 'optimal_price', 'price_change_pct',
+                      'elasticity_at_current', 'revenue_uplift_pct', 'r_squared', 'at_grid_bound']].round(2),
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption("Log-linear demand curves fitted to data/pricing_elasticity.csv. "
+               "at_grid_bound marks optima at the edge of the observed price range, where the curve is extrapolating.")
+
+def render_pricing_strategy():
+    """Render the Pricing Strategy tab (fact_pricing_optimization)"""
     st.markdown('<div class="projection-card">', unsafe_allow_html=True)
     st.subheader("🎯 Pricing Optimization Strategy")
     
+    render_price_matrix()
+    
     # Only show if specific hub and tier are selected
     if selected_hub != "All Hubs" and selected_tier != "All Tiers":
         pricing_data = apply_filters_to_pricing(data_marts['fact_pricing_optimization'])
@@ -1084,11 +943,12 @@ with tabs[5]:
                             height=400,
                             font=dict(size=12, color='white')
                         )
-                        st.plotly_chart(fig_elasticity, use_container_width=True)
+                        plotly_chart(fig_elasticity, use_container_width=True)
                 
                 with col2:
                     # Strategic recommendations summary for selected product
                     recommendations = pricing_data['strategic_recommendation'].value_counts()
+                    recommendations = recommendations[recommendations > 0]
                     fig_recommendations = px.bar(
                         x=recommendations.index, 
                         y=recommendations.values,
@@ -1102,13 +962,13 @@ with tabs[5]:
                         xaxis_title="Strategy Type",
                         yaxis_title="Count"
                     )
-                    st.plotly_chart(fig_recommendations, use_container_width=True)
+                    plotly_chart(fig_recommendations, use_container_width=True)
             else:
                 st.info(f"🎯 No pricing optimization data available for {selected_hub} - {selected_tier}.")
         else:
             st.info(f"🎯 No pricing data found for {selected_hub} - {selected_tier}.")
     else:
-        st.info("🎯 Please select both a specific Hub and Tier from the sidebar to view pricing strategy recommendations.")
+        st.info("🎯 Select both a specific Hub and Tier from the sidebar for detailed pricing strategy recommendations.")
         st.markdown("""
         <div style="background: linear-gradient(135deg, #74b9ff 0%, #0984e3 100%); border-radius: 12px; padding: 20px; color: white; margin: 16px 0;">
             <h4>📋 How to Use Pricing Strategy</h4>
@@ -1128,51 +988,135 @@ with tabs[5]:
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 7: Financial Projections ---
-with tabs[6]:
+@st.cache_data
+def get_projection_baseline(hub, tier, data_version):
+    """MRR, churn and ARPU baseline for a hub/tier selection (None selects all)"""
+    metrics = data_marts['fact_subscription_metrics']
+    if metrics.empty:
+        return None
+    filtered = get_filter_index('fact_subscription_metrics', data_version).apply(metrics, hub=hub, tier=tier)
+    return projection_baseline(filtered)
+
+# Slider changes rerun only the scenario fragment, not the whole script
+fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda func: func)
+
+@fragment
+def render_projection_scenarios(baseline):
+    """Scenario sliders, Monte Carlo percentile bands and 12-month KPIs"""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        price_change = st.slider("Price Change (%)", -50, 100, 0, 5)
+        customer_growth = st.slider("Annual Customer Growth (%)", -30, 200, 20, 5)
+    
+    with col2:
+        churn_adjustment = st.slider("Churn Rate Adjustment (%)", -50, 100, 0, 5)
+        cac_adjustment = st.slider("CAC Adjustment (%)", -50, 100, 0, 5)
+    
+    projection = project(
+        baseline,
+        price_change_pct=price_change,
+        customer_growth_pct=customer_growth,
+        churn_adjustment_pct=churn_adjustment,
+        cac_adjustment_pct=cac_adjustment,
+    )
+    
+    st.markdown("#### 📊 12-Month Projections")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        create_ios_metric_card("PROJECTED MRR", f"${projection['median_mrr']:,.0f}",
+                             f"P5–P95: ${projection['p5_mrr']:,.0f} – ${projection['p95_mrr']:,.0f}",
+                             "135deg, #00b894 0%, #00a085 100%")
+    with col2:
+        create_ios_metric_card("PROJECTED ARR", f"${projection['median_arr']:,.0f}",
+                             "Median annual run rate",
+                             "135deg, #74b9ff 0%, #0984e3 100%")
+    with col3:
+        revenue_impact = ((projection['median_mrr'] - baseline['mrr']) / baseline['mrr']) * 100
+        create_ios_metric_card("REVENUE IMPACT", f"{revenue_impact:+.1f}%",
+                             f"{projection['prob_growth']:.0%} chance MRR grows",
+                             "135deg, #fdcb6e 0%, #e17055 100%")
+    
+    bands = projection['bands']
+    fig_projection = go.Figure([
+        go.Scatter(x=bands.index, y=bands['p95'], line=dict(width=0), showlegend=False, hoverinfo='skip'),
+        go.Scatter(x=bands.index, y=bands['p5'], fill='tonexty', fillcolor='rgba(0, 184, 148, 0.15)',
+                   line=dict(width=0), name='P5–P95'),
+        go.Scatter(x=bands.index, y=bands['p75'], line=dict(width=0), showlegend=False, hoverinfo='skip'),
+        go.Scatter(x=bands.index, y=bands['p25'], fill='tonexty', fillcolor='rgba(0, 184, 148, 0.35)',
+                   line=dict(width=0), name='P25–P75'),
+        go.Scatter(x=bands.index, y=bands['p50'], line=dict(color='rgba(0, 184, 148, 0.9)', width=3), name='Median'),
+    ])
+    fig_projection.update_layout(
+        title='Projected MRR by Month',
+        xaxis_title='Month',
+        yaxis_title='MRR ($)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        height=400,
+        font=dict(size=12)
+    )
+    # Untraced: fragment reruns happen after this rerun's tracer has finished
+    st.plotly_chart(fig_projection, use_container_width=True)
+
+def render_financial_projections():
+    """Render the Financial Projections tab (fact_subscription_metrics baselines)"""
     st.markdown('<div class="projection-card">', unsafe_allow_html=True)
     st.subheader("📊 Financial Projections")
     
-    if selected_hub != "All Hubs" and selected_tier != "All Tiers":
-        # Interactive controls for financial modeling
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            price_change = st.slider("Price Change (%)", -50, 100, 0, 5)
-            customer_growth = st.slider("Annual Customer Growth (%)", -30, 200, 20, 5)
-        
-        with col2:
-            churn_adjustment = st.slider("Churn Rate Adjustment (%)", -50, 100, 0, 5)
-            cac_adjustment = st.slider("CAC Adjustment (%)", -50, 100, 0, 5)
-        
-        # Display projection metrics (simplified example)
-        st.markdown("#### 📊 12-Month Projections")
-        
-        # Sample calculation for demonstration
-        base_mrr = 50000
-        projected_mrr = base_mrr * (1 + price_change/100) * (1 + customer_growth/100/12)
-        
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            create_ios_metric_card("PROJECTED MRR", f"${projected_mrr:,.0f}",
-                                 f"12-month target",
-                                 "135deg, #00b894 0%, #00a085 100%")
-        with col2:
-            arr_projection = projected_mrr * 12
-            create_ios_metric_card("PROJECTED ARR", f"${arr_projection:,.0f}",
-                                 "Annual projection",
-                                 "135deg, #74b9ff 0%, #0984e3 100%")
-        with col3:
-            revenue_impact = ((projected_mrr - base_mrr) / base_mrr) * 100
-            create_ios_metric_card("REVENUE IMPACT", f"{revenue_impact:+.1f}%",
-                                 "vs current baseline",
-                                 "135deg, #fdcb6e 0%, #e17055 100%")
+    baseline = get_projection_baseline(PRODUCT_FILTERS['hub'], PRODUCT_FILTERS['tier'], DATA_VERSION)
+    if baseline is not None:
+        st.caption(f"Baseline for {selected_hub} / {selected_tier}: MRR ${baseline['mrr']:,.0f} · "
+                   f"{baseline['active_subscriptions']:,.0f} active subscriptions · ARPU ${baseline['arpu']:,.2f} · "
+                   f"monthly churn {baseline['monthly_churn']:.1%}. Bands span {N_PATHS:,} simulated paths.")
+        render_projection_scenarios(baseline)
     else:
-        st.info("Please select both a Hub and Tier to view financial projections.")
+        st.info("No active subscriptions found for the current Hub and Tier selection to project from.")
     
     st.markdown('</div>', unsafe_allow_html=True)
 
 # --- Tab 8: Recommendations ---
-with tabs[7]:
+CHURN_TRANSITION_DAYS = 30
+
+@st.cache_data
+def get_churn_transitions(transitions_version):
+    """Risk transitions logged by the incremental churn-risk stage over the last month"""
+    since = (pd.Timestamp.today() - pd.Timedelta(days=CHURN_TRANSITION_DAYS)).date()
+    return churn_risk.load_transitions(churn_risk.CHURN_RISK_DIR, since=since)
+
+def render_churn_transitions(transitions):
+    """Transition matrix and latest escalations from the churn-risk change log"""
+    st.markdown("#### 🔀 Churn Risk Transitions")
+    if transitions.empty:
+        st.info(f"No churn-risk transitions logged in the last {CHURN_TRANSITION_DAYS} days. "
+                f"The DAG writes them to {churn_risk.CHURN_RISK_DIR}.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        matrix = churn_risk.transition_matrix(transitions)
+        fig_transitions = px.imshow(matrix, text_auto=True, color_continuous_scale='Reds',
+                                    labels=dict(x="To", y="From", color="Customers"),
+                                    title=f"Risk Changes, Last {CHURN_TRANSITION_DAYS} Days")
+        fig_transitions.update_layout(height=350)
+        st.plotly_chart(fig_transitions, use_container_width=True)
+    with col2:
+        daily = transitions.groupby(['as_of', 'churn_risk']).size().reset_index(name='customers')
+        fig_daily = px.bar(daily, x='as_of', y='customers', color='churn_risk',
+                           color_discrete_map={'LOW': '#00b894', 'MEDIUM': '#fdcb6e', 'HIGH': '#e84393'},
+                           title="Transitions per Run by New Risk Level")
+        fig_daily.update_layout(height=350)
+        st.plotly_chart(fig_daily, use_container_width=True)
+
+    latest = transitions[transitions['as_of'] == transitions['as_of'].max()]
+    escalations = latest[latest['churn_risk'] == 'HIGH'].sort_values('health_score')
+    st.caption(f"Customers newly at HIGH risk on {latest['as_of'].max():%Y-%m-%d}")
+    st.dataframe(escalations[['customer_id', 'previous_risk', 'churn_risk', 'reason', 'days_since_activity',
+                              'health_score', 'satisfaction_score']].round(1), hide_index=True)
+
+def render_recommendations():
+    """Render the Recommendations tab (mart_executive_daily)"""
     st.markdown('<div class="ios-card">', unsafe_allow_html=True)
     st.subheader("🧠 Data-Driven Strategic Recommendations")
     
@@ -1180,8 +1124,8 @@ with tabs[7]:
     recommendations = []
     
     # Executive summary insights
-    if not data_marts['mart_executive_summary'].empty:
-        exec_summary = data_marts['mart_executive_summary'].iloc[0]
+    if not data_marts['mart_executive_daily'].empty:
+        exec_summary = get_executive_kpis(DATA_VERSION, datetime.now().date()).iloc[0]
         
         if exec_summary['mrr_growth_mom_pct'] < 3:
             recommendations.append(("⚠️ Growth Acceleration Needed", 
@@ -1191,6 +1135,16 @@ with tabs[7]:
             recommendations.append(("🚨 Churn Risk Management", 
                                    f"{exec_summary['total_high_risk_customers']} high-risk customers need immediate attention. Implement proactive retention programs."))
     
+    # Recent risk escalations from the incremental churn-risk stage
+    churn_transitions = get_churn_transitions(churn_risk.transitions_version())
+    if not churn_transitions.empty:
+        latest = churn_transitions[churn_transitions['as_of'] == churn_transitions['as_of'].max()]
+        escalated = latest[latest['churn_risk'] == 'HIGH']
+        if len(escalated):
+            recommendations.append(("📉 Rising Churn Risk",
+                                   f"{len(escalated)} customers moved to HIGH churn risk on {latest['as_of'].max():%b %d}, "
+                                   f"{(escalated['reason'] == 'elapsed').sum()} of them from inactivity alone. Prioritize them for retention outreach."))
+    
     # Display recommendations
     color_gradients = [
         "135deg, #667eea 0%, #764ba2 100%",
@@ -1209,6 +1163,8 @@ with tabs[7]:
         </div>
         """, unsafe_allow_html=True)
     
+    render_churn_transitions(churn_transitions)
+    
     # Strategic Action Plan
     st.markdown(f"""
     <div style="background: linear-gradient(135deg, #2d3436 0%, #636e72 100%); border-radius: 12px; padding: 20px; color: white; margin: 16px 0;">
@@ -1240,6 +1196,36 @@ with tabs[7]:
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+# --- Section Navigation ---
+# Section label -> (trace span, render function); only the open section is rendered
+SECTIONS = {
+    "📊 Executive Summary": ('tab.executive', render_executive_summary),
+    "💵 Customer Analytics": ('tab.customer_analytics', render_customer_analytics),
+    "🔄 Funnel Analysis": ('tab.funnel', render_funnel_analysis),
+    "📈 Subscription Metrics": ('tab.subscription_metrics', render_subscription_metrics),
+    "💰 LTV Analysis": ('tab.ltv', render_ltv_analysis),
+    "🎯 Pricing Strategy": ('tab.pricing', render_pricing_strategy),
+    "📊 Financial Projections": ('tab.projections', render_financial_projections),
+    "🧠 Recommendations": ('tab.recommendations', render_recommendations),
+}
+
+def render_active_section(sections):
+    """Render only the selected section: lazy tabs where Streamlit supports them, a radio otherwise"""
+    labels = list(sections)
+    if 'on_change' in inspect.signature(st.tabs).parameters:
+        for label, tab in zip(labels, st.tabs(labels, key='active_section', on_change='rerun')):
+            if tab.open:
+                span_name, render = sections[label]
+                with tab, tracer.span(span_name):
+                    render()
+    else:
+        active = st.radio("Section", labels, horizontal=True, key='active_section', label_visibility='collapsed')
+        span_name, render = sections[active]
+        with tracer.span(span_name):
+            render()
+
+render_active_section(SECTIONS)
+
 # --- Footer ---
 st.markdown("---")
 st.markdown("""
@@ -1248,3 +1234,84 @@ st.markdown("""
     <p>Following dbt data modeling best practices for scalable analytics</p>
 </div>
 """, unsafe_allow_html=True)
+
+# --- SQL Fallback Notice ---
+# After the section renders, so it covers every mart this rerun loaded
+sql_errors = dict(get_mart_manager().sql_errors)
+if sql_errors:
+    with st.sidebar.expander(f"⚠️ Synthetic data for {len(sql_errors)} mart(s)"):
+        for mart_name, error in sorted(sql_errors.items()):
+            st.caption(f"**{mart_name}**: mart SQL could not run ({error})")
+
+# --- Mart Memory Panel ---
+# Opt-in because the report needs every mart loaded
+if st.sidebar.checkbox("🧮 Show mart memory footprint", value=False):
+    with st.sidebar.expander("🧮 Mart Memory Footprint", expanded=True):
+        mart_memory = get_memory_report(DATA_VERSION)
+        st.dataframe(mart_memory, hide_index=True)
+        st.caption(f"Total: {mart_memory['memory_mb'].sum():,.1f} MB per dashboard replica")
+        if MART_STORE is not None:
+            store_stats = MART_STORE.stats()
+            st.caption(f"Shared by all sessions: {store_stats['mapped_mb'].sum():,.1f} MB memory-mapped, "
+                       f"{int(store_stats['hits'].sum()):,} mart reads from {int(store_stats['loads'].sum()):,} loads")
+
+# --- Pipeline Performance Panel ---
+@st.cache_data
+def get_pipeline_history(db_mtime):
+    """dbt model timing history, reloaded whenever the DAG appends to it"""
+    return load_history(PERF_DB)
+
+if st.sidebar.checkbox("🛠️ Show pipeline performance", value=False):
+    with st.sidebar.expander("🛠️ Pipeline Performance", expanded=True):
+        pipeline_history = get_pipeline_history(PERF_DB.stat().st_mtime_ns if PERF_DB.exists() else None)
+        if pipeline_history.empty:
+            st.info(f"No dbt run history yet. The DAG records it to {PERF_DB}.")
+        else:
+            latest_runs = latest_run_summary(pipeline_history)
+            regressions = latest_runs[latest_runs['is_regression'].astype(bool)]
+            if len(regressions):
+                st.warning(f"⚠️ Slower than baseline: {', '.join(regressions['model'])}")
+            st.dataframe(latest_runs[['model', 'status', 'execution_time', 'baseline_seconds', 'rows_affected']].round(1),
+                         hide_index=True)
+            slowest = latest_runs['model'].head(5)
+            fig_pipeline = px.line(pipeline_history[pipeline_history['model'].isin(slowest)],
+                                   x='generated_at', y='execution_time', color='model',
+                                   title='Slowest Models Over Time (s)')
+            fig_pipeline.update_layout(height=300, showlegend=False, margin=dict(l=0, r=0, t=40, b=0))
+            st.plotly_chart(fig_pipeline, use_container_width=True)
+            st.caption(f"Latest run {latest_runs['generated_at'].max():%Y-%m-%d %H:%M} · "
+                       f"{pipeline_history['invocation_id'].nunique()} dbt invocations recorded")
+
+# --- Data Quality Panel ---
+@st.cache_data
+def get_quality_scores(scores_version):
+    """Per-table scores from the partition profiler, reloaded after each profiling run"""
+    return dq_profiler.load_scores(dq_profiler.PROFILE_DIR)
+
+@st.cache_data
+def get_business_rule_checks(data_version):
+    """data_quality_metrics business rules over the loaded marts, once per data version"""
+    return dq_profiler.business_rules(data_marts['dim_customers'], data_marts['fact_subscription_metrics'])
+
+if st.sidebar.checkbox("🩺 Show data quality", value=False):
+    with st.sidebar.expander("🩺 Data Quality", expanded=True):
+        quality_scores = get_quality_scores(dq_profiler.scores_version(dq_profiler.PROFILE_DIR))
+        quality = pd.concat([quality_scores[dq_profiler.SCORE_COLUMNS], get_business_rule_checks(DATA_VERSION)],
+                            ignore_index=True)
+        failing = quality[quality['uniqueness_check'] == 'FAIL']
+        if len(failing):
+            st.warning(f"⚠️ Failing checks: {', '.join(failing['table_name'])}")
+        st.dataframe(quality[['table_name', 'data_quality_score', 'uniqueness_check', 'flagged_records', 'total_records']]
+                     .round(1), hide_index=True)
+        if quality_scores.empty:
+            st.info(f"No partition profiles yet. The DAG writes them to {dq_profiler.PROFILE_DIR}.")
+        else:
+            st.caption(f"Raw partitions profiled {quality_scores['last_checked'].max():%Y-%m-%d %H:%M} · "
+                       f"{int(quality_scores['partitions'].sum()):,} partitions")
+
+# --- Timing Panel ---
+trace_history = record_rerun(st.session_state.setdefault('trace_history', []), tracer.finish())
+if st.sidebar.checkbox("⏱️ Show timing panel", value=False):
+    with st.sidebar.expander("⏱️ Rerun Timings", expanded=True):
+        st.dataframe(summarize(trace_history).round(1), hide_index=True)
+        st.caption(f"Over the last {len(trace_history)} reruns of this session (ms)")
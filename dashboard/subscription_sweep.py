@@ -0,0 +1,212 @@
+"""Daily subscription metrics computed with a sorted-event sweep instead of a row-per-day join.
+
+Every subscription contributes a start event (+1 subscription, +MRR) and, once it
+ends, a close event (-1, -MRR). Binning the events per group and day and taking
+``np.cumsum`` along the days yields the active subscriptions and MRR for every
+day at once, with the same semantics as ``fact_subscription_metrics.sql``::
+
+    python dashboard/subscription_sweep.py --source data/usage_data.csv --out data/subscription_metrics.parquet
+"""
+
+from datetime import date
+from pathlib import Path
+import argparse
+
+import numpy as np
+import pandas as pd
+
+
+GROUP_COLUMNS = ['hub', 'tier']
+# Output grain of fact_subscription_metrics.sql, used for SQL parity checks
+SQL_GRAIN = ['hub', 'tier', 'industry', 'company_size', 'country']
+DEFAULT_START_DATE = '2023-01-01'  # Same default as var('start_date') in the dbt model
+
+METRIC_COLUMNS = [
+    'active_subscriptions', 'new_subscriptions', 'churned_subscriptions', 'active_customers',
+    'total_mrr', 'new_mrr', 'churned_mrr', 'net_new_mrr',
+    'mrr_growth_30d_pct', 'subscription_growth_7d_pct',
+    'daily_churn_rate_pct', 'revenue_retention_30d_pct',
+    'arpu', 'avg_new_subscription_value',
+]
+
+
+def load_usage_subscriptions(path=Path("data/usage_data.csv")):
+    """One subscription per ``usage_data.csv`` customer: signup to signup + months_active if churned"""
+    usage = pd.read_csv(path)
+    start = pd.to_datetime(usage['signup_date'], errors='coerce')
+    months = pd.to_numeric(usage['months_active'], errors='coerce').fillna(0).astype(int)
+    churned = usage['churned'].astype(str).str.lower().isin(['true', '1'])
+
+    # Calendar month arithmetic, clipping the day to the target month's length (Jan 31 + 1 month = Feb 28)
+    total_months = start.dt.year * 12 + (start.dt.month - 1) + months
+    month_start = pd.to_datetime(pd.DataFrame({'year': total_months // 12, 'month': total_months % 12 + 1, 'day': 1}),
+                                 errors='coerce')
+    day = np.minimum(start.dt.day, month_start.dt.days_in_month)
+    end = month_start + pd.to_timedelta(day - 1, unit='D')
+
+    return pd.DataFrame({
+        'subscription_id': np.arange(len(usage)),
+        'customer_id': usage['customer_id'],
+        'hub': usage['hub'],
+        'tier': usage['tier'],
+        'country': usage['country'],
+        'monthly_revenue': pd.to_numeric(usage['monthly_recurring_revenue'], errors='coerce').fillna(0.0),
+        'subscription_start_date': start,
+        'subscription_end_date': end.where(churned),
+    })
+
+
+def _day_index(dates, start_date):
+    """Days since ``start_date`` as float (NaN for missing dates)"""
+    dates = pd.to_datetime(dates, errors='coerce')
+    return ((dates - start_date) / pd.Timedelta(days=1)).to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _binned(group_codes, day_index, n_groups, n_days, weights=None):
+    """Sum events into a (group, day) matrix; events at or past ``n_days`` are dropped"""
+    keep = day_index < n_days
+    flat = group_codes[keep] * n_days + day_index[keep].astype(np.int64)
+    counts = np.bincount(flat, weights=None if weights is None else weights[keep], minlength=n_groups * n_days)
+    return counts.reshape(n_groups, n_days)
+
+
+def _customer_deltas(pair_codes, group_codes, day_index, deltas, n_groups, n_days):
+    """+1 when a customer's active subscriptions in a group go 0 -> n, -1 on n -> 0"""
+    if len(pair_codes) == 0:
+        return np.zeros((n_groups, n_days))
+    keys = pair_codes * (n_days + 1) + day_index
+    # Sorted keys order events by (customer, group) pair, then day
+    unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    day_delta = np.bincount(inverse, weights=deltas)
+    pairs = pair_codes[first]
+
+    running = np.cumsum(day_delta)
+    segment_start = np.r_[True, pairs[1:] != pairs[:-1]]
+    # Subtract the running total carried over from the previous (customer, group) pair
+    offsets = np.maximum.accumulate(np.where(segment_start, np.arange(len(pairs)), 0))
+    carried = running[offsets] - day_delta[offsets]
+    running = running - carried
+    previous = running - day_delta
+
+    customer_delta = (((previous <= 0) & (running > 0)).astype(np.int64)
+                      - ((previous > 0) & (running <= 0)).astype(np.int64))
+    return _binned(group_codes[first], (unique_keys % (n_days + 1)).astype('float64'), n_groups, n_days,
+                   weights=customer_delta.astype('float64'))
+
+
+def _lag(matrix, periods):
+    lagged = np.full(matrix.shape, np.nan)
+    lagged[:, periods:] = matrix[:, :-periods]
+    return lagged
+
+
+def _safe_ratio(numerator, denominator, default):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = numerator / denominator
+    return np.where(denominator > 0, ratio, default)
+
+
+def sweep_subscription_metrics(subscriptions, group_columns=GROUP_COLUMNS, start_date=DEFAULT_START_DATE, end_date=None):
+    """Daily ``fact_subscription_metrics`` columns for every group from start/end records
+
+    ``subscriptions`` needs ``customer_id``, ``monthly_revenue``, ``subscription_start_date``,
+    ``subscription_end_date`` (NaT while active) and the ``group_columns``. Missing
+    dimension values are reported as ``'UNKNOWN'``, as in the dbt model.
+    """
+    start_date = pd.Timestamp(start_date)
+    end_date = pd.Timestamp(end_date or date.today())
+    n_days = (end_date - start_date).days + 1
+
+    subscriptions = subscriptions[subscriptions['customer_id'].notna()
+                                  & subscriptions['subscription_start_date'].notna()]
+    dimensions = pd.DataFrame({
+        column: (subscriptions[column] if column in subscriptions.columns else pd.Series(index=subscriptions.index, dtype=object))
+        .astype(object).where(lambda s: s.notna(), 'UNKNOWN')
+        for column in group_columns
+    })
+    group_codes, groups = pd.MultiIndex.from_frame(dimensions).factorize()
+    group_codes = group_codes.astype(np.int64)
+    n_groups = len(groups)
+
+    mrr = pd.to_numeric(subscriptions['monthly_revenue'], errors='coerce').to_numpy(dtype='float64', na_value=0.0)
+    start = _day_index(subscriptions['subscription_start_date'], start_date)
+    end = _day_index(subscriptions['subscription_end_date'], start_date)
+    ended = ~np.isnan(end)
+
+    # Activity before the reporting start folds into its first day; end-before-start rows are never active
+    open_day = np.maximum(start, 0)
+    close_day = np.maximum(np.fmax(end, start), 0)[ended]
+    event_groups = np.concatenate([group_codes, group_codes[ended]])
+    event_days = np.concatenate([open_day, close_day])
+    event_deltas = np.concatenate([np.ones(len(start)), -np.ones(int(ended.sum()))])
+    event_mrr = np.concatenate([mrr, -mrr[ended]])
+
+    active = np.cumsum(_binned(event_groups, event_days, n_groups, n_days, event_deltas), axis=1)
+    total_mrr = np.cumsum(_binned(event_groups, event_days, n_groups, n_days, event_mrr), axis=1)
+
+    # New and churn counts only land on their exact day inside the reporting window
+    new_rows = start >= 0
+    churn_rows = ended & (np.nan_to_num(end, nan=-1) >= 0)
+    new_subs = _binned(group_codes[new_rows], start[new_rows], n_groups, n_days)
+    new_mrr = _binned(group_codes[new_rows], start[new_rows], n_groups, n_days, mrr[new_rows])
+    churned_subs = _binned(group_codes[churn_rows], end[churn_rows], n_groups, n_days)
+    churned_mrr = _binned(group_codes[churn_rows], end[churn_rows], n_groups, n_days, mrr[churn_rows])
+
+    customer_codes = pd.factorize(subscriptions['customer_id'])[0].astype(np.int64)
+    pair_codes = customer_codes * n_groups + group_codes
+    in_window = event_days < n_days
+    active_customers = np.cumsum(_customer_deltas(
+        np.concatenate([pair_codes, pair_codes[ended]])[in_window],
+        event_groups[in_window], event_days[in_window].astype(np.int64), event_deltas[in_window],
+        n_groups, n_days,
+    ), axis=1)
+
+    mrr_30 = _lag(total_mrr, 30)
+    subs_7 = _lag(active, 7)
+    subs_1 = _lag(active, 1)
+    metrics = {
+        'active_subscriptions': active,
+        'new_subscriptions': new_subs,
+        'churned_subscriptions': churned_subs,
+        'active_customers': active_customers,
+        'total_mrr': total_mrr,
+        'new_mrr': new_mrr,
+        'churned_mrr': churned_mrr,
+        'net_new_mrr': new_mrr - churned_mrr,
+        'mrr_growth_30d_pct': _safe_ratio(total_mrr - mrr_30, mrr_30, 0.0) * 100,
+        'subscription_growth_7d_pct': _safe_ratio(active - subs_7, subs_7, 0.0) * 100,
+        'daily_churn_rate_pct': _safe_ratio(churned_subs, subs_1, 0.0) * 100,
+        'revenue_retention_30d_pct': _safe_ratio(total_mrr, mrr_30, 1.0) * 100,
+        'arpu': _safe_ratio(total_mrr, active_customers, 0.0),
+        'avg_new_subscription_value': _safe_ratio(new_mrr, new_subs, 0.0),
+    }
+
+    # Day-major layout: every group for day 0, then every group for day 1, ...
+    result = pd.DataFrame({
+        'metric_date': np.repeat(pd.date_range(start_date, periods=n_days, freq='D'), n_groups),
+        **{column: np.tile(groups.get_level_values(i), n_days) for i, column in enumerate(group_columns)},
+    })
+    for column, matrix in metrics.items():
+        result[column] = matrix.T.reshape(-1)
+    for column in ['active_subscriptions', 'new_subscriptions', 'churned_subscriptions', 'active_customers']:
+        result[column] = result[column].round().astype(np.int64)
+    return result[result['total_mrr'] >= 0].reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daily subscription metrics via an event sweep")
+    parser.add_argument("--source", type=Path, default=Path("data/usage_data.csv"), help="usage_data.csv-shaped input")
+    parser.add_argument("--out", type=Path, help="Write the metrics to this Parquet file")
+    parser.add_argument("--start-date", default=DEFAULT_START_DATE)
+    args = parser.parse_args()
+
+    subscriptions = load_usage_subscriptions(args.source)
+    metrics = sweep_subscription_metrics(subscriptions, start_date=args.start_date)
+    print(f"{len(subscriptions):,} subscriptions -> {len(metrics):,} daily hub/tier rows")
+    if args.out:
+        metrics.to_parquet(args.out, index=False)
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
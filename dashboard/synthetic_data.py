@@ -0,0 +1,300 @@
+"""Vectorized, seeded synthetic data for the dashboard marts at any scale factor.
+
+Customers are generated in fixed-size chunks with NumPy; LTV facts are derived
+from the same chunk so every ``customer_id`` and ``current_mrr`` lines up, and the
+daily subscription facts, product dimension, executive rollup and summary are built
+from per hub/tier aggregates of those customers. Large runs stream straight to
+Parquet so memory stays bounded by ``chunk_size``::
+
+    python dashboard/synthetic_data.py --customers 10000000 --out data/synthetic
+"""
+
+from datetime import datetime
+from pathlib import Path
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from executive_rollup import daily_rollup, executive_kpis, pricing_snapshot
+
+
+HUBS = np.array(['CMS', 'CRM', 'Marketing', 'Analytics', 'Sales'])
+TIERS = np.array(['Starter', 'Professional', 'Enterprise'])
+SEGMENTS = np.array(['CHAMPION', 'LOYAL', 'POTENTIAL_LOYAL', 'NEW_CUSTOMER', 'PROMISING', 'AT_RISK', 'HIBERNATING'])
+INDUSTRIES = np.array(['Technology', 'Healthcare', 'Finance', 'Retail', 'Manufacturing', 'Education'])
+COMPANY_SIZES = np.array(['Small', 'Medium', 'Large', 'Enterprise'])
+COUNTRIES = np.array(['United States', 'Canada', 'United Kingdom', 'Germany', 'France', 'Australia', 'Japan', 'Brazil', 'India', 'Mexico'])
+STATES = np.array(['California', 'Texas', 'New York', 'Florida', 'Illinois', 'Pennsylvania', 'Ohio', 'Washington', 'North Carolina', 'Georgia'])
+CHURN_RISKS = np.array(['LOW', 'MEDIUM', 'HIGH'])
+RECOMMENDATIONS = np.array(['IMPLEMENT_IMMEDIATELY', 'TEST_RECOMMENDED', 'CAREFUL_TESTING', 'MONITOR', 'AVOID'])
+
+# Monthly revenue band per tier, indexed like TIERS
+TIER_MRR_BANDS = np.array([[50, 150], [150, 350], [350, 500]])
+# Same thresholds as the ltv_segment CASE in fact_customer_ltv.sql
+LTV_SEGMENT_BINS = np.array([500, 2000, 5000, 10000])
+LTV_SEGMENT_LABELS = np.array(['VERY_LOW', 'LOW', 'MEDIUM', 'HIGH', 'VERY_HIGH'])
+
+N_GROUPS = len(HUBS) * len(TIERS)
+PRICING_SCENARIOS = 5
+
+
+class SyntheticMartGenerator:
+    """Generates referentially consistent marts for ``n_customers`` customers
+
+    Output is deterministic for a given ``seed`` and ``chunk_size``.
+    """
+
+    def __init__(self, n_customers=1000, seed=42, chunk_size=1_000_000, n_days=90, end_date=None):
+        self.n_customers = int(n_customers)
+        self.seed = seed
+        self.chunk_size = int(chunk_size)
+        self.n_days = int(n_days)
+        self.end_date = pd.Timestamp(end_date or datetime.now().date())
+        self.id_width = max(4, len(str(max(self.n_customers - 1, 0))))
+
+    def _rng(self, *stream):
+        return np.random.default_rng([self.seed, *stream])
+
+    # --- Customer-grain marts ---
+    def _customer_chunk(self, start, stop):
+        """Build dim_customers and fact_customer_ltv rows for customer ids [start, stop)"""
+        rng = self._rng(0, start)
+        n = stop - start
+
+        hub_idx = rng.integers(0, len(HUBS), n)
+        tier_idx = rng.integers(0, len(TIERS), n)
+        country = COUNTRIES[rng.integers(0, len(COUNTRIES), n)]
+        state = np.where(country == 'United States', STATES[rng.integers(0, len(STATES), n)], None)
+
+        band = TIER_MRR_BANDS[tier_idx]
+        current_mrr = rng.uniform(band[:, 0], band[:, 1])
+        tenure = rng.integers(1, 36, n)
+        health = rng.uniform(10, 100, n)
+
+        customer_ids = pd.Series(np.arange(start, stop)).astype(str).str.zfill(self.id_width).radd('CUST_')
+
+        customers = pd.DataFrame({
+            'customer_id': customer_ids,
+            'hub': HUBS[hub_idx],
+            'tier': TIERS[tier_idx],
+            'industry': INDUSTRIES[rng.integers(0, len(INDUSTRIES), n)],
+            'company_size': COMPANY_SIZES[rng.integers(0, len(COMPANY_SIZES), n)],
+            'country': country,
+            'state': state,
+            'customer_segment': SEGMENTS[rng.integers(0, len(SEGMENTS), n)],
+            'estimated_ltv': current_mrr * tenure * (health / 100.0) * 1.2,
+            'churn_risk': CHURN_RISKS[rng.integers(0, len(CHURN_RISKS), n)],
+            'customer_health_score': health,
+            'current_mrr': current_mrr,
+            'months_since_first_subscription': tenure,
+            'total_subscriptions': rng.integers(1, 5, n),
+            'active_subscriptions': rng.integers(1, 3, n),
+        })
+
+        historical_revenue = current_mrr * tenure * rng.uniform(0.8, 1.0, n)
+        support_cost = rng.uniform(25, 600, n)
+        predicted_ltv = current_mrr * np.maximum(tenure, 1) * rng.uniform(0.8, 1.6, n)
+        ltv = pd.DataFrame({
+            'customer_id': customer_ids,
+            'industry': customers['industry'],
+            'company_size': customers['company_size'],
+            'country': country,
+            'predicted_ltv': predicted_ltv,
+            'total_historical_revenue': historical_revenue,
+            'current_mrr': current_mrr,
+            'ltv_segment': LTV_SEGMENT_LABELS[np.searchsorted(LTV_SEGMENT_BINS, predicted_ltv, side='right')],
+            'customer_roi_pct': (historical_revenue - support_cost) / support_cost * 100,
+            'payback_period_months': support_cost / current_mrr,
+        })
+
+        group_idx = hub_idx * len(TIERS) + tier_idx
+        stats = {
+            'customers': np.bincount(group_idx, minlength=N_GROUPS),
+            'mrr': np.bincount(group_idx, weights=current_mrr, minlength=N_GROUPS),
+            'champion_customers': int((customers['customer_segment'] == 'CHAMPION').sum()),
+            'champion_mrr': float(current_mrr[customers['customer_segment'].to_numpy() == 'CHAMPION'].sum()),
+            'high_risk_customers': int((customers['churn_risk'] == 'HIGH').sum()),
+        }
+        return customers, ltv, stats
+
+    def iter_customer_chunks(self):
+        """Yield (dim_customers, fact_customer_ltv, group_stats) one chunk at a time"""
+        for start in range(0, self.n_customers, self.chunk_size):
+            yield self._customer_chunk(start, min(start + self.chunk_size, self.n_customers))
+
+    @staticmethod
+    def _merge_stats(total, stats):
+        if total is None:
+            return dict(stats)
+        return {key: total[key] + value for key, value in stats.items()}
+
+    # --- Aggregate marts ---
+    def _group_frame(self):
+        hub_idx, tier_idx = np.divmod(np.arange(N_GROUPS), len(TIERS))
+        return HUBS[hub_idx], TIERS[tier_idx]
+
+    def subscription_facts(self, stats):
+        """Daily hub/tier metrics whose final active count and MRR match the customers"""
+        rng = self._rng(1)
+        hubs, tiers = self._group_frame()
+        final_active = stats['customers'].astype(float)
+        arpu = np.divide(stats['mrr'], final_active, out=np.zeros(N_GROUPS), where=final_active > 0)
+
+        new = rng.poisson(final_active * 0.004, (self.n_days, N_GROUPS))
+        churned = rng.poisson(final_active * 0.003, (self.n_days, N_GROUPS))
+        # Walk backwards from today's active base so the last day equals the customer count
+        net = np.cumsum(new - churned, axis=0)
+        active = np.maximum(final_active - (net[-1] - net), 0)
+        previous_active = np.vstack([active[:1], active[:-1]])
+
+        dates = pd.date_range(end=self.end_date, periods=self.n_days, freq='D').strftime('%Y-%m-%d')
+        return pd.DataFrame({
+            'metric_date': np.repeat(dates.to_numpy(), N_GROUPS),
+            'hub': np.tile(hubs, self.n_days),
+            'tier': np.tile(tiers, self.n_days),
+            'active_subscriptions': active.ravel().astype(np.int64),
+            'new_subscriptions': new.ravel(),
+            'churned_subscriptions': churned.ravel(),
+            'total_mrr': (active * arpu).ravel(),
+            'new_mrr': (new * arpu).ravel(),
+            'churned_mrr': (churned * arpu).ravel(),
+            'daily_churn_rate_pct': np.divide(churned, previous_active, out=np.zeros_like(active),
+                                              where=previous_active > 0).ravel() * 100,
+            'arpu': np.tile(arpu, self.n_days),
+        })
+
+    def product_dimension(self, stats):
+        rng = self._rng(2)
+        hubs, tiers = self._group_frame()
+        total = stats['customers']
+        retention = rng.uniform(0.85, 0.98, N_GROUPS)
+        return pd.DataFrame({
+            'hub': hubs,
+            'tier': tiers,
+            'product_full_name': np.char.add(np.char.add(hubs, ' - '), tiers),
+            'avg_monthly_revenue': np.divide(stats['mrr'], total, out=np.zeros(N_GROUPS), where=total > 0),
+            'total_subscribers': total,
+            'active_subscribers': np.round(total * retention).astype(np.int64),
+            'retention_rate': retention,
+        })
+
+    def pricing_facts(self, stats):
+        rng = self._rng(3)
+        hubs, tiers = self._group_frame()
+        scenario = np.tile(np.arange(PRICING_SCENARIOS), N_GROUPS)
+        group = np.repeat(np.arange(N_GROUPS), PRICING_SCENARIOS)
+
+        base_price = np.divide(stats['mrr'], stats['customers'], out=np.full(N_GROUPS, 100.0),
+                               where=stats['customers'] > 0)[group]
+        price_point = base_price * (0.8 + scenario * 0.1)
+        customer_change = rng.uniform(-30, 20, len(group))
+        potential_customers = np.maximum(stats['customers'][group] * (1 + customer_change / 100), 0).round()
+        revenue = potential_customers * price_point
+
+        # Rank scenarios by revenue within each product; scenario 2 is the current price
+        by_product = revenue.reshape(N_GROUPS, PRICING_SCENARIOS)
+        revenue_rank = np.argsort(np.argsort(-by_product, axis=1), axis=1).ravel() + 1
+        current_revenue = np.repeat(by_product[:, 2], PRICING_SCENARIOS)
+        revenue_change = np.divide(revenue - current_revenue, current_revenue,
+                                   out=np.zeros(len(group)), where=current_revenue > 0) * 100
+        is_optimal = revenue_rank == 1
+
+        return pd.DataFrame({
+            'hub': hubs[group],
+            'tier': tiers[group],
+            'price_point': price_point,
+            'current_avg_price': base_price,
+            'potential_monthly_revenue': revenue,
+            'potential_customers': potential_customers.astype(np.int64),
+            'revenue_change_pct': revenue_change,
+            'customer_change_pct': customer_change,
+            'optimal_price': np.where(is_optimal, price_point, np.nan),
+            'optimal_revenue_uplift_pct': np.where(is_optimal, revenue_change, np.nan),
+            'strategic_recommendation': RECOMMENDATIONS[rng.integers(0, len(RECOMMENDATIONS), len(group))],
+            'revenue_rank': revenue_rank,
+        })
+
+    def executive_daily(self, stats, subscription_facts, pricing_facts):
+        """mart_executive_daily rolled up from the generated facts, stamped with today's customer KPIs"""
+        snapshot = {
+            'champion_customers': stats['champion_customers'],
+            'champion_mrr': stats['champion_mrr'],
+            'total_high_risk_customers': stats['high_risk_customers'],
+            **pricing_snapshot(pricing_facts),
+        }
+        return daily_rollup(subscription_facts, snapshot)
+
+    def _aggregate_marts(self, stats):
+        subscription_facts = self.subscription_facts(stats)
+        pricing_facts = self.pricing_facts(stats)
+        executive_daily = self.executive_daily(stats, subscription_facts, pricing_facts)
+        return {
+            'dim_products': self.product_dimension(stats),
+            'fact_subscription_metrics': subscription_facts,
+            'fact_pricing_optimization': pricing_facts,
+            'mart_executive_daily': executive_daily,
+            'mart_executive_summary': executive_kpis(executive_daily, today=self.end_date),
+        }
+
+    # --- Outputs ---
+    def generate(self):
+        """Build all marts in memory; intended for small scale factors"""
+        customers, ltv, stats = [], [], None
+        for customer_chunk, ltv_chunk, chunk_stats in self.iter_customer_chunks():
+            customers.append(customer_chunk)
+            ltv.append(ltv_chunk)
+            stats = self._merge_stats(stats, chunk_stats)
+
+        marts = {
+            'dim_customers': pd.concat(customers, ignore_index=True),
+            'fact_customer_ltv': pd.concat(ltv, ignore_index=True),
+        }
+        marts.update(self._aggregate_marts(stats))
+        return marts
+
+    def write_parquet(self, out_dir):
+        """Stream all marts to ``<out_dir>/<mart>.parquet`` chunk by chunk"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        writers, stats = {}, None
+        try:
+            for customer_chunk, ltv_chunk, chunk_stats in self.iter_customer_chunks():
+                stats = self._merge_stats(stats, chunk_stats)
+                for mart_name, chunk in (('dim_customers', customer_chunk), ('fact_customer_ltv', ltv_chunk)):
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if mart_name not in writers:
+                        # A column can be entirely NULL in one chunk (e.g. state); the only such
+                        # columns are strings, so fix their type rather than inferring null
+                        schema = pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                                            for field in table.schema], metadata=table.schema.metadata)
+                        writers[mart_name] = pq.ParquetWriter(out_dir / f"{mart_name}.parquet", schema)
+                    writers[mart_name].write_table(table.cast(writers[mart_name].schema))
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        for mart_name, df in self._aggregate_marts(stats).items():
+            df.to_parquet(out_dir / f"{mart_name}.parquet", index=False)
+        return out_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic monetization marts as Parquet")
+    parser.add_argument("--customers", type=int, default=1000, help="Scale factor: number of customers (1k-50M)")
+    parser.add_argument("--out", type=Path, default=Path("data/synthetic"), help="Output directory")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=90, help="Days of subscription metrics")
+    args = parser.parse_args()
+
+    generator = SyntheticMartGenerator(args.customers, seed=args.seed, chunk_size=args.chunk_size, n_days=args.days)
+    out_dir = generator.write_parquet(args.out)
+    print(f"Wrote {args.customers:,} customers to {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Lightweight per-rerun timing spans emitted as structured JSON log lines."""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import json
+import logging
+import time
+import uuid
+
+import pandas as pd
+
+
+LOGGER_NAME = "hub_monetization.tracing"
+HISTORY_LIMIT = 200  # Reruns kept per session for the timing panel percentiles
+
+
+def get_trace_logger():
+    """Logger writing one bare JSON object per line, configured once per process"""
+    logger = logging.getLogger(LOGGER_NAME)
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class RerunTracer:
+    """Collects nested timing spans for one script rerun
+
+    Spans opened inside another span record it as their ``parent``, so time spent in
+    ``st.plotly_chart`` can be separated from the tab body that built the figure.
+    """
+
+    def __init__(self, session_id=None, logger=None):
+        self.session_id = session_id
+        self.rerun_id = uuid.uuid4().hex[:12]
+        self.logger = logger or get_trace_logger()
+        self.spans = []
+        self._stack = []
+        self._started = time.perf_counter()
+        self._finished = False
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Time the enclosed block; exceptions (including st.stop) are recorded and re-raised"""
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(name)
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException as e:
+            status = type(e).__name__
+            raise
+        finally:
+            self._stack.pop()
+            self.spans.append({
+                'name': name,
+                'parent': parent,
+                'start_ms': (start - self._started) * 1000,
+                'duration_ms': (time.perf_counter() - start) * 1000,
+                'status': status,
+                **attributes,
+            })
+
+    def finish(self):
+        """Close the rerun, log every span plus a rerun total, and return the records"""
+        if self._finished:
+            return self.spans
+        self._finished = True
+        total_ms = (time.perf_counter() - self._started) * 1000
+        timestamp = datetime.now(timezone.utc).isoformat()
+        for span in self.spans:
+            self.logger.info(json.dumps({
+                'event': 'dashboard_span', 'ts': timestamp,
+                'session_id': self.session_id, 'rerun_id': self.rerun_id, **span,
+            }, default=str))
+        self.logger.info(json.dumps({
+            'event': 'dashboard_rerun', 'ts': timestamp,
+            'session_id': self.session_id, 'rerun_id': self.rerun_id,
+            'duration_ms': total_ms, 'spans': len(self.spans),
+        }))
+        self.spans.append({'name': 'rerun', 'parent': None, 'start_ms': 0.0, 'duration_ms': total_ms, 'status': 'ok'})
+        return self.spans
+
+
+def record_rerun(history, spans, limit=HISTORY_LIMIT):
+    """Append one rerun's spans to a session history list, keeping the newest ``limit``"""
+    history.append(spans)
+    del history[:-limit]
+    return history
+
+
+def _span_key(span):
+    # Nested spans are keyed by parent so per-tab chart time stays separate
+    return f"{span['parent']} / {span['name']}" if span['parent'] else span['name']
+
+
+def summarize(history):
+    """Per-span rerun count, last duration and p50/p99 across the recorded reruns"""
+    rows = [
+        {'rerun': rerun, 'span': _span_key(span), 'duration_ms': span['duration_ms']}
+        for rerun, spans in enumerate(history) for span in spans
+    ]
+    if not rows:
+        return pd.DataFrame(columns=['span', 'reruns', 'last_ms', 'p50_ms', 'p99_ms'])
+
+    # Repeated spans within a rerun (e.g. several charts in one tab) add up
+    per_rerun = pd.DataFrame(rows).groupby(['rerun', 'span'], as_index=False)['duration_ms'].sum()
+    summary = per_rerun.groupby('span')['duration_ms'].agg(
+        reruns='count',
+        p50_ms=lambda d: d.quantile(0.5),
+        p99_ms=lambda d: d.quantile(0.99),
+    )
+    summary['last_ms'] = per_rerun[per_rerun['rerun'] == len(history) - 1].set_index('span')['duration_ms']
+    return summary.reset_index()[['span', 'reruns', 'last_ms', 'p50_ms', 'p99_ms']].sort_values(
+        'p50_ms', ascending=False, ignore_index=True)
@@ -0,0 +1,206 @@
+"""Streaming per-customer usage aggregates, equal to the SQL usage rollups, in bounded memory.
+
+``int_customer_metrics`` and ``fact_customer_ltv`` aggregate ``stg_usage_events`` per
+customer. For local and backfill runs, ``aggregate_usage`` reads the raw events in chunks
+(CSV chunks, Parquet row groups or a ``data/raw/usage_events/`` partition tree), applies the
+staging model's cleaning, and folds each chunk into running per-customer totals with
+``np.bincount``. Memory grows with the number of customers and distinct (customer, day)
+and (customer, feature) pairs, never with the number of events::
+
+    python dashboard/usage_aggregates.py --source data/raw/usage_events --out data/usage_aggregates.parquet
+"""
+
+from pathlib import Path
+import argparse
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Only needed for Parquet inputs; CSV streams without it
+    pq = None
+
+
+CHUNK_ROWS = 1_000_000
+USAGE_COLUMNS = [
+    'event_id', 'customer_id', 'subscription_id', 'event_date', 'session_duration_minutes',
+    'pages_viewed', 'api_calls', 'feature_used',
+]
+ENGAGEMENT_LEVELS = ['HIGH', 'MEDIUM', 'LOW', 'MINIMAL']
+DAY_BITS = 20  # (customer, day) pairs are packed as customer << DAY_BITS | day into one int64
+OUTPUT_COLUMNS = [
+    'customer_id', 'total_active_days', 'total_events', 'total_session_minutes', 'total_pages_viewed',
+    'total_api_calls', 'unique_features_used', 'avg_session_duration', 'last_activity_date',
+    'first_activity_date', 'high_engagement_sessions', 'medium_engagement_sessions',
+    'low_engagement_sessions', 'minimal_engagement_sessions', 'usage_value_score',
+]
+
+
+# --- Reading ---
+def iter_usage_chunks(source, chunk_rows=CHUNK_ROWS):
+    """Yield raw usage-event DataFrames of at most ``chunk_rows`` rows from a file or partition tree"""
+    source = Path(source)
+    paths = sorted(source.rglob("*.parquet")) if source.is_dir() else [source]
+    for path in paths:
+        if path.suffix == '.parquet':
+            if pq is None:
+                raise ImportError("pyarrow is required to stream Parquet usage events")
+            parquet_file = pq.ParquetFile(path)
+            columns = [column for column in USAGE_COLUMNS if column in parquet_file.schema_arrow.names]
+            for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+                yield batch.to_pandas()
+        else:
+            yield from pd.read_csv(path, usecols=lambda column: column in USAGE_COLUMNS, chunksize=chunk_rows)
+
+
+def clean_usage_chunk(chunk):
+    """The ``stg_usage_events`` filters, feature normalization and engagement level for one chunk"""
+    session = pd.to_numeric(chunk['session_duration_minutes'], errors='coerce')
+    pages = pd.to_numeric(chunk['pages_viewed'], errors='coerce')
+    api_calls = pd.to_numeric(chunk['api_calls'], errors='coerce')
+    event_date = pd.to_datetime(chunk['event_date'], errors='coerce').dt.normalize()
+    # NaN comparisons are False, so NULL measures are dropped like in the SQL WHERE clause
+    keep = (chunk['event_id'].notna() & chunk['customer_id'].notna() & event_date.notna()
+            & (session >= 0) & (pages >= 0) & (api_calls >= 0)).to_numpy()
+    session, pages, api_calls = session[keep], pages[keep], api_calls[keep]
+    engagement = np.select(
+        [(session >= 30) & (pages >= 10), (session >= 15) & (pages >= 5), (session >= 5) & (pages >= 2)],
+        ENGAGEMENT_LEVELS[:3], default='MINIMAL',
+    )
+    cleaned = pd.DataFrame({
+        'customer_id': chunk['customer_id'][keep].astype(str).to_numpy(),
+        'event_day': (event_date[keep].to_numpy().astype('datetime64[D]').astype('int64')),
+        'session_duration_minutes': session.to_numpy(dtype='float64'),
+        'pages_viewed': pages.to_numpy(dtype='float64'),
+        'api_calls': api_calls.to_numpy(dtype='float64'),
+        'feature_used': chunk['feature_used'][keep].str.strip().str.lower().to_numpy(),
+        'engagement_level': engagement,
+    })
+    if 'subscription_id' in chunk.columns:
+        cleaned['subscription_id'] = chunk['subscription_id'][keep].to_numpy()
+    return cleaned
+
+
+# --- Aggregation ---
+class UsageAggregator:
+    """Running per-customer usage totals, updated one cleaned chunk at a time"""
+
+    def __init__(self):
+        self.customers = pd.Index([], dtype=object)
+        self.features = pd.Index([], dtype=object)
+        self.sums = {}
+        self.first_day = np.empty(0, dtype='int64')
+        self.last_day = np.empty(0, dtype='int64')
+        # Sorted unique packed keys of the (customer, day) and (customer, feature) pairs seen so far
+        self.active_days = np.empty(0, dtype='int64')
+        self.customer_features = np.empty(0, dtype='int64')
+
+    @staticmethod
+    def _codes(index, values):
+        """Integer codes of ``values`` in a growing index, adding unseen values"""
+        # Look up each distinct value of the chunk once rather than every row
+        chunk_codes, uniques = pd.factorize(values)
+        codes = index.get_indexer(uniques)
+        unseen = codes < 0
+        if unseen.any():
+            codes[unseen] = np.arange(len(index), len(index) + unseen.sum())
+            index = index.append(pd.Index(uniques[unseen]))
+        return index, codes[chunk_codes]
+
+    @staticmethod
+    def _union(sorted_keys, keys):
+        """Sorted unique union of an already sorted unique array and new keys"""
+        keys = np.sort(keys)
+        merged = np.concatenate([sorted_keys, keys[np.concatenate([[True], keys[1:] != keys[:-1]])]])
+        merged.sort(kind='stable')  # Two sorted runs merge in linear time
+        return merged[np.concatenate([[True], merged[1:] != merged[:-1]])]
+
+    def _grow(self, n_customers):
+        grow = n_customers - len(self.first_day)
+        if grow <= 0:
+            return
+        for name, values in self.sums.items():
+            self.sums[name] = np.concatenate([values, np.zeros(grow)])
+        self.first_day = np.concatenate([self.first_day, np.full(grow, np.iinfo('int64').max)])
+        self.last_day = np.concatenate([self.last_day, np.full(grow, np.iinfo('int64').min)])
+
+    def update(self, chunk):
+        """Fold one ``clean_usage_chunk`` result into the totals"""
+        if chunk.empty:
+            return self
+        self.customers, codes = self._codes(self.customers, chunk['customer_id'].to_numpy())
+        n_customers = len(self.customers)
+        self._grow(n_customers)
+
+        engagement = chunk['engagement_level'].to_numpy()
+        chunk_sums = {
+            'total_events': np.ones(len(chunk)),
+            'total_session_minutes': chunk['session_duration_minutes'].to_numpy(),
+            'total_pages_viewed': chunk['pages_viewed'].to_numpy(),
+            'total_api_calls': chunk['api_calls'].to_numpy(),
+            **{f"{level.lower()}_engagement_sessions": (engagement == level).astype('float64')
+               for level in ENGAGEMENT_LEVELS},
+        }
+        for name, weights in chunk_sums.items():
+            totals = np.bincount(codes, weights=weights, minlength=n_customers)
+            self.sums[name] = self.sums.get(name, np.zeros(n_customers)) + totals
+
+        days = chunk['event_day'].to_numpy()
+        by_customer = pd.Series(days).groupby(codes).agg(['min', 'max'])
+        seen = by_customer.index.to_numpy()
+        self.first_day[seen] = np.minimum(self.first_day[seen], by_customer['min'].to_numpy())
+        self.last_day[seen] = np.maximum(self.last_day[seen], by_customer['max'].to_numpy())
+
+        self.active_days = self._union(self.active_days, (codes.astype('int64') << DAY_BITS) | days)
+        features = chunk['feature_used']
+        has_feature = features.notna().to_numpy()
+        self.features, feature_codes = self._codes(self.features, features[has_feature].to_numpy())
+        self.customer_features = self._union(
+            self.customer_features, (codes[has_feature].astype('int64') << 32) | feature_codes)
+        return self
+
+    def result(self):
+        """One row per customer with the ``int_customer_metrics`` usage columns and ``usage_value_score``"""
+        from ltv_scoring import usage_value_score
+
+        n_customers = len(self.customers)
+        result = pd.DataFrame({'customer_id': self.customers.to_numpy()})
+        result['total_active_days'] = np.bincount(self.active_days >> DAY_BITS, minlength=n_customers)
+        for name in ['total_events', 'total_pages_viewed', 'total_api_calls'] + [
+                f"{level.lower()}_engagement_sessions" for level in ENGAGEMENT_LEVELS]:
+            result[name] = self.sums.get(name, np.zeros(n_customers)).round().astype('int64')
+        result['total_session_minutes'] = self.sums.get('total_session_minutes', np.zeros(n_customers))
+        result['unique_features_used'] = np.bincount(self.customer_features >> 32, minlength=n_customers)
+        result['avg_session_duration'] = result['total_session_minutes'] / result['total_events']
+        result['last_activity_date'] = self.last_day.astype('datetime64[D]')
+        result['first_activity_date'] = self.first_day.astype('datetime64[D]')
+        result['usage_value_score'] = usage_value_score(result.rename(columns={'total_active_days': 'total_usage_days'}))
+        return result[OUTPUT_COLUMNS]
+
+
+def aggregate_usage(source, chunk_rows=CHUNK_ROWS):
+    """Stream a usage-event file or partition tree into per-customer aggregates"""
+    aggregator = UsageAggregator()
+    for chunk in iter_usage_chunks(source, chunk_rows):
+        aggregator.update(clean_usage_chunk(chunk))
+    return aggregator.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate usage events per customer in bounded memory")
+    parser.add_argument("--source", type=Path, required=True, help="Usage events CSV, Parquet file or partition directory")
+    parser.add_argument("--out", type=Path, default=None, help="Optional Parquet output")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    result = aggregate_usage(args.source, args.chunk_rows)
+    print(f"Aggregated usage for {len(result):,} customers from {args.source}")
+    if args.out:
+        result.to_parquet(args.out, index=False)
+    else:
+        print(result.head(10).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -58,15 +58,10 @@ SELECT
     unique_keys,
     CASE WHEN unique_keys = total_records THEN 'PASS' ELSE 'FAIL' END AS uniqueness_check, -- Checks if all keys are unique (expected for primary keys).
     -- Calculate data quality scores as a percentage (100 - % of flagged issues).
-    CASE 
-        WHEN table_name = 'customers' THEN 
-            100 - ((missing_email + missing_signup_date + missing_country)::FLOAT / total_records * 100)
-        WHEN table_name = 'subscriptions' THEN 
-            100 - ((invalid_revenue + invalid_dates + missing_customer_id)::FLOAT / total_records * 100)
-        WHEN table_name = 'usage_events' THEN 
-            100 - ((negative_duration + negative_pages + future_dates)::FLOAT / total_records * 100)
-        ELSE 100 -- Defaults to 100% if no specific quality checks are defined for a table or check.
-    END AS data_quality_score,
+    -- UNION ALL names the columns after the first (customers) branch, so for every table these are
+    -- its three flag counts: missing email/signup date/country, invalid revenue/dates/customer, and
+    -- negative duration/negative pages/future dates.
+    100 - ((missing_email + missing_signup_date + missing_country)::FLOAT / total_records * 100) AS data_quality_score,
     CURRENT_TIMESTAMP AS last_checked -- Timestamp of when the quality check was last performed.
 FROM source_quality
 UNION ALL -- Combines source data quality checks with business rule checks for a comprehensive view.
@@ -77,4 +72,4 @@ SELECT
     CASE WHEN failures = 0 THEN 'PASS' ELSE 'FAIL' END AS uniqueness_check, -- Indicates if the business rule check passed or failed.
     CASE WHEN total_checked > 0 THEN 100 - (failures::FLOAT / total_checked * 100) ELSE 100 END AS data_quality_score, -- Calculates quality score for business rules.
     CURRENT_TIMESTAMP AS last_checked
-FROM business_rule_checks STAGING MODELS
\ No newline at end of file
+FROM business_rule_checks
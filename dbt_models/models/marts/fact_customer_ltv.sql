@@ -79,6 +79,8 @@ ltv_calculation AS (
         COALESCE(u.total_usage_days, 0) AS total_usage_days,
         COALESCE(u.avg_session_duration, 0) AS avg_session_duration,
         COALESCE(u.unique_features_used, 0) AS unique_features_used,
+        COALESCE(u.total_pages_viewed, 0) AS total_pages_viewed,
+        COALESCE(u.total_api_calls, 0) AS total_api_calls,
         COALESCE(u.usage_value_score, 0) AS usage_value_score,
         -- Support metrics joined from `customer_support_cost`. COALESCE handles missing support data.
         COALESCE(sp.total_support_interactions, 0) AS total_support_interactions,
@@ -108,6 +110,10 @@ ltv_calculation AS (
     LEFT JOIN customer_usage_value u ON r.customer_id = u.customer_id
     LEFT JOIN customer_support_cost sp ON r.customer_id = sp.customer_id
     GROUP BY r.customer_id, r.industry, r.company_size, r.country -- Groups by customer and relevant dimensions.
+        -- Usage and support CTEs hold one row per customer, so grouping by their columns keeps the grain.
+        , u.total_usage_days, u.avg_session_duration, u.unique_features_used, u.total_pages_viewed, u.total_api_calls
+        , u.usage_value_score
+        , sp.total_support_interactions, sp.avg_satisfaction, sp.estimated_support_cost
 )
 SELECT
     -- Primary key
@@ -134,6 +140,8 @@ SELECT
     total_usage_days,
     avg_session_duration,
     unique_features_used,
+    total_pages_viewed, -- With the three columns above, the usage_value_score components (for what-if weights).
+    total_api_calls,
     usage_value_score,
     -- Support metrics contributing to LTV.
     total_support_interactions,
@@ -1,68 +1,230 @@
-{{ config(materialized='table') }} -- Configures this dbt model to be created as a SQL table.
+{{ config(materialized='incremental', unique_key='fact_key') }} -- Incremental table: daily runs only compute days after the latest metric_date already loaded.
 
-WITH daily_metrics AS (
+{%- set start_date = var('start_date', '2023-01-01') %}
+{%- set grain = ['hub', 'tier', 'industry', 'company_size', 'country'] %}
+
+WITH subscriptions AS (
     SELECT
-        DATE_TRUNC('day', d.date_day) AS metric_date, -- Metric aggregated by day.
-        s.hub,
-        s.tier,
-        c.industry,
-        c.company_size,
-        c.country,
-        -- Subscription metrics: Counts of active, new, and churned subscriptions on each day.
-        COUNT(DISTINCT CASE WHEN s.subscription_start_date <= d.date_day 
-                           AND (s.subscription_end_date > d.date_day OR s.subscription_end_date IS NULL) -- Checks if subscription is active on a given day.
-                           THEN s.subscription_id END) AS active_subscriptions,
-        COUNT(DISTINCT CASE WHEN s.subscription_start_date = d.date_day -- Counts subscriptions that started on this specific day.
-                           THEN s.subscription_id END) AS new_subscriptions,
-        COUNT(DISTINCT CASE WHEN s.subscription_end_date = d.date_day -- Counts subscriptions that ended (churned) on this specific day.
-                           THEN s.subscription_id END) AS churned_subscriptions,
-        -- Revenue metrics: Total, new, and churned MRR on each day.
-        SUM(CASE WHEN s.subscription_start_date <= d.date_day 
-                 AND (s.subscription_end_date > d.date_day OR s.subscription_end_date IS NULL) -- Checks if MRR contributes on a given day.
-                 THEN s.monthly_revenue ELSE 0 END) AS total_mrr,
-        SUM(CASE WHEN s.subscription_start_date = d.date_day -- MRR from new subscriptions on this day.
-                 THEN s.monthly_revenue ELSE 0 END) AS new_mrr,
-        SUM(CASE WHEN s.subscription_end_date = d.date_day -- MRR lost from churned subscriptions on this day.
-                 THEN s.monthly_revenue ELSE 0 END) AS churned_mrr,
-        -- Customer metrics: Count of active customers on each day.
-        COUNT(DISTINCT CASE WHEN s.subscription_start_date <= d.date_day 
-                           AND (s.subscription_end_date > d.date_day OR s.subscription_end_date IS NULL) -- Checks if customer is active on a given day.
-                           THEN s.customer_id END) AS active_customers
+        s.subscription_id,
+        s.customer_id,
+        -- Dimensions are coalesced so every subscription lands in exactly one group (NULLs never join).
+        COALESCE(s.hub, 'UNKNOWN') AS hub,
+        COALESCE(s.tier, 'UNKNOWN') AS tier,
+        COALESCE(c.industry, 'UNKNOWN') AS industry,
+        COALESCE(c.company_size, 'UNKNOWN') AS company_size,
+        COALESCE(c.country, 'UNKNOWN') AS country,
+        s.subscription_start_date,
+        s.subscription_end_date,
+        s.monthly_revenue
     FROM {{ ref('stg_subscriptions') }} s
-    CROSS JOIN (
-        SELECT DATE_TRUNC('day', DATEADD('day', ROW_NUMBER() OVER () - 1, '2023-01-01')) AS date_day
-        FROM {{ ref('stg_subscriptions') }} -- Generates a sequence of daily dates starting from a base date.
-        LIMIT 730 -- Limits the date range to 2 years of daily data for analysis.
-    ) d
     LEFT JOIN {{ ref('stg_customers') }} c ON s.customer_id = c.customer_id -- Joins with customer data for demographic dimensions.
-    WHERE d.date_day <= CURRENT_DATE -- Ensures dates are not in the future relative to the current run.
-      AND d.date_day >= '2023-01-01' -- Ensures dates start from Jan 1, 2023, for relevant historical analysis.
-    GROUP BY 1, 2, 3, 4, 5, 6 -- Groups by metric date and all relevant dimensions for daily metrics.
+),
+grouped_subscriptions AS (
+    SELECT
+        *,
+        {{ dbt_utils.generate_surrogate_key(grain) }} AS group_key -- One key per hub/tier/customer-dimension group.
+    FROM subscriptions
+),
+{% if is_incremental() %}
+watermark AS (
+    SELECT MAX(metric_date) AS max_metric_date FROM {{ this }} -- Latest day already materialized.
+),
+{% endif %}
+subscription_events AS (
+    -- A subscription contributes +1 / +MRR from its start date and -1 / -MRR from its end date,
+    -- so the running sum of deltas through day d equals the subscriptions active on d
+    -- (start <= d AND (end > d OR end IS NULL)). New/churn counts are separate events on their exact day.
+    SELECT group_key, customer_id, subscription_start_date AS event_date,
+           1 AS subscription_delta, monthly_revenue AS mrr_delta,
+           1 AS new_count, monthly_revenue AS new_mrr, 0 AS churned_count, 0 AS churned_mrr
+    FROM grouped_subscriptions
+    UNION ALL
+    SELECT group_key, customer_id, GREATEST(subscription_end_date, subscription_start_date) AS event_date, -- Invalid end-before-start rows never count as active.
+           -1, -monthly_revenue, 0, 0, 0, 0
+    FROM grouped_subscriptions
+    WHERE subscription_end_date IS NOT NULL
+    UNION ALL
+    SELECT group_key, customer_id, subscription_end_date AS event_date,
+           0, 0, 0, 0, 1, monthly_revenue
+    FROM grouped_subscriptions
+    WHERE subscription_end_date IS NOT NULL
+),
+clamped_events AS (
+    SELECT
+        *,
+        -- Activity before the reporting start is folded into the first reported day.
+        GREATEST(event_date, CAST('{{ start_date }}' AS DATE)) AS change_date
+    FROM subscription_events
+    WHERE event_date <= CURRENT_DATE
+),
+customer_activity AS (
+    -- Net subscription changes per customer, group and day; only customers touched since the watermark on incremental runs.
+    SELECT group_key, customer_id, change_date, SUM(subscription_delta) AS subscription_delta
+    FROM clamped_events
+    WHERE subscription_delta <> 0
+    {% if is_incremental() %}
+      AND customer_id IN (
+          SELECT customer_id FROM clamped_events
+          WHERE change_date > (SELECT max_metric_date FROM watermark)
+      )
+    {% endif %}
+    GROUP BY group_key, customer_id, change_date
+),
+customer_transitions AS (
+    SELECT
+        group_key,
+        customer_id,
+        change_date,
+        subscription_delta,
+        SUM(subscription_delta) OVER (
+            PARTITION BY group_key, customer_id ORDER BY change_date ROWS UNBOUNDED PRECEDING
+        ) AS running_subscriptions -- Active subscriptions this customer holds in the group after the day's changes.
+    FROM customer_activity
+),
+customer_events AS (
+    -- A customer becomes active in a group when its active subscriptions go 0 -> n and inactive on n -> 0,
+    -- which keeps active_customers exact (the COUNT DISTINCT it replaces) without per-day scans.
+    SELECT
+        group_key,
+        change_date,
+        CASE
+            WHEN running_subscriptions - subscription_delta <= 0 AND running_subscriptions > 0 THEN 1
+            WHEN running_subscriptions - subscription_delta > 0 AND running_subscriptions <= 0 THEN -1
+            ELSE 0
+        END AS customer_delta
+    FROM customer_transitions
+),
+daily_changes AS (
+    SELECT
+        group_key,
+        change_date AS metric_date,
+        SUM(subscription_delta) AS subscription_delta,
+        SUM(mrr_delta) AS mrr_delta,
+        SUM(CASE WHEN event_date = change_date THEN new_count ELSE 0 END) AS new_subscriptions, -- Starts before the reporting window are not "new" on its first day.
+        SUM(CASE WHEN event_date = change_date THEN new_mrr ELSE 0 END) AS new_mrr,
+        SUM(CASE WHEN event_date = change_date THEN churned_count ELSE 0 END) AS churned_subscriptions,
+        SUM(CASE WHEN event_date = change_date THEN churned_mrr ELSE 0 END) AS churned_mrr,
+        0 AS customer_delta
+    FROM clamped_events
+    {% if is_incremental() %}
+    WHERE change_date > (SELECT max_metric_date FROM watermark)
+    {% endif %}
+    GROUP BY group_key, change_date
+    UNION ALL
+    SELECT group_key, change_date, 0, 0, 0, 0, 0, 0, SUM(customer_delta)
+    FROM customer_events
+    {% if is_incremental() %}
+    WHERE change_date > (SELECT max_metric_date FROM watermark)
+    {% endif %}
+    GROUP BY group_key, change_date
+),
+daily_change_totals AS (
+    SELECT
+        group_key,
+        metric_date,
+        SUM(subscription_delta) AS subscription_delta,
+        SUM(mrr_delta) AS mrr_delta,
+        SUM(new_subscriptions) AS new_subscriptions,
+        SUM(new_mrr) AS new_mrr,
+        SUM(churned_subscriptions) AS churned_subscriptions,
+        SUM(churned_mrr) AS churned_mrr,
+        SUM(customer_delta) AS customer_delta
+    FROM daily_changes
+    GROUP BY group_key, metric_date
+),
+metric_groups AS (
+    SELECT DISTINCT group_key, {{ grain | join(', ') }}
+    FROM grouped_subscriptions
+),
+date_spine AS (
+    SELECT CAST(date_day AS DATE) AS metric_date
+    FROM ({{ dbt_utils.date_spine(datepart="day", start_date="CAST('" ~ start_date ~ "' AS DATE)", end_date="DATEADD('day', 1, CURRENT_DATE)") }}) spine
+    WHERE CAST(date_day AS DATE) <= CURRENT_DATE -- Ensures dates are not in the future relative to the current run.
+    {% if is_incremental() %}
+      AND CAST(date_day AS DATE) > (SELECT max_metric_date FROM watermark) -- Only days not yet materialized.
+    {% endif %}
+),
+{% if is_incremental() %}
+previous_state AS (
+    -- Running totals as of the watermark, carried forward instead of recomputed from history.
+    -- Late-arriving changes dated on or before the watermark need a --full-refresh to be reflected.
+    SELECT
+        {{ dbt_utils.generate_surrogate_key(grain) }} AS group_key,
+        active_subscriptions,
+        total_mrr,
+        active_customers
+    FROM {{ this }}
+    WHERE metric_date = (SELECT max_metric_date FROM watermark)
+),
+{% endif %}
+daily_metrics AS (
+    SELECT
+        d.metric_date,
+        g.group_key,
+        {% for column in grain %}g.{{ column }},
+        {% endfor -%}
+        -- Running sums of the daily deltas reproduce the point-in-time active counts and MRR.
+        {% if is_incremental() %}COALESCE(p.active_subscriptions, 0) + {% endif %}SUM(COALESCE(c.subscription_delta, 0)) OVER w AS active_subscriptions,
+        COALESCE(c.new_subscriptions, 0) AS new_subscriptions,
+        COALESCE(c.churned_subscriptions, 0) AS churned_subscriptions,
+        {% if is_incremental() %}COALESCE(p.total_mrr, 0) + {% endif %}SUM(COALESCE(c.mrr_delta, 0)) OVER w AS total_mrr,
+        COALESCE(c.new_mrr, 0) AS new_mrr,
+        COALESCE(c.churned_mrr, 0) AS churned_mrr,
+        {% if is_incremental() %}COALESCE(p.active_customers, 0) + {% endif %}SUM(COALESCE(c.customer_delta, 0)) OVER w AS active_customers,
+        TRUE AS is_new_row
+    FROM metric_groups g
+    CROSS JOIN date_spine d -- Output grain is group x day; subscriptions are no longer expanded per day.
+    LEFT JOIN daily_change_totals c ON c.group_key = g.group_key AND c.metric_date = d.metric_date
+    {% if is_incremental() %}
+    LEFT JOIN previous_state p ON p.group_key = g.group_key
+    {% endif %}
+    WINDOW w AS (PARTITION BY g.group_key ORDER BY d.metric_date ROWS UNBOUNDED PRECEDING)
+),
+metrics_history AS (
+    SELECT * FROM daily_metrics
+    {% if is_incremental() %}
+    UNION ALL
+    -- The last 30 materialized days feed the 1/7/30-day LAG windows of the new days.
+    SELECT
+        metric_date,
+        {{ dbt_utils.generate_surrogate_key(grain) }} AS group_key,
+        {{ grain | join(', ') }},
+        active_subscriptions,
+        new_subscriptions,
+        churned_subscriptions,
+        total_mrr,
+        new_mrr,
+        churned_mrr,
+        active_customers,
+        FALSE AS is_new_row
+    FROM {{ this }}
+    WHERE metric_date > DATEADD('day', -30, (SELECT max_metric_date FROM watermark))
+    {% endif %}
 ),
 metrics_with_calculations AS (
     SELECT
         *,
         -- Calculate growth rates using LAG window function to compare to previous periods.
-        LAG(total_mrr, 30) OVER (PARTITION BY hub, tier ORDER BY metric_date) AS mrr_30_days_ago, -- MRR from 30 days prior.
-        LAG(active_subscriptions, 7) OVER (PARTITION BY hub, tier ORDER BY metric_date) AS subscriptions_7_days_ago, -- Active subscriptions from 7 days prior.
-        LAG(total_mrr, 7) OVER (PARTITION BY hub, tier ORDER BY metric_date) AS mrr_7_days_ago, -- MRR from 7 days prior.
+        LAG(total_mrr, 30) OVER (PARTITION BY group_key ORDER BY metric_date) AS mrr_30_days_ago, -- MRR from 30 days prior.
+        LAG(active_subscriptions, 7) OVER (PARTITION BY group_key ORDER BY metric_date) AS subscriptions_7_days_ago, -- Active subscriptions from 7 days prior.
+        LAG(total_mrr, 7) OVER (PARTITION BY group_key ORDER BY metric_date) AS mrr_7_days_ago, -- MRR from 7 days prior.
         -- Calculate daily churn rate (churned subscriptions divided by previous day's active subscriptions).
-        CASE 
-            WHEN LAG(active_subscriptions, 1) OVER (PARTITION BY hub, tier ORDER BY metric_date) > 0
-            THEN churned_subscriptions::FLOAT / LAG(active_subscriptions, 1) OVER (PARTITION BY hub, tier ORDER BY metric_date)
+        CASE
+            WHEN LAG(active_subscriptions, 1) OVER (PARTITION BY group_key ORDER BY metric_date) > 0
+            THEN churned_subscriptions::FLOAT / LAG(active_subscriptions, 1) OVER (PARTITION BY group_key ORDER BY metric_date)
             ELSE 0 -- Avoids division by zero.
         END AS daily_churn_rate,
         -- Calculate net revenue retention (30-day): Current MRR divided by MRR from 30 days ago.
-        CASE 
-            WHEN LAG(total_mrr, 30) OVER (PARTITION BY hub, tier ORDER BY metric_date) > 0
-            THEN total_mrr::FLOAT / LAG(total_mrr, 30) OVER (PARTITION BY hub, tier ORDER BY metric_date)
+        CASE
+            WHEN LAG(total_mrr, 30) OVER (PARTITION BY group_key ORDER BY metric_date) > 0
+            THEN total_mrr::FLOAT / LAG(total_mrr, 30) OVER (PARTITION BY group_key ORDER BY metric_date)
             ELSE 1 -- Assumes 100% retention if no previous MRR for comparison.
         END AS revenue_retention_30d
-    FROM daily_metrics
+    FROM metrics_history
 )
 SELECT
     -- Primary key for the fact table, ensuring uniqueness for each daily metric snapshot.
-    {{ dbt_utils.generate_surrogate_key(['metric_date', 'hub', 'tier', 'industry', 'company_size', 'country']) }} AS fact_key,
+    {{ dbt_utils.generate_surrogate_key(['metric_date'] + grain) }} AS fact_key,
     metric_date,
     {{ dbt_utils.generate_surrogate_key(['hub', 'tier']) }} AS product_key, -- Foreign key to the product dimension.
     -- Dimensions for slicing and dicing metrics by various attributes.
@@ -82,32 +244,32 @@ SELECT
     churned_mrr,
     COALESCE(new_mrr - churned_mrr, 0) AS net_new_mrr, -- Calculates net change in MRR (new MRR - churned MRR).
     -- Growth metrics: Percentage growth for MRR (30-day) and subscriptions (7-day).
-    CASE 
-        WHEN mrr_30_days_ago > 0 
-        THEN ((total_mrr - mrr_30_days_ago) / mrr_30_days_ago) * 100 
-        ELSE 0 
+    CASE
+        WHEN mrr_30_days_ago > 0
+        THEN ((total_mrr - mrr_30_days_ago) / mrr_30_days_ago) * 100
+        ELSE 0
     END AS mrr_growth_30d_pct,
-    CASE 
-        WHEN subscriptions_7_days_ago > 0 
-        THEN ((active_subscriptions - subscriptions_7_days_ago) / subscriptions_7_days_ago) * 100 
-        ELSE 0 
+    CASE
+        WHEN subscriptions_7_days_ago > 0
+        THEN ((active_subscriptions - subscriptions_7_days_ago)::FLOAT / subscriptions_7_days_ago) * 100
+        ELSE 0
     END AS subscription_growth_7d_pct,
     -- Retention metrics: Daily churn rate as a percentage and 30-day revenue retention as a percentage.
     daily_churn_rate * 100 AS daily_churn_rate_pct,
     revenue_retention_30d * 100 AS revenue_retention_30d_pct,
     -- Unit economics: Average Revenue Per User (ARPU) and average value of new subscriptions.
-    CASE 
-        WHEN active_customers > 0 
-        THEN total_mrr / active_customers 
-        ELSE 0 
+    CASE
+        WHEN active_customers > 0
+        THEN total_mrr / active_customers
+        ELSE 0
     END AS arpu, -- Average Revenue Per User
-    CASE 
-        WHEN new_subscriptions > 0 
-        THEN new_mrr / new_subscriptions 
-        ELSE 0 
+    CASE
+        WHEN new_subscriptions > 0
+        THEN new_mrr / new_subscriptions
+        ELSE 0
     END AS avg_new_subscription_value,
     -- Metadata for tracking report generation time.
     CURRENT_TIMESTAMP AS created_at
 FROM metrics_with_calculations
-WHERE metric_date >= '2023-01-01' -- Filters to include data from January 1, 2023, onwards.
-  AND total_mrr >= 0; -- Data quality check: Ensures total MRR is non-negative.
\ No newline at end of file
+WHERE is_new_row -- History rows only feed the LAG windows.
+  AND total_mrr >= 0 -- Data quality check: Ensures total MRR is non-negative.
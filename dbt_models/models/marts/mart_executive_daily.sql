@@ -0,0 +1,65 @@
+{{ config(materialized='incremental', unique_key='metric_date') }} -- Daily-grain rollup behind the executive KPIs; daily runs only recompute the last few days.
+
+{%- set lookback_days = var('executive_lookback_days', 3) %}
+
+WITH hub_daily AS (
+    -- One pass over the fact table: every executive KPI is a sum or count of these per-hub totals.
+    SELECT
+        metric_date,
+        hub,
+        SUM(total_mrr) AS hub_mrr,
+        SUM(active_customers) AS hub_active_customers,
+        SUM(daily_churn_rate_pct) AS hub_churn_rate_sum,
+        COUNT(daily_churn_rate_pct) AS hub_churn_rate_count
+    FROM {{ ref('fact_subscription_metrics') }}
+    {% if is_incremental() %}
+    -- Re-rolls the trailing days so late corrections to recent facts replace their rows (unique_key = metric_date).
+    WHERE metric_date >= DATEADD('day', -{{ lookback_days }}, (SELECT MAX(metric_date) FROM {{ this }}))
+    {% endif %}
+    GROUP BY metric_date, hub
+),
+daily AS (
+    SELECT
+        metric_date,
+        SUM(hub_mrr) AS total_mrr,
+        SUM(hub_active_customers) AS active_customers,
+        SUM(hub_churn_rate_sum) AS churn_rate_sum, -- Sum and count rather than AVG, so months re-aggregate exactly.
+        SUM(hub_churn_rate_count) AS churn_rate_count,
+        MAX_BY(hub, hub_mrr) AS top_hub_by_revenue, -- Hub with the most MRR that day.
+        MAX(hub_mrr) AS top_hub_revenue
+    FROM hub_daily
+    GROUP BY metric_date
+),
+customer_snapshot AS (
+    -- Customer and pricing KPIs are point-in-time, so each run stamps the current values on the days it writes.
+    SELECT
+        COUNT(CASE WHEN customer_segment = 'CHAMPION' THEN 1 END) AS champion_customers,
+        SUM(CASE WHEN customer_segment = 'CHAMPION' THEN current_mrr END) AS champion_mrr,
+        COUNT(CASE WHEN churn_risk = 'HIGH' THEN 1 END) AS total_high_risk_customers
+    FROM {{ ref('dim_customers') }}
+),
+pricing_snapshot AS (
+    SELECT
+        COUNT(*) AS immediate_pricing_opportunities,
+        SUM(optimal_revenue_uplift_pct) AS total_pricing_upside_pct
+    FROM {{ ref('fact_pricing_optimization') }}
+    WHERE revenue_rank = 1 -- Most optimal pricing scenario per product only.
+      AND strategic_recommendation = 'IMPLEMENT_IMMEDIATELY'
+)
+SELECT
+    d.metric_date,
+    d.total_mrr,
+    d.active_customers,
+    d.churn_rate_sum,
+    d.churn_rate_count,
+    d.top_hub_by_revenue,
+    d.top_hub_revenue,
+    c.champion_customers,
+    c.champion_mrr,
+    c.total_high_risk_customers,
+    p.immediate_pricing_opportunities,
+    p.total_pricing_upside_pct,
+    CURRENT_TIMESTAMP AS rolled_up_at
+FROM daily d
+CROSS JOIN customer_snapshot c
+CROSS JOIN pricing_snapshot p
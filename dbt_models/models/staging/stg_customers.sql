@@ -1,7 +1,11 @@
-{{ config(materialized='view') }}
+{{ config(materialized='incremental', unique_key='customer_id') }}
 
 WITH source AS (
     SELECT * FROM {{ source('raw', 'customers') }}
+    {% if is_incremental() %}
+    -- Extracts are partitioned by dt = updated_at date, so only recent partitions are scanned
+    WHERE dt >= CAST((SELECT MAX(updated_at) FROM {{ this }}) AS DATE) - {{ var('staging_lookback_days', 3) }}
+    {% endif %}
 ),
 
 cleaned AS (
@@ -31,6 +35,8 @@ cleaned AS (
     FROM source
     WHERE customer_id IS NOT NULL
       AND signup_date IS NOT NULL
+    -- Customers updated on several days appear in several extract partitions; keep the latest
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY updated_at::TIMESTAMP DESC) = 1
 )
 
 SELECT * FROM cleaned
\ No newline at end of file
@@ -1,7 +1,11 @@
-{{ config(materialized='view') }} -- Configures this dbt model to be created as a SQL view.
+{{ config(materialized='incremental', unique_key='subscription_id') }} -- Incremental so each run only reads newly extracted partitions.
 
 WITH source AS (
 SELECT * FROM {{ source('raw', 'subscriptions') }} -- Selects all columns from the 'subscriptions' table in the 'raw' schema.
+{% if is_incremental() %}
+-- Extracts are partitioned by dt = updated_at date, so this prunes to the changes since the last run.
+WHERE dt >= CAST((SELECT MAX(updated_at) FROM {{ this }}) AS DATE) - {{ var('staging_lookback_days', 3) }}
+{% endif %}
 ),
 
 cleaned AS (
@@ -36,6 +40,8 @@ FROM source
 WHERE subscription_id IS NOT NULL -- Filters out records with null subscription IDs, ensuring valid subscriptions.
 AND customer_id IS NOT NULL -- Filters out records with null customer IDs, ensuring subscriptions are linked to a customer.
 AND subscription_start_date IS NOT NULL -- Filters out records with null start dates, which are critical for subscription tracking.
+-- A subscription changed on several days appears in several extract partitions; keep its latest version.
+QUALIFY ROW_NUMBER() OVER (PARTITION BY subscription_id ORDER BY updated_at::TIMESTAMP DESC) = 1
 )
 
 SELECT * FROM cleaned -- Selects all columns from the cleaned CTE.
\ No newline at end of file
@@ -1,7 +1,11 @@
-{{ config(materialized='view') }} -- Configures this dbt model to be created as a SQL view.
+{{ config(materialized='incremental', unique_key='interaction_id') }} -- Incremental so each run only reads newly extracted partitions.
 
 WITH source AS (
     SELECT * FROM {{ source('raw', 'support_interactions') }} -- Selects all columns from the 'support_interactions' table in the 'raw' schema.
+    {% if is_incremental() %}
+    -- Extracts are partitioned by dt = interaction_date, so this prunes to the partitions since the last run.
+    WHERE dt >= (SELECT MAX(interaction_date) FROM {{ this }}) - {{ var('staging_lookback_days', 3) }}
+    {% endif %}
 ),
 cleaned AS (
     SELECT
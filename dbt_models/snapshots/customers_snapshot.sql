@@ -3,12 +3,15 @@
         config(
           target_schema='snapshots',
           unique_key='customer_id',
-          strategy='timestamp',
-          updated_at='updated_at',
+          strategy='check',
+          check_cols=['row_hash'],
         )
     }}
-    
-    SELECT 
+
+    -- Versions are keyed on a hash of the tracked attributes, so upstream jobs that only touch
+    -- updated_at no longer create new snapshot rows. The same hash is computed by
+    -- dashboard/customer_snapshot.py for local runs.
+    SELECT
         customer_id,
         company_name,
         industry,
@@ -17,7 +20,10 @@
         state,
         email,
         signup_date,
-        updated_at
+        updated_at,
+        {{ dbt_utils.generate_surrogate_key(['company_name', 'industry', 'company_size', 'country', 'state', 'email']) }} AS row_hash
     FROM {{ source('raw', 'customers') }}
-    
-{% endsnapshot %}
\ No newline at end of file
+    -- Extracts land one partition per updated_at day, so a customer can appear more than once
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY customer_id ORDER BY updated_at DESC) = 1
+
+{% endsnapshot %}
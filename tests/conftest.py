@@ -0,0 +1,111 @@
+"""Shared fixtures: the dashboard modules on sys.path and synthetic raw sources for the dbt models."""
+
+from pathlib import Path
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "dashboard"))
+
+
+def make_raw_sources(n_customers=500, seed=7, today=None):
+    """Random raw subscriptions, customers, usage events and support interactions"""
+    rng = np.random.default_rng(seed)
+    today = pd.Timestamp(today or pd.Timestamp.today().normalize())
+    customer_ids = np.array([f"C{i:06d}" for i in range(n_customers)])
+
+    n_subs = n_customers * 2
+    sub_customers = rng.choice(customer_ids, n_subs)
+    start = today - pd.to_timedelta(rng.integers(30, 900, n_subs), unit='D')
+    ended = rng.random(n_subs) < 0.35
+    end = start + pd.to_timedelta(rng.integers(30, 400, n_subs), unit='D')
+    end = pd.Series(end.date).where(ended & (end < today), None)
+    subscriptions = pd.DataFrame({
+        'subscription_id': [f"S{i:07d}" for i in range(n_subs)],
+        'customer_id': sub_customers,
+        'product_hub': rng.choice(['Marketing Hub', 'Sales Hub', 'Service Hub', 'CMS Hub', 'Ops Hub'], n_subs),
+        'subscription_tier': rng.choice(['Starter', 'Professional', 'Enterprise'], n_subs),
+        'monthly_revenue': rng.integers(20, 1500, n_subs).astype(float),
+        'subscription_start_date': start.date,
+        'subscription_end_date': end,
+        'is_active': end.isna().to_numpy(),
+        'payment_method': 'card',
+        'created_at': start,
+        'updated_at': start,
+    })
+    customers = pd.DataFrame({
+        'customer_id': customer_ids,
+        'company_name': '',
+        'industry': rng.choice(['Technology', 'Retail', 'Finance'], n_customers),
+        'company_size': rng.choice(['small', 'medium', 'large'], n_customers),
+        'country': rng.choice(['United States', 'Germany', 'Japan'], n_customers),
+        'state': '',
+        'email': 'x@example.com',
+        'first_name': '',
+        'last_name': '',
+        'phone': '',
+        'signup_date': (today - pd.Timedelta(days=1000)).date(),
+        'created_at': today - pd.Timedelta(days=1000),
+        'updated_at': today - pd.Timedelta(days=1000),
+    })
+    # Roughly a fifth of customers have no usage and a third no support interactions
+    n_events = n_customers * 20
+    usage_events = pd.DataFrame({
+        'event_id': [f"E{i:08d}" for i in range(n_events)],
+        'customer_id': rng.choice(customer_ids[: int(n_customers * 0.8)], n_events),
+        'subscription_id': rng.choice(subscriptions['subscription_id'], n_events),
+        'event_date': (today - pd.to_timedelta(rng.integers(0, 365, n_events), unit='D')).date,
+        'session_duration_minutes': rng.integers(0, 120, n_events),
+        'pages_viewed': rng.integers(0, 40, n_events),
+        'api_calls': rng.integers(0, 500, n_events),
+        'feature_used': rng.choice(['Reports', 'Email', 'Workflows', 'Chat', 'API'], n_events),
+        'event_timestamp': today,
+    })
+    n_interactions = n_customers * 2
+    support = pd.DataFrame({
+        'interaction_id': [f"I{i:07d}" for i in range(n_interactions)],
+        'customer_id': rng.choice(customer_ids[: int(n_customers * 0.66)], n_interactions),
+        'interaction_date': (today - pd.to_timedelta(rng.integers(0, 365, n_interactions), unit='D')).date,
+        'interaction_type': 'ticket',
+        'category': 'billing',
+        'priority': 'low',
+        'resolution_time_hours': rng.uniform(0.5, 30, n_interactions).round(2),
+        'satisfaction_score': rng.integers(1, 6, n_interactions),
+        'resolved': True,
+    })
+    return {'subscriptions': subscriptions, 'customers': customers,
+            'usage_events': usage_events, 'support_interactions': support}
+
+
+def write_csv_sources(data_dir, raw_sources):
+    """Write each raw table as ``<data_dir>/<table>.csv``, the flat layout the DuckDB runner reads"""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for table, df in raw_sources.items():
+        df.to_csv(data_dir / f"{table}.csv", index=False)
+    return data_dir
+
+
+@pytest.fixture(scope="session")
+def project_dir():
+    return REPO_ROOT / "dbt_models"
+
+
+@pytest.fixture(scope="session")
+def today():
+    return pd.Timestamp.today().normalize()
+
+
+@pytest.fixture
+def synthetic_raw_sources():
+    """Factory of synthetic raw sources: ``synthetic_raw_sources(n_customers=500, seed=7, today=None)``"""
+    return make_raw_sources
+
+
+@pytest.fixture
+def raw_source_dir(tmp_path, today):
+    """Default synthetic raw sources written as CSV files, dated up to ``today``"""
+    return write_csv_sources(tmp_path / "data", make_raw_sources(today=today))
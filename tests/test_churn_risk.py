@@ -0,0 +1,38 @@
+"""``churn_risk`` against the ``calculate_churn_risk`` macro and a full refresh."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from churn_risk import calculate_churn_risk, update  # noqa: E402
+from duckdb_engine import DuckDBMartRunner  # noqa: E402
+
+
+def test_ladder_matches_macro(project_dir, tmp_path):
+    grid = pd.MultiIndex.from_product([
+        [np.nan, 0, 7, 14, 15, 30, 31, 90, 91, 999],
+        [np.nan, 0, 29, 30, 39, 40, 59, 60, 100],
+        [np.nan, 0, 2.9, 3, 5],
+    ], names=['days', 'health', 'satisfaction']).to_frame(index=False)
+    runner = DuckDBMartRunner(project_dir, tmp_path)
+    case_sql = runner.env.globals['calculate_churn_risk']('days', 'health', 'satisfaction')
+    runner.con.register('grid', grid)
+    sql_risk = runner.con.execute(f"SELECT {case_sql} AS churn_risk FROM grid").df()['churn_risk']
+    python_risk = calculate_churn_risk(grid['days'], grid['health'], grid['satisfaction'])
+    assert (sql_risk.to_numpy() == python_risk).all()
+
+
+def test_incremental_runs_match_full_refresh(raw_source_dir, tmp_path, today, days=10):
+    for offset in range(days, -1, -1):
+        result = update(raw_source_dir, tmp_path / "incremental", today - pd.Timedelta(days=offset))
+    full = update(raw_source_dir, tmp_path / "full", today)
+    columns = ['churn_risk', 'health_score', 'days_since_activity']
+    incremental, full_state = result['state'].sort_index(), full['state'].sort_index()
+    pd.testing.assert_frame_equal(incremental[columns].astype(str), full_state[columns].astype(str))
+
+
+def test_rerun_for_scored_day_is_a_no_op(raw_source_dir, tmp_path, today):
+    update(raw_source_dir, tmp_path / "state", today)
+    assert update(raw_source_dir, tmp_path / "state", today) is None
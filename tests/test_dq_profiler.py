@@ -0,0 +1,104 @@
+"""``dq_profiler`` against the ``data_quality_metrics`` SQL on synthetic data with injected defects."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from dq_profiler import business_rules, load_scores, profile, source_partitions  # noqa: E402
+from duckdb_engine import DuckDBMartRunner  # noqa: E402
+
+from .conftest import write_csv_sources
+
+
+REFERENCE_SQL = {
+    'customers': """COUNT(*), COUNT(DISTINCT customer_id),
+        COUNT(CASE WHEN email IS NULL OR email = '' THEN 1 END) + COUNT(CASE WHEN signup_date IS NULL THEN 1 END)
+        + COUNT(CASE WHEN country IS NULL OR country = '' THEN 1 END)""",
+    'subscriptions': """COUNT(*), COUNT(DISTINCT subscription_id),
+        COUNT(CASE WHEN monthly_revenue <= 0 THEN 1 END)
+        + COUNT(CASE WHEN subscription_end_date::DATE < subscription_start_date::DATE THEN 1 END)
+        + COUNT(CASE WHEN customer_id IS NULL THEN 1 END)""",
+    'usage_events': """COUNT(*), COUNT(DISTINCT event_id),
+        COUNT(CASE WHEN session_duration_minutes < 0 THEN 1 END) + COUNT(CASE WHEN pages_viewed < 0 THEN 1 END)
+        + COUNT(CASE WHEN event_date::DATE > CURRENT_DATE THEN 1 END)""",
+}
+PARTITION_DATES = {'customers': 'updated_at', 'subscriptions': 'updated_at', 'usage_events': 'event_date'}
+WORKERS = 2
+
+
+def write_partitions(data_dir, table, df, date_column, freq='M'):
+    """Write ``df`` as ``raw/<table>/dt=<period start>/part-0.parquet`` partitions"""
+    periods = pd.to_datetime(df[date_column]).dt.to_period(freq).dt.start_time.dt.date
+    for period, part in df.groupby(periods):
+        path = Path(data_dir) / "raw" / table / f"dt={period}" / "part-0.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part.to_parquet(path, index=False)
+
+
+def with_defects(raw_sources, seed=3):
+    """Copy of the synthetic sources with blanks, bad ranges, future dates and duplicate events"""
+    rng = np.random.default_rng(seed)
+    customers = raw_sources['customers'].copy()
+    customers.loc[rng.random(len(customers)) < 0.05, 'email'] = None
+    customers.loc[rng.random(len(customers)) < 0.05, 'country'] = ''
+    subscriptions = raw_sources['subscriptions'].copy()
+    subscriptions.loc[rng.random(len(subscriptions)) < 0.03, 'monthly_revenue'] = 0.0
+    usage = raw_sources['usage_events'].copy()
+    usage.loc[rng.random(len(usage)) < 0.02, 'session_duration_minutes'] = -5
+    usage.loc[rng.random(len(usage)) < 0.02, 'pages_viewed'] = -1
+    future = rng.random(len(usage)) < 0.01
+    usage.loc[future, 'event_date'] = (pd.Timestamp.today().normalize() + pd.Timedelta(days=10)).date()
+    usage = pd.concat([usage, usage.sample(20, random_state=seed)], ignore_index=True)
+    return {**raw_sources, 'customers': customers, 'subscriptions': subscriptions, 'usage_events': usage}
+
+
+@pytest.fixture
+def raw_sources(synthetic_raw_sources):
+    return with_defects(synthetic_raw_sources())
+
+
+@pytest.fixture
+def partitioned(raw_sources, tmp_path):
+    """Raw partitions of the defective sources, profiled once; returns (data_dir, profile_dir)"""
+    data_dir = tmp_path / "data"
+    for table, date_column in PARTITION_DATES.items():
+        write_partitions(data_dir, table, raw_sources[table], date_column)
+    profile(data_dir, tmp_path / "profiles", workers=WORKERS)
+    return data_dir, tmp_path / "profiles"
+
+
+@pytest.mark.parametrize('table', list(REFERENCE_SQL))
+def test_counters_match_sql(partitioned, table):
+    data_dir, profile_dir = partitioned
+    scores = load_scores(profile_dir).set_index('table_name')
+    con = duckdb.connect()
+    source = f"read_parquet('{(data_dir / 'raw' / table).as_posix()}/**/*.parquet', hive_partitioning = true)"
+    expected = con.execute(f"SELECT {REFERENCE_SQL[table]} FROM {source}").fetchone()
+    con.close()
+    assert tuple(scores.loc[table, ['total_records', 'unique_keys', 'flagged_records']]) == expected
+
+
+def test_only_changed_partitions_are_reprofiled(partitioned):
+    data_dir, profile_dir = partitioned
+    rerun = profile(data_dir, profile_dir, workers=WORKERS)
+    assert sum(stats['profiled'] for stats in rerun.values()) == 0
+
+    changed = source_partitions(data_dir, 'usage_events')[0]
+    pd.read_parquet(changed).iloc[1:].to_parquet(changed, index=False)
+    rerun = profile(data_dir, profile_dir, workers=WORKERS)
+    assert sum(stats['profiled'] for stats in rerun.values()) == 1
+
+
+def test_business_rules_match_sql(raw_sources, project_dir, tmp_path):
+    runner = DuckDBMartRunner(project_dir, write_csv_sources(tmp_path / "flat", raw_sources))
+    sql = runner.run_model('data_quality_metrics').set_index('table_name')
+    rules = business_rules(runner.run_model('dim_customers'),
+                           runner.run_model('fact_subscription_metrics')).set_index('table_name')
+    for name, rule in rules.iterrows():
+        # The model reports a rule's failures in its unique_keys column
+        expected = (int(sql.loc[name, 'total_records']), int(sql.loc[name, 'unique_keys']))
+        assert (rule['total_records'], rule['flagged_records']) == expected, name
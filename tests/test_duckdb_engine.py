@@ -0,0 +1,55 @@
+"""``DuckDBMartRunner`` sources read the same local layouts as ``source_relation``."""
+
+import pandas as pd
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from duckdb_engine import DuckDBMartRunner, source_relation  # noqa: E402
+
+
+def write_partition(data_dir, table, ds, df):
+    path = data_dir / "raw" / table / f"dt={ds}" / "part-0.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, index=False)
+
+
+def runner_rows(project_dir, data_dir, table):
+    runner = DuckDBMartRunner(project_dir, data_dir)
+    relation = runner.env.globals['source']('raw', table)
+    return runner.con.execute(f"SELECT * FROM {relation} ORDER BY 1").df(), runner.sources_used
+
+
+def relation_rows(data_dir, table):
+    con = duckdb.connect()
+    try:
+        return con.execute(f"SELECT * FROM {source_relation(data_dir, table)} ORDER BY 1").df()
+    finally:
+        con.close()
+
+
+def test_partitions_with_an_added_column(project_dir, tmp_path):
+    write_partition(tmp_path, 'customers', '2024-01-01', pd.DataFrame({'customer_id': ['C1'], 'country': ['DE']}))
+    write_partition(tmp_path, 'customers', '2024-01-02',
+                    pd.DataFrame({'customer_id': ['C2'], 'country': ['JP'], 'state': ['Tokyo']}))
+    rows, sources_used = runner_rows(project_dir, tmp_path, 'customers')
+    pd.testing.assert_frame_equal(rows, relation_rows(tmp_path, 'customers'))
+    assert rows['state'].isna().tolist() == [True, False]
+    assert sources_used[('raw', 'customers')] == tmp_path / "raw" / "customers"
+
+
+def test_empty_partition_dir_falls_back_to_flat_file(project_dir, tmp_path):
+    (tmp_path / "raw" / "customers").mkdir(parents=True)
+    pd.DataFrame({'customer_id': ['C1', 'C2'], 'country': ['DE', 'JP']}).to_csv(tmp_path / "customers.csv", index=False)
+    rows, sources_used = runner_rows(project_dir, tmp_path, 'customers')
+    pd.testing.assert_frame_equal(rows, relation_rows(tmp_path, 'customers'))
+    assert sources_used[('raw', 'customers')] == tmp_path / "customers.csv"
+
+
+def test_sources_outside_raw_are_recorded_under_their_own_name(project_dir, tmp_path):
+    pd.DataFrame({'customer_id': ['C1']}).to_csv(tmp_path / "customers.csv", index=False)
+    runner = DuckDBMartRunner(project_dir, tmp_path)
+    for _ in range(2):
+        relation = runner.env.globals['source']('crm', 'customers')
+    assert runner.con.execute(f"SELECT customer_id FROM {relation}").fetchall() == [('C1',)]
+    assert runner.sources_used == {('crm', 'customers'): tmp_path / "customers.csv"}
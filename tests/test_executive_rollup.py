@@ -0,0 +1,109 @@
+"""``executive_rollup`` against ``mart_executive_daily`` / ``mart_executive_summary`` run in DuckDB.
+
+The models run on synthetic upstream marts, first on the facts up to ``CUTOFF_DAYS`` before the
+end and then incrementally (dbt's delete+insert on metric_date) once the remaining days, plus
+restated values for the last ``LOOKBACK_DAYS`` loaded days, arrive.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from duckdb_engine import DuckDBMartRunner  # noqa: E402
+from executive_rollup import (  # noqa: E402
+    LOOKBACK_DAYS, ROLLUP_COLUMNS, SUMMARY_COLUMNS, customer_snapshot, daily_rollup, executive_kpis,
+    pricing_snapshot, update_rollup,
+)
+from synthetic_data import SyntheticMartGenerator  # noqa: E402
+
+
+CUTOFF_DAYS = 10
+
+
+def register_marts(runner, marts):
+    """Load synthetic upstream marts into the runner so the rollup models build on them"""
+    for mart_name, df in marts.items():
+        runner.con.register(f"{mart_name}_input", df)
+        runner.con.execute(f'CREATE OR REPLACE TABLE "{mart_name}" AS SELECT * FROM "{mart_name}_input"')
+        runner.con.unregister(f"{mart_name}_input")
+        runner.built.add(mart_name)
+
+
+def assert_column_equal(column, expected, actual, rtol=1e-9):
+    assert len(actual) == len(expected), column
+    if column == 'metric_date':
+        assert (pd.to_datetime(expected).to_numpy() == pd.to_datetime(actual).to_numpy()).all()
+    elif column == 'top_hub_by_revenue':
+        assert (expected.astype(str).to_numpy() == actual.astype(str).to_numpy()).all()
+    else:
+        np.testing.assert_allclose(actual.to_numpy(dtype='float64', na_value=np.nan),
+                                   expected.to_numpy(dtype='float64', na_value=np.nan),
+                                   rtol=rtol, atol=1e-9, equal_nan=True, err_msg=column)
+
+
+@pytest.fixture(scope="module")
+def rollups(project_dir, tmp_path_factory):
+    marts = SyntheticMartGenerator(n_customers=2000, n_days=75).generate()
+    facts = marts['fact_subscription_metrics'].assign(
+        metric_date=lambda df: pd.to_datetime(df['metric_date']),
+        active_customers=lambda df: df['active_subscriptions'])
+    cutoff = facts['metric_date'].max() - pd.Timedelta(days=CUTOFF_DAYS)
+    # Restating the loaded tail exercises the lookback: those days must be re-rolled
+    restated = facts.assign(total_mrr=np.where((facts['metric_date'] > cutoff - pd.Timedelta(days=LOOKBACK_DAYS))
+                                               & (facts['metric_date'] <= cutoff),
+                                               facts['total_mrr'] * 1.01, facts['total_mrr']))
+    snapshot = {**customer_snapshot(marts['dim_customers']), **pricing_snapshot(marts['fact_pricing_optimization'])}
+    upstream = {name: marts[name] for name in ('dim_customers', 'fact_pricing_optimization')}
+    data_dir = tmp_path_factory.mktemp("data")
+
+    runner = DuckDBMartRunner(project_dir, data_dir)
+    register_marts(runner, {**upstream, 'fact_subscription_metrics': facts[facts['metric_date'] <= cutoff]})
+    runner.build_model('mart_executive_daily')
+
+    register_marts(runner, {'fact_subscription_metrics': restated})
+    defaults = {key: runner.env.globals[key] for key in ('var', 'is_incremental')}
+    runner.env.globals.update(
+        var=lambda name, default=None: LOOKBACK_DAYS if name == 'executive_lookback_days' else default,
+        is_incremental=lambda: True)
+    try:
+        sql, _ = runner.compile_model('mart_executive_daily')
+    finally:
+        runner.env.globals.update(defaults)
+    runner.con.execute(f"CREATE OR REPLACE TEMP TABLE executive_daily_increment AS\n{sql}\n")
+    runner.con.execute('DELETE FROM "mart_executive_daily" WHERE metric_date IN '
+                       '(SELECT metric_date FROM executive_daily_increment)')
+    runner.con.execute('INSERT INTO "mart_executive_daily" SELECT * FROM executive_daily_increment')
+
+    full_runner = DuckDBMartRunner(project_dir, data_dir)
+    register_marts(full_runner, {**upstream, 'fact_subscription_metrics': restated})
+
+    python_rollup = update_rollup(daily_rollup(facts[facts['metric_date'] <= cutoff], snapshot), restated, snapshot)
+    return {
+        'written': runner.con.execute("SELECT COUNT(*) FROM executive_daily_increment").fetchone()[0],
+        'sql_incremental': runner.con.execute('SELECT * FROM "mart_executive_daily" ORDER BY metric_date').df(),
+        'sql_summary': runner.run_model('mart_executive_summary'),
+        'sql_full': full_runner.run_model('mart_executive_daily').sort_values('metric_date', ignore_index=True),
+        'python_rollup': python_rollup,
+        'python_summary': executive_kpis(python_rollup),
+    }
+
+
+def test_incremental_run_rerolls_lookback(rollups):
+    assert rollups['written'] == CUTOFF_DAYS + LOOKBACK_DAYS + 1
+
+
+@pytest.mark.parametrize('column', ROLLUP_COLUMNS)
+def test_incremental_matches_full_rebuild(rollups, column):
+    assert_column_equal(column, rollups['sql_full'][column], rollups['sql_incremental'][column])
+
+
+@pytest.mark.parametrize('column', ROLLUP_COLUMNS)
+def test_pandas_rollup_matches_sql(rollups, column):
+    assert_column_equal(column, rollups['sql_incremental'][column], rollups['python_rollup'][column])
+
+
+@pytest.mark.parametrize('column', SUMMARY_COLUMNS[1:-2])
+def test_pandas_kpis_match_sql(rollups, column):
+    assert_column_equal(column, rollups['sql_summary'][column], rollups['python_summary'][column])
@@ -0,0 +1,85 @@
+"""``FilterIndex.apply`` against the boolean-mask filtering it replaced, on schema-typed synthetic marts."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filter_index import FILTER_COLUMNS, FilterIndex
+from mart_schema import apply_schema
+from synthetic_data import SyntheticMartGenerator
+
+
+def mask_filter(df, **filters):
+    """The dashboard's original filtering: one boolean mask per active filter"""
+    filtered = df.copy()
+    for column, value in filters.items():
+        if value is not None and column in filtered.columns:
+            filtered = filtered[filtered[column] == value]
+    return filtered
+
+
+@pytest.fixture(scope="module")
+def marts():
+    """Schema-typed marts in shuffled row order, with NULLs in every filter column"""
+    rng = np.random.default_rng(5)
+    marts = {}
+    for name, df in SyntheticMartGenerator(n_customers=1000).generate().items():
+        if name not in ('dim_customers', 'fact_subscription_metrics', 'fact_customer_ltv'):
+            continue
+        df = df.sample(frac=1, random_state=5)
+        for column in FILTER_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].where(rng.random(len(df)) > 0.1)
+        marts[name] = apply_schema(name, df)
+    return marts
+
+
+def filter_values(df, column):
+    """Every value present in ``column``, plus one that is absent"""
+    return [*df[column].dropna().unique().tolist(), "Atlantis"]
+
+
+def assert_same_rows(index, df, **filters):
+    pd.testing.assert_frame_equal(index.apply(df, **filters), mask_filter(df, **filters))
+
+
+def test_filter_columns_are_categorical(marts):
+    assert isinstance(marts['dim_customers']['country'].dtype, pd.CategoricalDtype)
+    assert isinstance(marts['fact_subscription_metrics']['hub'].dtype, pd.CategoricalDtype)
+
+
+@pytest.mark.parametrize('mart_name', ['dim_customers', 'fact_subscription_metrics', 'fact_customer_ltv'])
+def test_single_filters_match_masks(marts, mart_name):
+    df = marts[mart_name]
+    index = FilterIndex(df)
+    for column in FILTER_COLUMNS:
+        if column in df.columns:
+            for value in filter_values(df, column):
+                assert_same_rows(index, df, **{column: value})
+
+
+def test_absent_value_matches_nothing(marts):
+    df = marts['dim_customers']
+    df = df.assign(country=df['country'].cat.add_categories(['Atlantis']))
+    assert FilterIndex(df).apply(df, country='Atlantis').empty
+    assert mask_filter(df, country='Atlantis').empty
+
+
+def test_combined_filters_match_masks_in_row_order(marts):
+    df = marts['fact_subscription_metrics']
+    index = FilterIndex(df)
+    for hub in filter_values(df, 'hub'):
+        for tier in filter_values(df, 'tier'):
+            assert_same_rows(index, df, hub=hub, tier=tier)
+    customers = marts['dim_customers']
+    customer_index = FilterIndex(customers)
+    for segment in filter_values(customers, 'customer_segment'):
+        assert_same_rows(customer_index, customers, customer_segment=segment,
+                         country=customers['country'].dropna().iloc[0])
+
+
+def test_inactive_filters_return_the_frame(marts):
+    df = marts['dim_customers']
+    index = FilterIndex(df)
+    assert index.apply(df, country=None, ltv_segment='High Value') is df
+    assert_same_rows(index, df, country=None, customer_segment=df['customer_segment'].dropna().iloc[0])
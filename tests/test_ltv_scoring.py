@@ -0,0 +1,51 @@
+"""``ltv_scoring`` against ``fact_customer_ltv.sql`` run in DuckDB."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from duckdb_engine import DuckDBMartRunner  # noqa: E402
+from ltv_scoring import DEFAULT_PARAMETERS, FEATURE_COLUMNS, resolve_parameters, score_ltv, usage_value_score  # noqa: E402
+
+
+@pytest.fixture
+def fact_customer_ltv(project_dir, raw_source_dir):
+    return DuckDBMartRunner(project_dir, raw_source_dir).run_model('fact_customer_ltv')
+
+
+def _features(sql):
+    # The usage components are fed in too, so usage_value_score is recomputed rather than passed through
+    columns = list(dict.fromkeys(FEATURE_COLUMNS + list(DEFAULT_PARAMETERS['usage_weights'])))
+    return sql[['customer_id'] + columns].astype({column: 'float64' for column in columns})
+
+
+@pytest.mark.parametrize('column', ['predicted_ltv', 'customer_roi_pct', 'payback_period_months'])
+def test_scores_match_sql(fact_customer_ltv, column, rtol=1e-6, atol=1e-6):
+    ours = score_ltv(_features(fact_customer_ltv))[column].to_numpy(dtype='float64')
+    theirs = pd.to_numeric(fact_customer_ltv[column], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    np.testing.assert_allclose(ours, theirs, rtol=rtol, atol=atol, equal_nan=True)
+
+
+def test_segments_match_sql(fact_customer_ltv):
+    scored = score_ltv(_features(fact_customer_ltv))
+    assert (scored['ltv_segment'].to_numpy() == fact_customer_ltv['ltv_segment'].astype(str).to_numpy()).all()
+
+
+def test_usage_score_recomputed_from_components(fact_customer_ltv):
+    recomputed = usage_value_score(_features(fact_customer_ltv))
+    np.testing.assert_allclose(recomputed, fact_customer_ltv['usage_value_score'].astype('float64'), rtol=1e-9)
+
+
+def test_custom_usage_weights_rescore(fact_customer_ltv):
+    features = _features(fact_customer_ltv)
+    parameters = resolve_parameters(usage_weights={'unique_features_used': 8})
+    rescored = score_ltv(features, parameters)['predicted_ltv']
+    assert (rescored != score_ltv(features)['predicted_ltv']).any()
+
+
+def test_custom_usage_weights_need_components():
+    features = pd.DataFrame({'usage_value_score': [10.0], 'current_mrr': [100.0], 'active_subscriptions': [1]})
+    with pytest.raises(ValueError, match="usage component columns"):
+        score_ltv(features, resolve_parameters(usage_weights={'total_api_calls': 1}))
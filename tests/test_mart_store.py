@@ -0,0 +1,64 @@
+"""``MartStore`` round-trips every synthetic mart and serves sessions one shared, unmodified copy."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from data_mart_manager import MART_NAMES  # noqa: E402
+from mart_schema import apply_schema  # noqa: E402
+from mart_store import MartStore, enable_copy_on_write  # noqa: E402
+from synthetic_data import SyntheticMartGenerator  # noqa: E402
+
+
+SESSIONS = 8
+
+# As streamlit_app does at startup; the session writes below rely on it
+enable_copy_on_write()
+
+
+def shares_buffers(left, right, column):
+    """Whether two frames' ``column`` are backed by the same memory"""
+    left, right = left[column].array, right[column].array
+    if isinstance(left, pd.Categorical):
+        left, right = left.codes, right.codes
+    if hasattr(left, '__arrow_array__'):
+        left, right = pa.chunked_array(left.__arrow_array__()), pa.chunked_array(right.__arrow_array__())
+        return all(a.buffers()[-1].address == b.buffers()[-1].address for a, b in zip(left.chunks, right.chunks))
+    return np.shares_memory(np.asarray(left), np.asarray(right))
+
+
+@pytest.fixture(scope="module")
+def marts():
+    return {name: apply_schema(name, df) for name, df in SyntheticMartGenerator(n_customers=2000).generate().items()}
+
+
+@pytest.fixture
+def store(marts, tmp_path):
+    return MartStore(marts.__getitem__, tmp_path)
+
+
+@pytest.mark.parametrize('mart_name', MART_NAMES)
+def test_sessions_share_one_unmodified_copy(store, marts, mart_name):
+    views = [store.get(mart_name, "v1") for _ in range(SESSIONS)]
+    pd.testing.assert_frame_equal(views[0], marts[mart_name])
+    for column in marts[mart_name].columns:
+        assert all(shares_buffers(views[0], view, column) for view in views[1:]), column
+
+    # Each session replaces and adds columns, writes a value with .loc and fills NULLs in place
+    for view in views:
+        numeric = view.select_dtypes('number').columns
+        if len(numeric):
+            view[numeric[0]] = view[numeric[0]] * 2
+            view.loc[view.index[0], numeric[-1]] = -1
+            view.fillna({numeric[-1]: 0}, inplace=True)
+        view['session_column'] = 1
+    pd.testing.assert_frame_equal(store.get(mart_name, "v1"), marts[mart_name])
+
+
+def test_loads_once_per_data_version(store):
+    for data_version in ("v1", "v1", "v2"):
+        store.get('dim_customers', data_version)
+    stats = store.stats().set_index('mart').loc['dim_customers']
+    assert (stats['loads'], stats['hits']) == (2, 3)
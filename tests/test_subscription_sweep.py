@@ -0,0 +1,95 @@
+"""``subscription_sweep`` against ``fact_subscription_metrics.sql`` run in DuckDB on the same records."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from duckdb_engine import DuckDBMartRunner  # noqa: E402
+from subscription_sweep import (  # noqa: E402
+    DEFAULT_START_DATE, METRIC_COLUMNS, SQL_GRAIN, load_usage_subscriptions, sweep_subscription_metrics,
+)
+
+from .conftest import REPO_ROOT, write_csv_sources
+
+
+def raw_sources(subscriptions):
+    """Raw ``subscriptions`` / ``customers`` tables in the shape the staging models expect"""
+    start = pd.to_datetime(subscriptions['subscription_start_date'])
+    raw_subscriptions = pd.DataFrame({
+        'subscription_id': subscriptions.get('subscription_id', pd.Series(np.arange(len(subscriptions)), index=subscriptions.index)),
+        'customer_id': subscriptions['customer_id'],
+        'product_hub': subscriptions.get('hub'),
+        'subscription_tier': subscriptions.get('tier'),
+        'monthly_revenue': subscriptions['monthly_revenue'],
+        'subscription_start_date': start.dt.date,
+        'subscription_end_date': pd.to_datetime(subscriptions['subscription_end_date']).dt.date,
+        'is_active': subscriptions['subscription_end_date'].isna(),
+        'payment_method': 'card',
+        'created_at': start,
+        'updated_at': start,
+    })
+    customers = subscriptions.assign(signup_date=start).groupby('customer_id', sort=False).first().reset_index()
+    raw_customers = pd.DataFrame({
+        'customer_id': customers['customer_id'],
+        'company_name': '',
+        'industry': customers.get('industry'),
+        'company_size': customers.get('company_size'),
+        'country': customers.get('country'),
+        'state': customers.get('state'),
+        'email': '',
+        'first_name': '',
+        'last_name': '',
+        'phone': '',
+        'signup_date': customers['signup_date'].dt.date,
+        'created_at': customers['signup_date'],
+        'updated_at': customers['signup_date'],
+    })
+    for column in ['industry', 'company_size', 'country', 'state']:
+        raw_customers[column] = raw_customers[column].astype(object)
+    return {'subscriptions': raw_subscriptions, 'customers': raw_customers}
+
+
+def standardized(subscriptions):
+    """Apply the staging models' TRIM/LOWER and TRIM/UPPER cleaning to the dimensions"""
+    cleaned = {}
+    for column in ['hub', 'tier']:
+        if column in subscriptions.columns:
+            cleaned[column] = subscriptions[column].str.strip().str.lower()
+    for column in ['industry', 'company_size', 'country']:
+        if column in subscriptions.columns:
+            # Customer dimensions come from one row per customer in the SQL model
+            first = subscriptions.groupby('customer_id', sort=False)[column].transform('first')
+            cleaned[column] = first.str.strip().str.upper()
+    return subscriptions.assign(**cleaned)
+
+
+@pytest.fixture(scope="module")
+def merged(project_dir, tmp_path_factory):
+    """Swept and SQL metrics for ``data/usage_data.csv``, outer-joined on the SQL grain"""
+    subscriptions = load_usage_subscriptions(REPO_ROOT / "data" / "usage_data.csv")
+    runner = DuckDBMartRunner(project_dir, write_csv_sources(tmp_path_factory.mktemp("data"), raw_sources(subscriptions)))
+    sql = runner.run_model('fact_subscription_metrics')
+    today = runner.con.execute("SELECT CURRENT_DATE").fetchone()[0]
+
+    swept = sweep_subscription_metrics(standardized(subscriptions), group_columns=SQL_GRAIN,
+                                       start_date=DEFAULT_START_DATE, end_date=today)
+    sql = sql.astype({column: 'float64' for column in METRIC_COLUMNS})
+    sql['metric_date'] = pd.to_datetime(sql['metric_date'].astype(str))
+    for column in SQL_GRAIN:
+        sql[column] = sql[column].astype(str)
+        swept[column] = swept[column].astype(str)
+    return swept.merge(sql, on=['metric_date', *SQL_GRAIN], how='outer', suffixes=('_sweep', '_sql'), indicator=True)
+
+
+def test_same_rows_as_sql(merged):
+    assert (merged['_merge'] == 'both').all()
+
+
+@pytest.mark.parametrize('column', METRIC_COLUMNS)
+def test_metric_matches_sql(merged, column, rtol=1e-6, atol=1e-6):
+    # The default rtol allows for the model's ::FLOAT casts, which DuckDB evaluates in single precision
+    both = merged[merged['_merge'] == 'both']
+    np.testing.assert_allclose(both[f"{column}_sweep"].to_numpy(dtype='float64'),
+                               both[f"{column}_sql"].to_numpy(dtype='float64'), rtol=rtol, atol=atol)
@@ -0,0 +1,65 @@
+"""Streamed ``usage_aggregates`` against ``int_customer_metrics`` and ``fact_customer_ltv`` in DuckDB."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+from duckdb_engine import DuckDBMartRunner  # noqa: E402
+from usage_aggregates import aggregate_usage  # noqa: E402
+
+
+ENGAGEMENT_SQL = """
+SELECT customer_id,
+       COUNT(CASE WHEN engagement_level = 'HIGH' THEN 1 END) AS high_engagement_sessions,
+       COUNT(CASE WHEN engagement_level = 'MEDIUM' THEN 1 END) AS medium_engagement_sessions,
+       COUNT(CASE WHEN engagement_level = 'LOW' THEN 1 END) AS low_engagement_sessions,
+       COUNT(CASE WHEN engagement_level = 'MINIMAL' THEN 1 END) AS minimal_engagement_sessions
+FROM "stg_usage_events"
+GROUP BY customer_id
+"""
+METRIC_COLUMNS = [
+    'total_active_days', 'total_events', 'total_session_minutes', 'total_pages_viewed', 'total_api_calls',
+    'unique_features_used', 'avg_session_duration', 'last_activity_date', 'first_activity_date',
+]
+
+
+@pytest.fixture
+def models(project_dir, raw_source_dir):
+    """Streamed aggregates plus the SQL rollups they must equal, indexed by customer"""
+    # Odd-sized chunks so customers span chunk boundaries
+    streamed = aggregate_usage(raw_source_dir / "usage_events.csv", chunk_rows=997).set_index('customer_id')
+    runner = DuckDBMartRunner(project_dir, raw_source_dir)
+    return {
+        'streamed': streamed,
+        'int_customer_metrics': runner.run_model('int_customer_metrics').set_index('customer_id'),
+        'fact_customer_ltv': runner.run_model('fact_customer_ltv').set_index('customer_id'),
+        'engagement': runner.con.execute(ENGAGEMENT_SQL).df().set_index('customer_id'),
+    }
+
+
+def _assert_matches(sql, sql_column, streamed, column, rtol=1e-9):
+    # Customers without usage are COALESCEd to 0 in the marts and absent from the stream
+    expected = sql[sql_column][sql.index.isin(streamed.index)]
+    actual = streamed[column].reindex(expected.index)
+    if column.endswith('_date'):
+        assert (pd.to_datetime(actual) == pd.to_datetime(expected)).all()
+    else:
+        np.testing.assert_allclose(actual.astype('float64'), expected.astype('float64'), rtol=rtol, atol=1e-9)
+
+
+@pytest.mark.parametrize('column', METRIC_COLUMNS)
+def test_matches_int_customer_metrics(models, column):
+    _assert_matches(models['int_customer_metrics'], column, models['streamed'], column)
+
+
+def test_engagement_counts_match_staging(models):
+    for column in models['engagement'].columns:
+        _assert_matches(models['engagement'], column, models['streamed'], column)
+
+
+@pytest.mark.parametrize('sql_column, column', [('total_usage_days', 'total_active_days'),
+                                                ('usage_value_score', 'usage_value_score')])
+def test_matches_fact_customer_ltv(models, sql_column, column):
+    _assert_matches(models['fact_customer_ltv'], sql_column, models['streamed'], column)
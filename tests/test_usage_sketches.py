@@ -0,0 +1,53 @@
+"""Rolled-up ``usage_sketches`` against exact distinct counts over synthetic events."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("duckdb")
+
+import hll  # noqa: E402
+from usage_aggregates import clean_usage_chunk, iter_usage_chunks  # noqa: E402
+from usage_sketches import build_day, label_events, load_dimensions, load_sketches, rollup, sketch_events  # noqa: E402
+
+from .conftest import write_csv_sources
+
+
+DAYS = 14
+
+
+@pytest.fixture
+def sketched(synthetic_raw_sources, tmp_path, today):
+    """Daily sketches over a ``DAYS`` window, and the exact labelled events behind them"""
+    data_dir = write_csv_sources(tmp_path, synthetic_raw_sources(n_customers=2000, today=today))
+    window = [(today - pd.Timedelta(days=offset)).date() for offset in range(DAYS - 1, -1, -1)]
+    for ds in window:
+        build_day(data_dir, ds, tmp_path / "sketches")
+    rows, precision = load_sketches(tmp_path / "sketches")
+
+    events = pd.concat(clean_usage_chunk(chunk) for chunk in iter_usage_chunks(data_dir / "usage_events.csv"))
+    events = events[events['event_day'] >= np.datetime64(window[0], 'D').astype('int64')]
+    return rows, precision, label_events(events, *load_dimensions(data_dir))
+
+
+def test_daily_merge_equals_one_pass(sketched):
+    rows, precision, events = sketched
+    sketches, _ = sketch_events(events, precision)
+    whole = hll.merge(sketches['feature_sketch'], ['customer_id']) \
+        .sort_values(['customer_id', 'register'], ignore_index=True)
+    daily = hll.merge(hll.unpack(rows, 'feature_sketch', ['customer_id']), ['customer_id']) \
+        .sort_values(['customer_id', 'register'], ignore_index=True)
+    pd.testing.assert_frame_equal(daily.astype(whole.dtypes), whole)
+
+
+@pytest.mark.parametrize('grain, metric, value', [
+    (['customer_id'], 'total_active_days', 'event_day'),
+    (['customer_id'], 'unique_features_used', 'feature_used'),
+    (['hub', 'tier', 'country'], 'active_customers', 'customer_id'),
+])
+def test_estimates_within_three_sigma(sketched, grain, metric, value):
+    rows, precision, events = sketched
+    estimated = rollup(rows, grain, precision).set_index(grain)[metric]
+    exact = events.groupby(grain)[value].nunique()
+    error = (estimated.reindex(exact.index) / exact - 1).abs()
+    assert error.max() <= 3 * hll.standard_error(precision)